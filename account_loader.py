@@ -0,0 +1,83 @@
+import csv
+import os
+import re
+from collections import namedtuple
+from config import DEFAULT_PASSWORD
+
+# 新添加账号的初始状态
+STATUS_PENDING = "待处理"
+
+AccountLoadResult = namedtuple("AccountLoadResult", [
+    "accounts",    # 新账号列表，元素为 {"username", "password", "status"}
+    "duplicates",  # 与已有账号或本批次前面的账号重复的行数
+    "invalid",     # 账号不是纯数字的行数
+    "total"        # 参与解析的非空行数
+])
+
+
+def _parse_rows(rows, existing):
+    """一次遍历完成校验和去重，rows为 (账号, 密码) 序列，existing为已有账号名"""
+    seen = set(existing)
+    accounts = []
+    duplicates = invalid = total = 0
+    for username, password in rows:
+        total += 1
+        if not username.isdigit():
+            invalid += 1
+            continue
+        if username in seen:
+            duplicates += 1
+            continue
+        seen.add(username)
+        accounts.append({"username": username, "password": password or DEFAULT_PASSWORD, "status": STATUS_PENDING})
+    return AccountLoadResult(accounts, duplicates, invalid, total)
+
+
+def _split_text_lines(lines):
+    """文本格式：每行 账号 或 账号:密码，忽略空行和#开头的注释"""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if ':' in line:
+            username, password = (part.strip() for part in line.split(':', 1))
+        else:
+            username, password = line, ""
+        yield username, password
+
+
+def _split_csv_rows(rows):
+    """CSV格式：第一列账号，第二列密码（可省略），首行为表头时跳过"""
+    for index, row in enumerate(rows):
+        cells = [cell.strip() for cell in row]
+        if not cells or not cells[0] or cells[0].startswith('#'):
+            continue
+        if index == 0 and not cells[0].isdigit():
+            continue
+        yield cells[0], cells[1] if len(cells) > 1 else ""
+
+
+def parse_accounts_text(text, existing=()):
+    """解析粘贴的多行账号，兼容 \\n、\\r\\n、\\r 换行"""
+    return _parse_rows(_split_text_lines(re.split(r'[\r\n]+', text)), existing)
+
+
+def load_accounts_file(path, existing=()):
+    """读取账号文件：.csv 按CSV解析，其余按文本格式（与界面批量添加一致）解析"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if os.path.splitext(path)[1].lower() == '.csv':
+            return _parse_rows(_split_csv_rows(csv.reader(f)), existing)
+        return _parse_rows(_split_text_lines(f), existing)
+
+
+def describe_load_result(result):
+    """批量添加的汇总日志"""
+    message = f"批量添加完成，共 {result.total} 行，成功添加 {len(result.accounts)} 个账号"
+    skipped = []
+    if result.duplicates:
+        skipped.append(f"重复 {result.duplicates} 个")
+    if result.invalid:
+        skipped.append(f"格式无效 {result.invalid} 个")
+    if skipped:
+        message += "，跳过" + "、".join(skipped)
+    return message
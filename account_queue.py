@@ -0,0 +1,41 @@
+import threading
+from collections import deque
+from config import PERFORMANCE_CONFIG
+
+
+class AccountQueue:
+    """多线程共享的账号队列：每个线程处理完一个账号再领取下一个，
+    浏览器崩溃需要重试的账号放回队尾，避免某个线程分到的慢账号拖长整体运行时间"""
+    
+    def __init__(self, total, max_retries=None):
+        self.total = total
+        self.max_retries = PERFORMANCE_CONFIG["account_max_retries"] if max_retries is None else max_retries
+        self._pending = deque(range(total))  # 待处理的账号索引
+        self._retries = {}  # 账号索引 -> 已重试次数
+        self._completed = 0
+        self._lock = threading.Lock()
+    
+    def get(self):
+        """领取下一个账号索引，队列为空时返回None"""
+        with self._lock:
+            return self._pending.popleft() if self._pending else None
+    
+    def requeue(self, index):
+        """把账号放回队尾重试，超过最大重试次数时返回False"""
+        with self._lock:
+            retries = self._retries.get(index, 0)
+            if retries >= self.max_retries:
+                return False
+            self._retries[index] = retries + 1
+            self._pending.append(index)
+            return True
+    
+    def task_done(self, index):
+        """账号处理结束"""
+        with self._lock:
+            self._completed += 1
+    
+    @property
+    def completed(self):
+        with self._lock:
+            return self._completed
@@ -0,0 +1,237 @@
+import logging
+import sqlite3
+import time
+from config import PROGRESS_JOURNAL_PATH, DEFAULT_PASSWORD
+from progress_db import ProgressDatabase, shared_instance
+from account_loader import STATUS_PENDING
+from progress_journal import HOMEWORK_COMPLETED, HOMEWORK_SKIPPED
+from progress_model import format_duration
+
+try:
+    import keyring
+except ImportError:
+    keyring = None
+
+logger = logging.getLogger(__name__)
+
+# 自定义密码保存在系统密钥环中的服务名，progress.db只记录账号是否使用自定义密码
+KEYRING_SERVICE = "taoshiwan-auto-answer"
+
+# 账号最近一次运行的结果
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+RUN_INTERRUPTED = "interrupted"
+
+# 出错原因分类
+ERROR_LOGIN = "login"      # 登录失败（账号或密码错误等）
+ERROR_BROWSER = "browser"  # 浏览器会话失效或崩溃
+ERROR_OTHER = "other"
+
+RUN_STATUS_NAMES = {RUN_RUNNING: "运行中断", RUN_COMPLETED: "已完成", RUN_FAILED: "出错", RUN_INTERRUPTED: "已中断"}
+ERROR_CATEGORY_NAMES = {ERROR_LOGIN: "登录失败", ERROR_BROWSER: "浏览器异常", ERROR_OTHER: "其他错误"}
+
+# 账号筛选条件，界面和命令行用于只重跑需要处理的账号
+FILTER_ALL = "all"
+FILTER_FAILED = "failed"                 # 上次运行出错
+FILTER_NOT_DONE_THIS_WEEK = "not_done_this_week"  # 本周还没有完整处理过
+FILTER_NEVER_RUN = "never_run"           # 从未运行
+
+FILTER_NAMES = {
+    FILTER_ALL: "全部账号",
+    FILTER_FAILED: "上次运行出错",
+    FILTER_NOT_DONE_THIS_WEEK: "本周未完成",
+    FILTER_NEVER_RUN: "从未运行"
+}
+
+
+def has_custom_password(password):
+    """账号是否使用默认密码以外的密码"""
+    return bool(password) and password != DEFAULT_PASSWORD
+
+
+def week_start(now=None):
+    """本周一零点的时间戳（本地时间）"""
+    local = time.localtime(now)
+    midnight = time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1))
+    return midnight - local.tm_wday * 86400
+
+
+def classify_account_error(error, session_error=False):
+    """按异常信息判断出错原因分类"""
+    if "登录失败" in str(error):
+        return ERROR_LOGIN
+    if session_error:
+        return ERROR_BROWSER
+    return ERROR_OTHER
+
+
+def describe_last_run(row):
+    """账号列表中显示的上次运行结果，例如 上次已完成(5个作业, 3分20秒)"""
+    if not row or not row["last_status"]:
+        return STATUS_PENDING
+    text = "上次" + RUN_STATUS_NAMES.get(row["last_status"], row["last_status"])
+    details = []
+    if row["last_status"] == RUN_FAILED and row["error_category"]:
+        details.append(ERROR_CATEGORY_NAMES.get(row["error_category"], row["error_category"]))
+    if row["homework_completed"]:
+        details.append(f"{row['homework_completed']}个作业")
+    if row["last_duration"] is not None:
+        details.append(format_duration(row["last_duration"]))
+    if details:
+        text += f"({', '.join(details)})"
+    return text
+
+
+class AccountStore(ProgressDatabase):
+    """账号库：账号和每个账号最近一次运行的结果（状态、耗时、完成/跳过的作业数、出错原因）
+    保存在进度日志所在的SQLite文件中，下次启动时无需重新粘贴，
+    并可按上次结果筛选出需要重跑的账号。
+
+    progress.db中不保存密码：自定义密码在安装了keyring时保存到系统密钥环，
+    没有密钥环时不保存，下次启动需要重新添加这些账号。
+    """
+
+    row_factory = sqlite3.Row
+
+    def __init__(self, db_path=PROGRESS_JOURNAL_PATH):
+        super().__init__(db_path)
+        self.init_db()
+
+    def init_db(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS accounts (
+                username TEXT PRIMARY KEY,
+                custom_password INTEGER NOT NULL DEFAULT 0,
+                added_at REAL NOT NULL,
+                last_status TEXT,
+                last_started_at REAL,
+                last_finished_at REAL,
+                last_duration REAL,
+                last_completed_at REAL,
+                homework_completed INTEGER NOT NULL DEFAULT 0,
+                homework_skipped INTEGER NOT NULL DEFAULT 0,
+                error_category TEXT
+            )
+            ''')
+            # 筛选条件使用的索引
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_accounts_last_status ON accounts(last_status)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_accounts_last_completed ON accounts(last_completed_at)')
+            conn.commit()
+
+    def _filter_clause(self, account_filter):
+        """筛选条件对应的 (SQL片段, 参数)"""
+        if account_filter == FILTER_FAILED:
+            return "last_status = ?", [RUN_FAILED]
+        if account_filter == FILTER_NOT_DONE_THIS_WEEK:
+            return "(last_completed_at IS NULL OR last_completed_at < ?)", [week_start()]
+        if account_filter == FILTER_NEVER_RUN:
+            return "last_status IS NULL", []
+        return "1 = 1", []
+
+    def _keyring_call(self, method, *args):
+        """调用系统密钥环，未安装keyring或没有可用的后端时返回None"""
+        if keyring is None:
+            return None
+        try:
+            return getattr(keyring, method)(KEYRING_SERVICE, *args)
+        except Exception as e:
+            logger.warning("系统密钥环不可用: %s", e)
+            return None
+
+    def save_accounts(self, accounts):
+        """保存账号（已存在的账号更新是否使用自定义密码），在一个事务中批量写入，自定义密码写入系统密钥环"""
+        now = time.time()
+        for account in accounts:
+            if has_custom_password(account["password"]):
+                self._keyring_call("set_password", account["username"], account["password"])
+        with self.get_connection() as conn:
+            conn.executemany('''
+            INSERT INTO accounts (username, custom_password, added_at) VALUES (?, ?, ?)
+            ON CONFLICT(username) DO UPDATE SET custom_password = excluded.custom_password
+            ''', [(account["username"], has_custom_password(account["password"]), now) for account in accounts])
+            conn.commit()
+
+    def remove_accounts(self, usernames):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT username FROM accounts WHERE custom_password = 1')
+            custom = {row[0] for row in cursor.fetchall()}
+            conn.executemany('DELETE FROM accounts WHERE username = ?', [(username,) for username in usernames])
+            conn.commit()
+        for username in usernames:
+            if username in custom:
+                self._keyring_call("delete_password", username)
+
+    def load_accounts(self, account_filter=FILTER_ALL):
+        """按筛选条件读取账号，返回 (按添加顺序的账号列表, 无法恢复密码的账号名列表)，
+        状态为上次运行结果的描述。使用自定义密码但密钥环中没有密码的账号不返回，需要重新添加"""
+        clause, params = self._filter_clause(account_filter)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT * FROM accounts WHERE {clause} ORDER BY rowid', params)
+            rows = cursor.fetchall()
+        accounts = []
+        missing = []
+        for row in rows:
+            password = self._keyring_call("get_password", row["username"]) if row["custom_password"] else DEFAULT_PASSWORD
+            if password is None:
+                missing.append(row["username"])
+                continue
+            accounts.append({"username": row["username"], "password": password, "status": describe_last_run(row)})
+        return accounts, missing
+
+    def filter_usernames(self, usernames, account_filter):
+        """从给定账号中选出符合筛选条件的账号（保持原顺序），账号库中没有的账号视为从未运行"""
+        if account_filter == FILTER_ALL:
+            return list(usernames)
+        clause, params = self._filter_clause(account_filter)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT username FROM accounts')
+            known = {row[0] for row in cursor.fetchall()}
+            cursor.execute(f'SELECT username FROM accounts WHERE {clause}', params)
+            matched = {row[0] for row in cursor.fetchall()}
+        keep_unknown = account_filter != FILTER_FAILED
+        return [username for username in usernames
+                if username in matched or (keep_unknown and username not in known)]
+
+    def get_history(self, username):
+        """账号最近一次运行的记录，没有记录时返回None"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM accounts WHERE username = ?', (username,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    def start_run(self, username, password):
+        """账号开始处理，命令行等未经界面添加的账号同时写入账号库。
+        密码只用于首次写入时记录是否为自定义密码，不保存，已有账号只更新运行状态"""
+        now = time.time()
+        with self.get_connection() as conn:
+            conn.execute('''
+            INSERT INTO accounts (username, custom_password, added_at, last_status, last_started_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(username) DO UPDATE SET last_status = excluded.last_status, last_started_at = excluded.last_started_at
+            ''', (username, has_custom_password(password), now, RUN_RUNNING, now))
+            conn.commit()
+
+    def finish_run(self, username, status, homework_counts=None, error_category=None):
+        """记录账号本次处理的结果，homework_counts为 {作业状态: 数量}（见ProgressJournal.count_homeworks）"""
+        homework_counts = homework_counts or {}
+        now = time.time()
+        with self.get_connection() as conn:
+            conn.execute('''
+            UPDATE accounts SET
+                last_status = ?, last_finished_at = ?, last_duration = ? - last_started_at,
+                homework_completed = ?, homework_skipped = ?, error_category = ?,
+                last_completed_at = CASE WHEN ? = ? THEN ? ELSE last_completed_at END
+            WHERE username = ?
+            ''', (status, now, now, homework_counts.get(HOMEWORK_COMPLETED, 0), homework_counts.get(HOMEWORK_SKIPPED, 0),
+                  error_category, status, RUN_COMPLETED, now, username))
+            conn.commit()
+
+
+# 全局账号库实例
+get_account_store = shared_instance(AccountStore)
@@ -0,0 +1,81 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from progress_db import shared_instance
+
+# 答题步骤类型
+STEP_CHOICE = "choice"          # 按题库答案选择选项
+STEP_SUBJECTIVE = "subjective"  # 按题库答案填写文本
+STEP_RANDOM = "random"          # 题库中没有答案的选择题，随机选择；方案中记录为实际选中的STEP_CHOICE
+STEP_SKIP = "skip"              # 题库中没有答案的主观题，跳过
+
+
+def option_letter(index):
+    """选项索引转换为选项字母，0 -> A"""
+    return chr(ord('A') + index)
+
+
+def option_index(letter):
+    """选项字母转换为选项索引，不是单个字母时返回-1"""
+    letter = letter.strip().upper()
+    if len(letter) == 1 and 'A' <= letter <= 'Z':
+        return ord(letter) - ord('A')
+    return -1
+
+
+def fingerprint_questions(question_texts):
+    """根据页面上全部题目（含选项）的文本计算题目集合指纹，选项顺序不同的试卷指纹也不同"""
+    digest = hashlib.sha1()
+    for text in question_texts:
+        digest.update(" ".join(text.split()).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class AnswerPlanCache:
+    """跨账号共享的答题方案缓存：第一个账号解完某份作业后，按题目位置记录最终答案，
+    之后的账号只要题目指纹一致就直接按方案作答，不再逐题读取文本和查询题库"""
+
+    def __init__(self, max_size=500):
+        self.max_size = max_size
+        self._plans = OrderedDict()  # (作业ID, 指纹) -> 答题步骤列表
+        self._stats = {"hits": 0, "misses": 0, "stored": 0}
+        self._lock = threading.Lock()
+
+    def get(self, homework_id, fingerprint):
+        """查找答题方案，没有时返回None"""
+        key = (homework_id, fingerprint)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self._stats["misses"] += 1
+                return None
+            self._plans.move_to_end(key)
+            self._stats["hits"] += 1
+            return list(plan)
+
+    def put(self, homework_id, fingerprint, plan):
+        """保存答题方案，超过容量时淘汰最久未使用的方案"""
+        key = (homework_id, fingerprint)
+        with self._lock:
+            self._plans[key] = tuple(plan)
+            self._plans.move_to_end(key)
+            self._stats["stored"] += 1
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+
+    def get_stats(self):
+        """返回命中统计和当前缓存的方案数量"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._plans)
+        return stats
+
+    def clear(self):
+        """清空全部答题方案，题库更新后调用"""
+        with self._lock:
+            self._plans.clear()
+
+
+# 全局答题方案缓存实例
+get_answer_plan_cache = shared_instance(AnswerPlanCache)
@@ -0,0 +1,856 @@
+import asyncio
+import json
+import math
+import random
+import time
+import urllib.request
+try:
+    import websockets
+except ImportError:
+    websockets = None
+from config import WEBSITE_URL, XPATHS, TIMEOUTS, OPERATION_DELAY, BROWSER_POOL_CONFIG, RESOURCE_BLOCKING, ASYNC_ENGINE_CONFIG
+from engine_events import EngineObject, Signal
+from account_queue import AccountQueue
+from browser_pool import SharedBrowserHost, DISABLE_ANIMATIONS_SCRIPT, get_browser_profile, should_show_browser
+from page_probes import (PAGE_READY_PROBES, PAGE_READY_SCRIPT, MESSAGE_PROBE_SCRIPT, LOGIN_STATE_SCRIPT,
+                         HOMEWORK_LIST_SCRIPT, CLICK_HOMEWORK_SCRIPT, QUESTION_TEXTS_SCRIPT,
+                         LOGIN_ERROR_MESSAGES, SUBMIT_RESULT_MESSAGES, parse_homework_entries)
+from homework_navigator import get_homework_navigator, ROUTE_DIRECT
+from skip_registry import get_skip_registry
+from progress_journal import get_progress_journal
+from answer_plan_cache import (get_answer_plan_cache, fingerprint_questions, option_letter, option_index,
+                               STEP_CHOICE, STEP_SUBJECTIVE, STEP_RANDOM, STEP_SKIP)
+from account_store import get_account_store
+from homework_flow import (HomeworkTracker, begin_account, finish_account, fail_account, clean_question_text,
+                           SUBMIT_SUCCESS, SUBMIT_FAILED, SUBMIT_UNKNOWN)
+
+# 作业列表页地址
+MY_HOMEWORK_URL = WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do")
+
+# 以下脚本与page_probes中的探针写法一致，通过arguments接收参数，由CDPPage.call包装为函数执行。
+# 元素定位直接复用config.XPATHS中的XPath，在页面内用document.evaluate查找
+
+# 点击XPath匹配的第一个可见元素（没有可见元素时点击第一个），找不到时返回false
+CLICK_XPATH_SCRIPT = """
+var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+if (result.snapshotLength === 0) {
+    return false;
+}
+var target = result.snapshotItem(0);
+for (var i = 0; i < result.snapshotLength; i++) {
+    if (result.snapshotItem(i).offsetParent !== null) {
+        target = result.snapshotItem(i);
+        break;
+    }
+}
+target.click();
+return true;
+"""
+
+# XPath是否匹配到元素
+XPATH_EXISTS_SCRIPT = """
+return document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+"""
+
+# 指定ID的元素是否可见（登录框）
+ELEMENT_VISIBLE_SCRIPT = """
+var element = document.getElementById(arguments[0]);
+return element !== null && element.offsetParent !== null && getComputedStyle(element).visibility !== 'hidden';
+"""
+
+# 填写登录框并执行登录：与同步引擎一致，页面脚本计算密码MD5写入隐藏字段后调用login()，
+# login()不存在时点击登录按钮。返回使用的方式，无法登录时返回false
+LOGIN_SCRIPT = """
+var ids = arguments[0];
+var username = document.getElementById(ids.username);
+var password = document.getElementById(ids.password);
+if (!username || !password) {
+    return false;
+}
+[[username, arguments[1]], [password, arguments[2]]].forEach(function (pair) {
+    pair[0].value = pair[1];
+    pair[0].dispatchEvent(new Event('input', {bubbles: true}));
+    pair[0].dispatchEvent(new Event('change', {bubbles: true}));
+});
+var hidden = document.getElementById(ids.pwd);
+if (hidden && typeof hex_md5 === 'function') {
+    hidden.value = hex_md5(password.value);
+}
+if (typeof login === 'function') {
+    login();
+    return 'login';
+}
+var submit = document.evaluate(arguments[3], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (submit) {
+    submit.click();
+    return 'click';
+}
+return false;
+"""
+
+# 一次读取答题页上全部题目的题干、选项数量和是否有文本框
+QUESTION_DETAILS_SCRIPT = """
+var xpaths = arguments[0];
+function first(expr, root) {
+    return document.evaluate(expr, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function count(expr, root) {
+    return document.evaluate(expr, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+}
+var questions = document.evaluate(xpaths.question, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var details = [];
+for (var i = 0; i < questions.snapshotLength; i++) {
+    var question = questions.snapshotItem(i);
+    var content = first(xpaths.question_content, question);
+    details.push({
+        text: content ? (content.innerText || '') : '',
+        options: count(xpaths.option, question),
+        textarea: first(xpaths.textarea, question) !== null
+    });
+}
+return details;
+"""
+
+# 点击第index道题的第option个选项
+SELECT_OPTION_SCRIPT = """
+var xpaths = arguments[0];
+var question = document.evaluate(xpaths.question, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotItem(arguments[1]);
+if (!question) {
+    return false;
+}
+var option = document.evaluate(xpaths.option, question, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotItem(arguments[2]);
+var input = option && document.evaluate(xpaths.option_input, option, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!input) {
+    return false;
+}
+input.click();
+return true;
+"""
+
+# 填写第index道主观题：设置文本、调用网站的setSubject并触发标准事件，返回是否填写成功
+FILL_SUBJECTIVE_SCRIPT = """
+var xpaths = arguments[0];
+var answer = arguments[2];
+var question = document.evaluate(xpaths.question, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotItem(arguments[1]);
+var textarea = question && document.evaluate(xpaths.textarea, question, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!textarea) {
+    return false;
+}
+textarea.value = answer;
+if (textarea.id && typeof setSubject === 'function') {
+    setSubject(textarea.id, '5', textarea);
+}
+textarea.dispatchEvent(new Event('input', {bubbles: true}));
+textarea.dispatchEvent(new Event('change', {bubbles: true}));
+textarea.dispatchEvent(new Event('blur', {bubbles: true}));
+return textarea.value.trim() === answer;
+"""
+
+# 答题卡上已答/全部题目数量
+CARD_COUNT_SCRIPT = """
+return [document.querySelectorAll('[id^=card_].active').length, document.querySelectorAll('[id^=card_]').length];
+"""
+
+# 作业详情页上的标题，用于登记无法完成的作业
+PAGE_TITLE_SCRIPT = """
+var nodes = document.querySelectorAll('h1, h2, h3, .title, [class*=title]');
+for (var i = 0; i < nodes.length; i++) {
+    var text = (nodes[i].innerText || '').trim();
+    if (text && nodes[i].offsetParent !== null) {
+        return text.substring(0, 100);
+    }
+}
+return document.title || null;
+"""
+
+CURRENT_URL_SCRIPT = "return window.location.href;"
+
+# 题目相关XPath，一次传给页面脚本
+QUESTION_XPATHS = {key: XPATHS[key] for key in ("question", "question_content", "option", "option_input", "textarea")}
+
+
+class CDPError(Exception):
+    """CDP命令执行失败；session_lost为True表示与浏览器的连接或页面目标已失效"""
+
+    def __init__(self, message, session_lost=False):
+        super().__init__(message)
+        self.session_lost = session_lost
+
+
+class CDPConnection:
+    """到一个Chrome浏览器的CDP websocket连接，按命令ID把响应分发给等待的协程，
+    多个页面会话通过sessionId共用这一条连接"""
+
+    def __init__(self, ws_url):
+        self.ws_url = ws_url
+        self._ws = None
+        self._reader = None
+        self._next_id = 0
+        self._pending = {}  # 命令ID -> Future
+
+    @property
+    def closed(self):
+        return self._ws is None or self._reader is None or self._reader.done()
+
+    async def connect(self):
+        if websockets is None:
+            raise RuntimeError("异步引擎需要websockets库，请先运行 pip install websockets")
+        self._ws = await websockets.connect(self.ws_url, max_size=None, ping_interval=None)
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                # 只处理命令响应，未订阅的事件直接丢弃
+                future = self._pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    error = message["error"].get("message", "")
+                    lost = "not found" in error.lower() or "closed" in error.lower()
+                    future.set_exception(CDPError(error, session_lost=lost))
+                else:
+                    future.set_result(message.get("result", {}))
+        except Exception:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("与浏览器的连接已断开 (disconnected)", session_lost=True))
+            self._pending.clear()
+
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        """发送CDP命令并等待响应"""
+        if self.closed:
+            raise CDPError("与浏览器的连接已断开 (disconnected)", session_lost=True)
+        self._next_id += 1
+        message = {"id": self._next_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        try:
+            try:
+                await self._ws.send(json.dumps(message))
+            except Exception as e:
+                # websockets在连接关闭时抛出ConnectionClosed，和其他发送失败一样视为连接失效
+                raise CDPError(f"与浏览器的连接已断开 (disconnected): {e}", session_lost=True) from e
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                raise CDPError(f"浏览器在{timeout}秒内未响应 {method} (disconnected)", session_lost=True) from None
+        finally:
+            self._pending.pop(message["id"], None)
+
+    async def close(self):
+        if self._ws is not None:
+            try:
+                await self._ws.close()
+            except Exception:
+                pass
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class CDPPage:
+    """一个账号的页面：独立的浏览器上下文中的一个标签页，Cookie和存储与其他账号隔离"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.context_id = None
+        self.target_id = None
+        self.session_id = None
+
+    async def send(self, method, params=None, timeout=30):
+        return await self.connection.send(method, params, self.session_id, timeout)
+
+    async def open(self, profile):
+        """创建浏览器上下文和标签页，并按配置档设置资源屏蔽和动画"""
+        context = await self.connection.send("Target.createBrowserContext", {"disposeOnDetach": True})
+        self.context_id = context["browserContextId"]
+        target = await self.connection.send("Target.createTarget",
+                                            {"url": "about:blank", "browserContextId": self.context_id})
+        self.target_id = target["targetId"]
+        session = await self.connection.send("Target.attachToTarget", {"targetId": self.target_id, "flatten": True})
+        self.session_id = session["sessionId"]
+        await self.send("Page.enable")
+        if profile["block_resources"]:
+            await self.send("Network.enable")
+            await self.send("Network.setBlockedURLs", {"urls": RESOURCE_BLOCKING["blocked_url_patterns"]})
+        if profile["disable_animations"]:
+            await self.send("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS_SCRIPT})
+            await self.send("Emulation.setEmulatedMedia", {
+                "features": [{"name": "prefers-reduced-motion", "value": "reduce"}]
+            })
+
+    async def call(self, script, *args):
+        """执行页面脚本并返回结果，脚本写法与driver.execute_script一致"""
+        expression = "(function () {%s\n}).apply(null, %s)" % (script, json.dumps(args, ensure_ascii=False))
+        result = await self.send("Runtime.evaluate", {
+            "expression": expression, "returnByValue": True, "awaitPromise": True})
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CDPError(details.get("exception", {}).get("description") or details.get("text", "脚本执行失败"))
+        return result.get("result", {}).get("value")
+
+    async def try_call(self, script, *args):
+        """执行探针脚本，页面正在跳转导致执行失败时返回None；连接失效时仍然抛出异常"""
+        try:
+            return await self.call(script, *args)
+        except CDPError as e:
+            if e.session_lost:
+                raise
+            return None
+
+    async def navigate(self, url):
+        result = await self.send("Page.navigate", {"url": url}, timeout=max(TIMEOUTS["page_ready"], 30))
+        if result.get("errorText"):
+            raise CDPError(f"打开页面失败: {result['errorText']}")
+
+    async def url(self):
+        return await self.try_call(CURRENT_URL_SCRIPT) or ""
+
+    async def wait_until(self, probe, timeout):
+        """轮询异步探针直到返回真值，返回该值；超时抛出asyncio.TimeoutError"""
+        deadline = time.monotonic() + timeout
+        while True:
+            value = await probe()
+            if value:
+                return value
+            if time.monotonic() >= deadline:
+                raise asyncio.TimeoutError()
+            await asyncio.sleep(ASYNC_ENGINE_CONFIG["poll_interval"])
+
+    async def wait_for_page(self, page_type, timeout=None):
+        """等待指定类型的页面就绪，超时返回False"""
+        try:
+            return await self.wait_until(
+                lambda: self.try_call(PAGE_READY_SCRIPT, PAGE_READY_PROBES[page_type]),
+                timeout or TIMEOUTS["page_ready"])
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_for_url(self, markers, timeout):
+        """等待当前URL包含任一特征，返回该URL，超时抛出asyncio.TimeoutError"""
+        async def probe():
+            url = await self.url()
+            return url if any(marker in url for marker in markers) else None
+        return await self.wait_until(probe, timeout)
+
+    async def wait_for_xpath(self, xpath, timeout=None):
+        """等待XPath匹配到元素，超时返回False"""
+        try:
+            return await self.wait_until(lambda: self.try_call(XPATH_EXISTS_SCRIPT, xpath),
+                                         timeout or TIMEOUTS["element_wait"])
+        except asyncio.TimeoutError:
+            return False
+
+    async def click_xpath(self, xpath, timeout=None):
+        """等待XPath匹配到元素并点击，超时返回False"""
+        try:
+            return await self.wait_until(lambda: self.try_call(CLICK_XPATH_SCRIPT, xpath),
+                                         timeout or TIMEOUTS["element_wait"])
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self):
+        """关闭标签页并销毁浏览器上下文，账号的Cookie和存储随之清除"""
+        if self.context_id is None:
+            return
+        try:
+            await self.connection.send("Target.disposeBrowserContext", {"browserContextId": self.context_id}, timeout=10)
+        except Exception:
+            pass
+        self.context_id = self.target_id = self.session_id = None
+
+
+class BrowserSlot:
+    """一个共享Chrome进程及其CDP连接，崩溃后由引擎重新启动"""
+
+    def __init__(self):
+        self.host = None
+        self.connection = None
+        self.lock = asyncio.Lock()
+
+
+class AccountSession:
+    """一个账号的处理流程，与BrowserAutomation的process_account/process_courses/answer_questions一致，
+    每一步等待页面时让出事件循环，同一线程中的其他账号会话继续运行。
+    作业队列、提交核对和跳过登记与线程引擎共用homework_flow.HomeworkTracker"""
+
+    def __init__(self, engine, session_id, page, index, account):
+        self.engine = engine
+        self.session_id = session_id
+        self.page = page
+        self.index = index
+        self.account = account
+        self.username = account["username"]
+        self.homeworks = HomeworkTracker(self.username, engine.journal, engine.skip_registry, self.log)
+
+    def log(self, message):
+        self.engine.log_signal.emit(f"[会话{self.session_id}] {message}")
+
+    async def run_tracker(self, method, *args):
+        """在线程池中执行HomeworkTracker的方法（读写进度日志和跳过登记表），
+        期间产生的日志回到事件循环线程按顺序发出，工作者的事件缓冲只有一个写入线程"""
+        messages = []
+        self.homeworks.log = messages.append
+        try:
+            return await self.engine.run_blocking(method, *args)
+        finally:
+            self.homeworks.log = self.log
+            for message in messages:
+                self.log(message)
+
+    async def delay(self, custom_delay=None):
+        await asyncio.sleep(custom_delay if custom_delay is not None else self.engine.operation_delay)
+
+    @property
+    def active(self):
+        return self.engine.running and not self.engine.paused
+
+    async def process_account(self):
+        await self.run_tracker(self.homeworks.restore_skips)
+
+        await self.page.navigate(WEBSITE_URL)
+        await self.page.wait_for_page("index")
+
+        # 点击登录按钮打开登录框。找不到登录按钮或登录框说明首页没有正常加载，与账号密码无关，
+        # 按页面失效处理：账号放回队列，换新的浏览器上下文重试
+        if not await self.page.click_xpath(XPATHS["login_button"]):
+            raise CDPError("首页加载异常: 未找到登录按钮", session_lost=True)
+        await self.delay()
+        try:
+            await self.page.wait_until(
+                lambda: self.page.try_call(ELEMENT_VISIBLE_SCRIPT, XPATHS["login_modal"]), TIMEOUTS["element_wait"])
+        except asyncio.TimeoutError:
+            raise CDPError("首页加载异常: 登录框未出现", session_lost=True)
+
+        ids = {"username": XPATHS["username_input"], "password": XPATHS["password_input"], "pwd": XPATHS["pwd_hidden"]}
+        if not await self.page.call(LOGIN_SCRIPT, ids, self.username, self.account["password"], XPATHS["login_submit"]):
+            raise Exception("无法执行登录操作")
+        self.log("已执行登录函数")
+
+        # 轮询登录状态探针，出现错误提示或登录成功标识即继续
+        try:
+            state = await self.page.wait_until(self.probe_login_state, TIMEOUTS["page_ready"])
+        except asyncio.TimeoutError:
+            state = "pending"
+        if state != "logged_in":
+            error_info = state[len("error:"):] if state.startswith("error:") else "登录状态检测超时或未知错误"
+            self.log(f"账号 {self.username} 登录失败: {error_info}")
+            raise Exception(f"登录失败: {error_info}")
+        self.log(f"账号 {self.username} 登录成功")
+
+        current_url = await self.page.url()
+        if "myHomework.do" not in current_url:
+            await self.open_course_list(current_url)
+
+        await self.process_courses()
+
+        # 尝试登出，失败时浏览器上下文销毁后会话同样失效
+        if await self.page.click_xpath(XPATHS["logout_link"]):
+            try:
+                await self.page.wait_for_url(("index.do",), 3)
+                self.log(f"账号 {self.username} 已登出")
+            except asyncio.TimeoutError:
+                self.log(f"账号 {self.username} 登出后未返回首页")
+        else:
+            self.log(f"账号 {self.username} 登出按钮未找到，可能已经登出或页面状态异常")
+
+    async def probe_login_state(self):
+        state = await self.page.try_call(LOGIN_STATE_SCRIPT, LOGIN_ERROR_MESSAGES) or "pending"
+        return None if state == "pending" else state
+
+    async def open_course_list(self, current_url=None):
+        """打开作业列表页并等待就绪"""
+        current_url = current_url if current_url is not None else await self.page.url()
+        url = current_url.split('/hw/')[0] + '/hw/stu/myHomework.do' if "/hw/" in current_url else MY_HOMEWORK_URL
+        await self.page.navigate(url)
+        if not await self.page.wait_for_page("myHomework"):
+            self.log(f"等待myHomework页面就绪超时，当前URL: {await self.page.url()}")
+
+    async def process_courses(self):
+        if not self.engine.running:
+            return
+        if not await self.page.wait_for_page("myHomework", TIMEOUTS["page_load"]):
+            self.log("等待课程列表加载超时")
+            return
+        if not await self.page.wait_for_xpath(XPATHS["makeup_buttons"], 3):
+            self.log("未找到任何补作业按钮，可能没有待完成的作业或加载超时")
+            return
+
+        while True:
+            if not self.active:
+                return
+
+            try:
+                entries = parse_homework_entries(await self.page.call(HOMEWORK_LIST_SCRIPT))
+            except CDPError as e:
+                if e.session_lost:
+                    raise
+                self.log(f"读取作业列表时出错: {str(e)}")
+                break
+
+            homework_queue = await self.run_tracker(self.homeworks.next_queue, entries)
+            if not homework_queue:
+                break
+
+            for position, entry in enumerate(homework_queue, 1):
+                if not self.active:
+                    return
+                self.homeworks.start(entry, position, len(homework_queue))
+                try:
+                    self.homeworks.record_submission(entry["id"], await self.process_homework(entry))
+                except CDPError as e:
+                    if e.session_lost:
+                        raise
+                    self.log(f"处理作业时发生外部错误: {str(e)}")
+                except Exception as e:
+                    if not self.engine.running:
+                        return
+                    self.log(f"处理作业时发生外部错误: {str(e)}")
+
+            # 队列处理完后回到列表页刷新
+            await self.open_course_list()
+
+    async def skip_homework(self, entry, reason):
+        """标注并跳过作业，续跑时以及之后的运行中该账号都不再重复尝试"""
+        title = await self.page.try_call(PAGE_TITLE_SCRIPT) or f"作业ID: {entry['id']}"
+        self.log(f"📝 跳过作业 {entry['id']}（{title}）: {reason}")
+        await self.run_tracker(self.homeworks.skip, entry["id"], reason, title)
+
+    async def process_homework(self, entry):
+        """处理队列中的一个作业：打开作业、必要时从详情页进入答题页，然后答题提交，返回提交状态"""
+        navigator = self.engine.navigator
+        url, route = navigator.resolve(entry)
+        if url:
+            await self.page.navigate(url)
+        else:
+            await self.open_course_list()
+            if not await self.page.call(CLICK_HOMEWORK_SCRIPT, entry["onclick"]):
+                raise Exception(f"在作业列表中未找到作业 {entry['id']} 的补作业按钮")
+        await self.delay()
+
+        try:
+            current_url = await self.page.wait_for_url(("doHomework.do", "viewHomework.do"), TIMEOUTS["page_load"])
+        except asyncio.TimeoutError:
+            if route == ROUTE_DIRECT:
+                return await self.demote_homework_route(entry)
+            self.log(f"等待页面跳转超时，当前URL: {await self.page.url()}")
+            return None
+
+        if "doHomework.do" in current_url:
+            if route == ROUTE_DIRECT and not await self.page.wait_for_page("doHomework"):
+                return await self.demote_homework_route(entry)
+            navigator.learn(entry["id"], current_url)
+        else:
+            await self.page.wait_for_page("viewHomework")
+            if not await self.page.click_xpath(XPATHS["do_homework_button"]):
+                self.log("⚠️ 在作业详情页面未找到做作业按钮，该作业可能已完成或无法进行，标注并跳过")
+                await self.skip_homework(entry, "在作业详情页面未找到做作业按钮")
+                return None
+            await self.delay()
+            try:
+                current_url = await self.page.wait_for_url(("doHomework.do",), TIMEOUTS["page_load"])
+            except asyncio.TimeoutError:
+                self.log("⚠️ 点击做作业按钮后未进入答题页，标注并跳过")
+                await self.skip_homework(entry, "点击做作业按钮后未进入答题页")
+                return None
+            # 记下答题页地址，之后的账号可以跳过详情页
+            navigator.learn(entry["id"], current_url)
+
+        return await self.answer_questions(entry["id"])
+
+    async def demote_homework_route(self, entry):
+        """直达答题页失败时降级为详情页路线，并重新处理该作业"""
+        self.log(f"⚠️ 作业 {entry['id']} 的答题页地址无法直接打开，改为经详情页进入")
+        self.engine.navigator.demote(entry["id"])
+        return await self.process_homework(entry)
+
+    async def answer_questions(self, homework_id):
+        """作答当前答题页上的全部题目并提交，返回提交状态，未提交时返回None"""
+        if not await self.page.wait_for_page("doHomework"):
+            self.log("未找到任何题目，可能页面加载不完整")
+            return None
+        details = await self.page.call(QUESTION_DETAILS_SCRIPT, QUESTION_XPATHS) or []
+        if not details:
+            self.log("未找到任何题目，可能页面加载不完整")
+            return None
+        self.log(f"找到 {len(details)} 道题目")
+
+        texts = await self.page.call(QUESTION_TEXTS_SCRIPT, PAGE_READY_PROBES["doHomework"]["selector"]) or []
+        fingerprint = fingerprint_questions(texts)
+        plan = self.engine.answer_plans.get(homework_id, fingerprint)
+        new_plan = None
+        if plan and len(plan) == len(details):
+            self.log(f"使用缓存的答题方案，共 {len(plan)} 道题目")
+            for i, step in enumerate(plan):
+                if not self.active:
+                    return None
+                if await self.apply_answer_step(i, details[i], step) is None:
+                    self.log(f"按缓存方案作答第 {i + 1} 题失败")
+        else:
+            new_plan = await self.solve_questions(details)
+
+        # 暂停或停止时不提交半份答卷
+        if not self.active:
+            return None
+        submit_status = await self.submit_answers()
+        # 确认提交成功后才缓存方案，提交失败或结果未知的答案不提供给其他账号
+        if new_plan and submit_status == SUBMIT_SUCCESS:
+            self.engine.answer_plans.put(homework_id, fingerprint, new_plan)
+        return submit_status
+
+    async def solve_questions(self, details):
+        """逐题查询题库作答，返回答题方案；有题目处理出错时返回None，不缓存不完整的方案"""
+        plan = []
+        loop = asyncio.get_running_loop()
+        for i, detail in enumerate(details):
+            if not self.active:
+                return None
+            try:
+                cleaned_question_text = clean_question_text(detail["text"])
+                # 题库模糊匹配在线程池中执行，不阻塞其他会话
+                answer = await loop.run_in_executor(None, self.engine.question_db.find_answer, cleaned_question_text)
+                if answer:
+                    step = (STEP_CHOICE, answer) if detail["options"] else (STEP_SUBJECTIVE, answer)
+                elif detail["options"]:
+                    self.log(f"未找到题目答案，随机选择: {detail['text'][:30]}...")
+                    step = (STEP_RANDOM, None)
+                else:
+                    self.log(f"未找到题目答案，跳过: {detail['text'][:30]}...")
+                    step = (STEP_SKIP, None)
+                applied = await self.apply_answer_step(i, detail, step)
+                if applied is None:
+                    # 作答失败的题目不能写入方案
+                    self.log(f"第 {i + 1} 题作答失败")
+                    plan = None
+                elif plan is not None:
+                    plan.append(applied)
+            except CDPError as e:
+                if e.session_lost:
+                    raise
+                self.log(f"处理题目时出错: {str(e)}")
+                plan = None
+        return plan
+
+    async def apply_answer_step(self, index, detail, step):
+        """按答题步骤作答第index道题，返回写入方案的步骤（随机作答记录实际选中的选项），作答失败时返回None"""
+        kind, answer = step
+        if kind == STEP_CHOICE:
+            answer_index = option_index(answer)
+            if not 0 <= answer_index < detail["options"]:
+                self.log(f"题库答案{answer.strip().upper()}超出选项范围，选择第一个选项")
+                answer_index = 0
+            selected = await self.page.call(SELECT_OPTION_SCRIPT, QUESTION_XPATHS, index, answer_index)
+            await self.delay()
+            return step if selected else None
+        if kind == STEP_SUBJECTIVE:
+            filled = await self.page.call(FILL_SUBJECTIVE_SCRIPT, QUESTION_XPATHS, index, answer.strip())
+            if not filled:
+                self.log(f"第 {index + 1} 题答案输入验证失败")
+            await self.delay()
+            return step if filled else None
+        if kind == STEP_RANDOM:
+            if not detail["options"]:
+                return None
+            random_index = random.randint(0, detail["options"] - 1)
+            if not await self.page.call(SELECT_OPTION_SCRIPT, QUESTION_XPATHS, index, random_index):
+                return None
+            return (STEP_CHOICE, option_letter(random_index))
+        return step
+
+    async def submit_answers(self):
+        """提交答案并处理确认对话框，返回提交状态。与流水线提交一致，不经过成绩页面返回"""
+        await self.delay()
+        counts = await self.page.try_call(CARD_COUNT_SCRIPT)
+        if counts and counts[1] - counts[0] > 0:
+            self.log(f"警告: 有 {counts[1] - counts[0]} 道题目未回答")
+
+        if not await self.page.click_xpath(XPATHS["submit_button"]):
+            self.log("未找到提交按钮")
+            return SUBMIT_UNKNOWN
+        await self.delay()
+
+        if not await self.page.wait_for_xpath(XPATHS["confirm_dialog"]):
+            self.log("未出现确认对话框，可能已直接提交")
+            return SUBMIT_UNKNOWN
+        await self.page.click_xpath(XPATHS["confirm_button"])
+        await self.delay()
+        self.log("已确认提交答案")
+
+        try:
+            submit_result = await self.page.wait_until(
+                lambda: self.page.try_call(MESSAGE_PROBE_SCRIPT, SUBMIT_RESULT_MESSAGES, False),
+                TIMEOUTS["element_wait"] * 3)
+        except asyncio.TimeoutError:
+            self.log("等待提交结果超时，可能已成功提交，刷新作业列表时再确认")
+            return SUBMIT_UNKNOWN
+        if "提交试卷成功" in submit_result:
+            self.log("答案提交成功")
+            return SUBMIT_SUCCESS
+        self.log("答案提交失败")
+        return SUBMIT_FAILED
+
+
+class AsyncAutomationEngine(EngineObject):
+    """异步自动化引擎：在一个线程的事件循环中通过CDP同时驱动多个账号会话。
+
+    每个会话是一个协程，账号运行在共享Chrome的独立浏览器上下文中，等待页面时让出事件循环，
+    并发数只受浏览器承载能力限制，不再受线程数限制。信号与BrowserAutomation一致，
+    命令行和多线程管理器可以用同样的方式连接日志、状态和进度。
+    """
+    log_signal = Signal(str)
+    status_signal = Signal(int, str)
+    progress_signal = Signal(int, str)
+
+    def __init__(self, accounts, question_db, max_sessions=None):
+        super().__init__()
+        self.accounts = accounts
+        self.question_db = question_db
+        self.max_sessions = max(1, min(max_sessions or ASYNC_ENGINE_CONFIG["max_sessions"], len(accounts) or 1))
+        self.account_queue = None  # 为None时run()创建包含全部账号的队列
+        self.running = False
+        self.paused = False
+        self.operation_delay = OPERATION_DELAY['default']
+        self.navigator = get_homework_navigator()
+        self.answer_plans = get_answer_plan_cache()
+        self.journal = get_progress_journal()
+        self.skip_registry = get_skip_registry()
+        self.account_store = get_account_store()
+        self.slots = []
+
+    def set_operation_delay(self, delay_seconds):
+        """设置操作延迟时间"""
+        self.operation_delay = max(OPERATION_DELAY['min'], min(delay_seconds, OPERATION_DELAY['max']))
+        self.log_signal.emit(f"操作延迟已设置为: {self.operation_delay:.2f}秒")
+
+    def run(self):
+        """在当前线程中运行事件循环，处理完全部账号后返回"""
+        self.running = True
+        self.paused = False
+        if self.account_queue is None:
+            self.account_queue = AccountQueue(len(self.accounts))
+        try:
+            asyncio.run(self.run_async())
+            self.log_signal.emit("所有账号处理完毕")
+            self.log_signal.emit(f"作业导航统计: {self.navigator.format_stats()}")
+            self.log_signal.emit(f"无法完成作业登记: {self.skip_registry.format_stats()}")
+        except Exception as e:
+            self.log_signal.emit(f"异步引擎运行时发生严重错误: {str(e)}")
+        finally:
+            self.running = False
+
+    async def run_async(self):
+        contexts_per_browser = BROWSER_POOL_CONFIG["contexts_per_browser"]
+        self.slots = [BrowserSlot() for _ in range(math.ceil(self.max_sessions / contexts_per_browser))]
+        self.log_signal.emit(f"异步引擎启动: {self.max_sessions} 个会话，{len(self.slots)} 个共享浏览器")
+        try:
+            await asyncio.gather(*(self.session_worker(i + 1, self.slots[i // contexts_per_browser])
+                                   for i in range(self.max_sessions)))
+        finally:
+            await self.close_slots()
+
+    async def ensure_connection(self, slot):
+        """返回共享浏览器的CDP连接，浏览器尚未启动或已崩溃时重新启动"""
+        async with slot.lock:
+            if slot.connection is not None and not slot.connection.closed:
+                return slot.connection
+            loop = asyncio.get_running_loop()
+            if slot.host is not None:
+                await loop.run_in_executor(None, slot.host.close)
+            self.log_signal.emit("正在启动共享浏览器...")
+            slot.host = await loop.run_in_executor(None, SharedBrowserHost, should_show_browser())
+            ws_url = await loop.run_in_executor(None, self.fetch_ws_url, slot.host.debugger_address)
+            slot.connection = CDPConnection(ws_url)
+            await slot.connection.connect()
+            self.log_signal.emit(f"共享浏览器已就绪: {slot.host.debugger_address}")
+            return slot.connection
+
+    @staticmethod
+    def fetch_ws_url(debugger_address):
+        """从Chrome调试端口读取浏览器级websocket地址"""
+        with urllib.request.urlopen(f"http://{debugger_address}/json/version", timeout=10) as response:
+            return json.loads(response.read().decode("utf-8"))["webSocketDebuggerUrl"]
+
+    async def close_slots(self):
+        loop = asyncio.get_running_loop()
+        for slot in self.slots:
+            if slot.connection is not None:
+                await slot.connection.close()
+            if slot.host is not None:
+                await loop.run_in_executor(None, slot.host.close)
+        self.slots = []
+
+    async def run_blocking(self, func, *args):
+        """在线程池中执行同步调用（进度日志、跳过登记表、账号库的SQLite读写），等待写入时其他会话继续运行"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def emit_progress(self):
+        completed = self.account_queue.completed
+        total = self.account_queue.total
+        self.progress_signal.emit(int(completed / total * 100) if total else 100,
+                                  f"已完成 {completed}/{total} 个账号")
+
+    async def session_worker(self, session_id, slot):
+        """会话协程：从账号队列领取账号逐个处理，直到队列为空或引擎停止"""
+        profile = get_browser_profile()
+        while self.running:
+            if self.paused:
+                await asyncio.sleep(1)
+                continue
+            index = self.account_queue.get()
+            if index is None:
+                return
+            account = self.accounts[index]
+            username = account["username"]
+
+            if await self.run_blocking(self.journal.is_account_completed, username):
+                self.log_signal.emit(f"账号 {username} 在上次运行中已完成，跳过")
+                self.status_signal.emit(index, "已完成")
+                self.account_queue.task_done(index)
+                continue
+
+            self.log_signal.emit(f"[会话{session_id}] 处理账号: {username}")
+            self.status_signal.emit(index, "处理中")
+            page = None
+            try:
+                page = CDPPage(await self.ensure_connection(slot))
+                await page.open(profile)
+                await self.run_blocking(begin_account, self.journal, self.account_store, account)
+                await AccountSession(self, session_id, page, index, account).process_account()
+                status = await self.run_blocking(finish_account, self.journal, self.account_store, username,
+                                                 self.running and not self.paused)
+                self.status_signal.emit(index, status)
+            except Exception as e:
+                if not self.running:
+                    return
+                self.log_signal.emit(f"[会话{session_id}] 处理账号 {username} 时出错: {str(e)}")
+                self.status_signal.emit(index, "出错")
+                session_lost = isinstance(e, CDPError) and e.session_lost
+                login_failed = await self.run_blocking(fail_account, self.journal, self.account_store,
+                                                       username, e, session_lost)
+                if session_lost and not login_failed:
+                    # 浏览器崩溃或页面目标失效，账号放回队尾，下次领取时重新启动浏览器
+                    if self.account_queue.requeue(index):
+                        self.log_signal.emit(f"[会话{session_id}] 浏览器会话失效，账号 {username} 已放回账号队列末尾，稍后重试")
+                        continue
+            finally:
+                if page is not None:
+                    await page.close()
+            self.account_queue.task_done(index)
+            self.emit_progress()
+
+    def pause(self):
+        self.paused = True
+        self.log_signal.emit("自动化已暂停")
+
+    def resume(self):
+        self.paused = False
+        self.log_signal.emit("自动化已恢复")
+
+    def stop(self):
+        self.running = False
+        self.log_signal.emit("自动化已停止")
@@ -1,42 +1,56 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-import sys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from PyQt5.QtCore import QThread, pyqtSignal, QObject
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException
+from engine_events import EngineThread, EngineObject, Signal
 import time
 import hashlib
-from functools import lru_cache
 import subprocess
-try:
-    import psutil
-except ImportError:
-    psutil = None
-from config import WEBSITE_URL, XPATHS, TIMEOUTS, BROWSER_OPTIONS, OPERATION_DELAY
-import config
-import re
+from config import WEBSITE_URL, XPATHS, TIMEOUTS, OPERATION_DELAY, PERFORMANCE_CONFIG
+from browser_pool import get_browser_pool
+from page_probes import wait_for_page, collect_homework_entries, parse_homework_entries, extract_homework_id, click_homework_entry, collect_question_texts, probe_message, probe_login_state, LOGIN_ERROR_MESSAGES, SUBMIT_RESULT_MESSAGES
+from selector_cache import get_selector_cache
+from homework_navigator import get_homework_navigator, ROUTE_DIRECT
+from skip_registry import get_skip_registry
+from progress_journal import get_progress_journal
+from answer_plan_cache import (get_answer_plan_cache, fingerprint_questions, option_letter, option_index,
+                               STEP_CHOICE, STEP_SUBJECTIVE, STEP_RANDOM, STEP_SKIP)
+from account_store import get_account_store
+from progress_model import STATUS_COMPLETED
+from homework_flow import (HomeworkTracker, begin_account, finish_account, fail_account, clean_question_text,
+                           SUBMIT_SUCCESS, SUBMIT_FAILED, SUBMIT_UNKNOWN)
 from bs4 import BeautifulSoup
 
-class BrowserAutomation(QThread):
-    log_signal = pyqtSignal(str)
-    status_signal = pyqtSignal(int, str)
-    progress_signal = pyqtSignal(int, str)  # 进度信号: (百分比, 描述)
+class BrowserAutomation(EngineThread):
+    log_signal = Signal(str)
+    status_signal = Signal(int, str)
+    progress_signal = Signal(int, str)  # 进度信号: (百分比, 描述)
+    browser_ready_signal = Signal()  # 浏览器获取成功，多线程模式据此启动下一个线程
     
     def __init__(self, accounts, question_db):
         super().__init__()
         self.accounts = accounts
         self.question_db = question_db
         self.current_account_index = 0
+        self.account_queue = None  # 多线程模式下的共享账号队列，为None时按顺序处理self.accounts
+        self._holding_account = False  # 是否已从共享队列领取账号且尚未处理结束
         self.running = False
         self.paused = False
         self.driver = None
         self.operation_delay = OPERATION_DELAY['default']  # 默认延迟时间
         self._element_cache = {}  # 元素缓存
         self._wait_cache = {}     # WebDriverWait对象缓存
-        self.skipped_homeworks = set()  # 记录已跳过的作业，避免重复处理
+        self.homeworks = None  # 当前账号的作业处理进度（跳过、已尝试、待核对的作业）
         self.browser_process_id = None  # 记录当前浏览器进程ID
-        self.chrome_processes = []  # 记录当前线程启动的Chrome进程
+        self.chrome_processes = []  # 记录当前线程使用的Chrome进程
+        self.browser_pool = get_browser_pool()  # 共享浏览器池
+        self.selectors = get_selector_cache()  # 按页面类型学习命中分支的选择器缓存
+        self.navigator = get_homework_navigator()  # 跨账号共享的作业路线
+        self.answer_plans = get_answer_plan_cache()  # 跨账号共享的答题方案
+        self.journal = get_progress_journal()  # 持久化的运行进度，用于中断后续跑
+        self.skip_registry = get_skip_registry()  # 跨账号、跨运行共享的无法完成作业登记
+        self.account_store = get_account_store()  # 账号库，记录每个账号最近一次运行的结果
+        self.current_username = None
     
     def set_operation_delay(self, delay_seconds):
         """设置操作延迟时间"""
@@ -55,48 +69,22 @@ class BrowserAutomation(QThread):
             self._wait_cache[timeout] = WebDriverWait(self.driver, timeout)
         return self._wait_cache[timeout]
     
+    def wait_for_page(self, page_type, timeout=None):
+        """等待指定类型的页面就绪，超时返回False而不抛出异常"""
+        try:
+            return wait_for_page(self.driver, page_type, timeout)
+        except TimeoutException:
+            self.log_signal.emit(f"等待{page_type}页面就绪超时，当前URL: {self.driver.current_url}")
+            return False
+    
     def check_login_errors(self):
         """检查layer.js弹窗中的登录错误信息"""
         try:
-            # 检查是否有layer弹窗存在
-            layer_elements = self.driver.find_elements(By.CSS_SELECTOR, ".layui-layer-content")
-            
-            for layer in layer_elements:
-                try:
-                    # 检查弹窗是否可见
-                    if layer.is_displayed():
-                        layer_text = layer.text.strip()
-                        self.log_signal.emit(f"检测到弹窗内容: {layer_text}")
-                        
-                        # 检查常见的登录错误信息
-                        if any(error in layer_text for error in [
-                            "用户名或密码错误", "密码错误", "账号不存在", 
-                            "用户被置为无效", "请填写用户名", "请填写密码"
-                        ]):
-                            # 尝试关闭弹窗
-                            try:
-                                close_btn = layer.find_element(By.CSS_SELECTOR, ".layui-layer-close")
-                                if close_btn.is_displayed():
-                                    close_btn.click()
-                                    self.wait_with_delay(0.5)
-                            except:
-                                pass
-                            return layer_text
-                except:
-                    continue
-            
-            # 也检查页面源码中的错误信息（作为备用方法）
-            page_source = self.driver.page_source
-            if "用户名或密码错误" in page_source:
-                return "用户名或密码错误"
-            elif "密码错误" in page_source:
-                return "密码错误"
-            elif "账号不存在" in page_source:
-                return "账号不存在"
-            elif "用户被置为无效" in page_source:
-                return "用户被置为无效"
-                
-            return None
+            # 探针只返回命中的提示文本，并顺手关闭错误弹窗
+            layer_text = probe_message(self.driver, LOGIN_ERROR_MESSAGES, close_layer=True)
+            if layer_text:
+                self.log_signal.emit(f"检测到弹窗内容: {layer_text}")
+            return layer_text
             
         except Exception as e:
             self.log_signal.emit(f"检查登录错误时出现异常: {str(e)}")
@@ -105,23 +93,15 @@ class BrowserAutomation(QThread):
     def verify_login_status(self):
         """改进的登录状态验证"""
         try:
-            current_url = self.driver.current_url
-            
-            # 方法1：检查URL是否包含登录成功后的特征
-            if "myHomework.do" in current_url or "stu/" in current_url:
-                self.log_signal.emit(f"通过URL验证登录成功: {current_url}")
+            # 方法1：登录状态探针（URL特征、退出链接、页面文本）
+            if probe_login_state(self.driver) == "logged_in":
+                self.log_signal.emit(f"通过登录状态探针验证登录成功: {self.driver.current_url}")
                 return True
                 
-            # 方法2：检查页面源码中的登录状态标识
-            page_source = self.driver.page_source
-            if "退出" in page_source or "作业列表" in page_source:
-                self.log_signal.emit("通过页面内容验证登录成功")
-                return True
-                
-            # 方法3：尝试查找登录后才有的元素（使用较短超时）
+            # 方法2：尝试查找登录后才有的元素（使用较短超时）
             try:
                 logout_element = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, XPATHS["logout_link"])))
+                    self.selectors.present("logout_link", "myHomework"))
                 if logout_element:
                     self.log_signal.emit("通过退出按钮验证登录成功")
                     return True
@@ -162,146 +142,108 @@ class BrowserAutomation(QThread):
         self._element_cache.clear()
         self._wait_cache.clear()
     
-    def kill_chrome_processes(self):
-        """只关闭当前线程的Chrome进程"""
-        try:
-            # 如果psutil可用，使用它来关闭特定进程
-            if psutil and self.chrome_processes:
-                for pid in self.chrome_processes[:]:
-                    try:
-                        proc = psutil.Process(pid)
-                        if proc.is_running() and 'chrome' in proc.name().lower():
-                            proc.kill()
-                            self.log_signal.emit(f"已关闭当前线程的Chrome进程: {pid}")
-                            self.chrome_processes.remove(pid)
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
-                        # 进程已不存在或无权限访问，从列表中移除
-                        if pid in self.chrome_processes:
-                            self.chrome_processes.remove(pid)
-                        pass
-            
-            # 如果没有记录到进程ID，尝试通过driver的service关闭
-            if hasattr(self, 'driver') and self.driver and hasattr(self.driver, 'service'):
-                try:
-                    service = self.driver.service
-                    if hasattr(service, 'process') and service.process:
-                        service.process.terminate()
-                        self.log_signal.emit("已通过service关闭chromedriver进程")
-                except Exception as e:
-                    self.log_signal.emit(f"通过service关闭进程失败: {str(e)}")
-                    
-        except Exception as e:
-            self.log_signal.emit(f"关闭Chrome进程时出错: {str(e)}")    
-    
-    def track_chrome_processes(self):
-        """跟踪当前启动的Chrome进程"""
-        try:
-            if psutil:
-                # 记录当前所有Chrome进程，用于后续识别新启动的进程
-                existing_pids = set()
-                for proc in psutil.process_iter(['pid', 'name']):
-                    try:
-                        if 'chrome' in proc.info['name'].lower():
-                            existing_pids.add(proc.info['pid'])
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-                return existing_pids
-        except Exception as e:
-            self.log_signal.emit(f"跟踪Chrome进程时出错: {str(e)}")
-        return set()
-    
-    def update_chrome_processes(self, existing_pids):
-        """更新Chrome进程列表，记录新启动的进程"""
-        try:
-            if psutil:
-                current_pids = set()
-                for proc in psutil.process_iter(['pid', 'name']):
-                    try:
-                        if 'chrome' in proc.info['name'].lower():
-                            current_pids.add(proc.info['pid'])
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-                
-                # 找出新启动的进程
-                new_pids = current_pids - existing_pids
-                self.chrome_processes.extend(new_pids)
-                if new_pids:
-                    self.log_signal.emit(f"检测到新启动的Chrome进程: {list(new_pids)}")
-        except Exception as e:
-            self.log_signal.emit(f"更新Chrome进程列表时出错: {str(e)}")
+    def acquire_browser(self):
+        """从浏览器池获取浏览器实例，预热好的实例可直接使用"""
+        self.log_signal.emit("正在从浏览器池获取浏览器...")
+        self.driver = self.browser_pool.acquire()
+        # 记录该实例对应的进程，供清理管理器精确关闭
+        self.chrome_processes = self.browser_pool.get_driver_pids(self.driver)
+        # WebDriverWait对象与driver绑定，更换浏览器后必须清空缓存
+        self.clear_element_cache()
+        self.log_signal.emit(f"WebDriver初始化成功, 浏览器窗口句柄: {self.driver.current_window_handle}")
     
-    def cleanup_browser(self):
-        """清理浏览器资源，确保完全关闭"""
+    def cleanup_browser(self, discard=False):
+        """释放浏览器资源：正常结束时归还浏览器池，停止或崩溃时直接关闭"""
         if self.driver:
             try:
-                # 首先尝试正常关闭
-                self.driver.quit()
-                self.log_signal.emit("浏览器已正常关闭")
+                if discard:
+                    self.browser_pool.discard(self.driver, replace=False)
+                    self.log_signal.emit("浏览器已关闭")
+                else:
+                    self.browser_pool.release(self.driver)
+                    self.log_signal.emit("浏览器已归还浏览器池")
             except Exception as e:
-                self.log_signal.emit(f"正常关闭浏览器失败: {str(e)}，尝试强制关闭")
+                self.log_signal.emit(f"释放浏览器时出错: {str(e)}")
             finally:
                 self.driver = None
         
-        # 等待一段时间让浏览器进程完全退出
-        self.wait_with_delay(2)  # 统一延迟控制
-        
-        # 强制关闭残留的Chrome进程
-        try:
-            self.kill_chrome_processes()
-            self.wait_with_delay(1)  # 统一延迟控制，等待进程完全关闭
-            self.log_signal.emit("浏览器清理完成")
-        except Exception as e:
-            self.log_signal.emit(f"清理浏览器进程时出错: {str(e)}")
+        self.chrome_processes = []
+        self.log_signal.emit("浏览器清理完成")
+    
+    def next_account(self):
+        """定位下一个要处理的账号并设置current_account_index，没有剩余账号时返回False"""
+        if self.account_queue is None:
+            return self.current_account_index < len(self.accounts)
+        if self._holding_account:
+            return True
+        index = self.account_queue.get()
+        if index is None:
+            return False
+        self.current_account_index = index
+        self._holding_account = True
+        return True
+    
+    def finish_account(self):
+        """当前账号处理结束（完成、跳过或出错），移动到下一个账号"""
+        if self.account_queue is None:
+            self.current_account_index += 1
+        elif self._holding_account:
+            self.account_queue.task_done(self.current_account_index)
+            self._holding_account = False
+    
+    def retry_account(self):
+        """浏览器重新初始化后重试当前账号。共享队列模式下账号放回队尾，
+        由最先空闲的线程处理；超过重试次数时返回False，按出错处理"""
+        if self.account_queue is None:
+            return True
+        if self.account_queue.requeue(self.current_account_index):
+            self._holding_account = False
+            self.log_signal.emit("当前账号已放回账号队列末尾，稍后重试")
+            return True
+        self.log_signal.emit(f"账号已重试 {self.account_queue.max_retries} 次，不再重试")
+        return False
+    
+    def is_session_error(self, error_str):
+        """判断异常是否由浏览器会话失效或崩溃引起"""
+        return ("invalid session id" in error_str or 
+                "session deleted" in error_str or 
+                "chrome not reachable" in error_str or
+                "gethandleverifier" in error_str or
+                "no such session" in error_str or
+                "disconnected" in error_str or
+                "crashed" in error_str)
     
     def run(self):
         self.running = True
         self.paused = False
         
-        # 初始化WebDriver
-        # 跟踪启动前的Chrome进程
-        existing_pids = self.track_chrome_processes()
-        
-        options = webdriver.ChromeOptions()
-        for option in BROWSER_OPTIONS:
-            options.add_argument(option)
-        
-        # 根据配置决定是否显示浏览器窗口
-        # 打包环境下强制显示浏览器窗口
-        if hasattr(sys, '_MEIPASS'):
-            self.log_signal.emit("")
-            show_browser = True
-        else:
-            # 开发环境下使用配置文件设置
-            show_browser = config.SHOW_BROWSER_WINDOW
-        
-        if not show_browser:
-            options.add_argument("--headless")  # 无头模式，不显示浏览器界面
-            self.log_signal.emit("浏览器运行在无头模式")
-        else:
-            self.log_signal.emit("浏览器窗口将显示，便于调试")
-        
+        # 从浏览器池获取WebDriver
         try:
-            self.log_signal.emit("正在初始化WebDriver...")
-            self.driver = webdriver.Chrome(options=options)
-            if self.driver:
-                self.log_signal.emit(f"WebDriver初始化成功, 浏览器窗口句柄: {self.driver.current_window_handle}")
-                # 更新Chrome进程列表，记录新启动的进程
-                self.update_chrome_processes(existing_pids)
-            else:
-                self.log_signal.emit("❌ WebDriver初始化失败，实例为空")
-                self.running = False # 停止运行
+            self.acquire_browser()
+            self.browser_ready_signal.emit()
         except Exception as e:
             self.log_signal.emit(f"❌ WebDriver初始化时发生严重错误: {str(e)}")
             self.running = False # 停止运行
         
         try:
             total_accounts = len(self.accounts)
-            while self.running and self.current_account_index < total_accounts:
+            session_dirty = False  # 浏览器中是否残留上一个账号的会话
+            while self.running:
                 if self.paused:
                     self.wait_with_delay(1)  # 统一延迟控制，暂停状态等待
                     continue
-                    
+                
+                if not self.next_account():
+                    break
                 account = self.accounts[self.current_account_index]
+                
+                # 上次运行中已完成的账号直接跳过
+                if self.journal.is_account_completed(account['username']):
+                    self.log_signal.emit(f"账号 {account['username']} 在上次运行中已完成，跳过")
+                    self.status_signal.emit(self.current_account_index, "已完成")
+                    self.finish_account()
+                    continue
+                
                 # 计算总体进度
                 overall_progress = int((self.current_account_index / total_accounts) * 100)
                 self.progress_signal.emit(overall_progress, f"正在处理账号 {self.current_account_index + 1}/{total_accounts}: {account['username']}")
@@ -310,11 +252,24 @@ class BrowserAutomation(QThread):
                 self.status_signal.emit(self.current_account_index, "处理中")
                 
                 try:
+                    # 清理上一个账号的Cookie和存储，代替重启浏览器
+                    if session_dirty and not self.browser_pool.reset_session(self.driver):
+                        # 清理失败时浏览器中可能还保留着上一个账号的登录状态，换用新的实例
+                        self.log_signal.emit("重置浏览器会话失败，换用新的浏览器实例")
+                        self.browser_pool.discard(self.driver)
+                        self.driver = None
+                        self.acquire_browser()
+                    session_dirty = True
+                    
+                    begin_account(self.journal, self.account_store, account)
                     self.process_account(account)
-                    self.status_signal.emit(self.current_account_index, "已完成")
-                    # 更新完成进度
-                    completed_progress = int(((self.current_account_index + 1) / total_accounts) * 100)
-                    self.progress_signal.emit(completed_progress, f"账号 {self.current_account_index + 1}/{total_accounts} 已完成: {account['username']}")
+                    status = finish_account(self.journal, self.account_store, account['username'],
+                                            self.running and not self.paused)
+                    self.status_signal.emit(self.current_account_index, status)
+                    # 更新完成进度，被中断的账号不算完成
+                    if status == STATUS_COMPLETED:
+                        completed_progress = int(((self.current_account_index + 1) / total_accounts) * 100)
+                        self.progress_signal.emit(completed_progress, f"账号 {self.current_account_index + 1}/{total_accounts} 已完成: {account['username']}")
                 except KeyboardInterrupt:
                     self.log_signal.emit("自动化过程被用户中断")
                     self.status_signal.emit(self.current_account_index, "已中断")
@@ -328,84 +283,25 @@ class BrowserAutomation(QThread):
                     
                     error_str = str(e).lower()
                     
-                    # 检查是否是登录失败错误，如果是则直接跳过
-                    if "登录失败" in error_str:
+                    # 登录失败的账号直接跳过，不重新初始化浏览器
+                    if fail_account(self.journal, self.account_store, account['username'], e,
+                                    self.is_session_error(error_str)):
                         self.log_signal.emit(f"账号 {account['username']} 登录失败，跳过该账号继续处理下一个")
-                        # 记录登录失败到日志文件
-                        import traceback
-                        with open('app_error.log', 'a', encoding='utf-8') as f:
-                            f.write(f"\n=== 登录失败时间: {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-                            f.write(f"账号: {account['username']}\n")
-                            f.write(f"错误信息: {str(e)}\n")
-                        # 直接跳过，不重新初始化浏览器
                     # 检查是否是浏览器会话失效或崩溃错误
-                    elif ("invalid session id" in error_str or 
-                        "session deleted" in error_str or 
-                        "chrome not reachable" in error_str or
-                        "gethandleverifier" in error_str or
-                        "no such session" in error_str or
-                        "disconnected" in error_str or
-                        "crashed" in error_str):
-                        
-                        # 如果程序已停止，不输出错误信息
-                        if not self.running:
-                            break
-                        self.log_signal.emit("检测到浏览器会话失效或崩溃，尝试重新初始化浏览器...")
-                        
-                        # 等待一段时间，让系统资源释放
-                        self.wait_with_delay(5)  # 统一延迟控制
+                    elif self.is_session_error(error_str):
+                        self.log_signal.emit("检测到浏览器会话失效或崩溃，从浏览器池重新初始化浏览器...")
                         
                         try:
-                            # 关闭旧的浏览器实例
-                            if self.driver:
-                                try:
-                                    self.driver.quit()
-                                except:
-                                    pass
-                            
-                            # 确保所有Chrome进程都已关闭
-                            self.kill_chrome_processes()
-                            
-                            # 等待进程完全关闭
-                            self.wait_with_delay(3)  # 统一延迟控制
-                            
-                            # 重新初始化浏览器
-                            # 跟踪重新启动前的Chrome进程
-                            existing_pids = self.track_chrome_processes()
-                            
-                            options = webdriver.ChromeOptions()
-                            for option in BROWSER_OPTIONS:
-                                options.add_argument(option)
-                            
-                            # 打包环境下强制显示浏览器窗口
-                            if hasattr(sys, '_MEIPASS'):
-                                # 检测到打包环境，强制显示浏览器窗口
-                                self.log_signal.emit("重新初始化：检测到打包环境，强制显示浏览器窗口")
-                                show_browser = True
-                            else:
-                                # 开发环境下使用配置文件设置
-                                show_browser = config.SHOW_BROWSER_WINDOW
-                            
-                            if not show_browser:
-                                options.add_argument("--headless")
-                            
-                            # 添加额外的崩溃恢复选项
-                            options.add_experimental_option('excludeSwitches', ['enable-logging'])
-                            # 移除detach选项，确保浏览器可以正常关闭
-                            
-                            # 设置服务对象，增加启动超时时间
-                            from selenium.webdriver.chrome.service import Service
-                            service = Service()
-                            service.start()
-                            
-                            self.driver = webdriver.Chrome(options=options, service=service)
-                            
-                            # 更新Chrome进程列表，记录新启动的进程
-                            self.update_chrome_processes(existing_pids)
+                            # 崩溃的实例交给浏览器池在后台关闭并补充，不再同步等待
+                            self.browser_pool.discard(self.driver)
+                            self.driver = None
+                            self.acquire_browser()
+                            session_dirty = False
                             self.log_signal.emit("浏览器重新初始化成功，将重试当前账号")
                             
-                            # 重试当前账号，不增加索引
-                            continue
+                            # 重试当前账号：单线程模式不增加索引，共享队列模式放回队尾
+                            if self.retry_account():
+                                continue
                             
                         except Exception as reinit_error:
                             # 如果程序已停止，不输出错误信息
@@ -425,9 +321,14 @@ class BrowserAutomation(QThread):
                             f.write(f"错误信息: {str(e)}\n")
                             f.write(f"详细堆栈:\n{traceback.format_exc()}\n")
                 
-                self.current_account_index += 1
+                self.finish_account()
                 
             self.log_signal.emit("所有账号处理完毕")
+            selector_stats = self.selectors.format_stats()
+            if selector_stats:
+                self.log_signal.emit(f"选择器命中统计: {selector_stats}")
+            self.log_signal.emit(f"作业导航统计: {self.navigator.format_stats()}")
+            self.log_signal.emit(f"无法完成作业登记: {self.skip_registry.format_stats()}")
             # 发送完成信号
             if self.running:
                 self.progress_signal.emit(100, f"所有账号处理完毕 ({total_accounts}/{total_accounts})")
@@ -446,15 +347,17 @@ class BrowserAutomation(QThread):
                 f.write(f"错误信息: {str(e)}\n")
                 f.write(f"详细堆栈:\n{traceback.format_exc()}\n")
         finally:
-            # 确保浏览器完全关闭
-            self.cleanup_browser()
+            # 正常结束时归还浏览器池，被停止时直接关闭
+            self.cleanup_browser(discard=not self.running)
             self.running = False
     
     def process_account(self, account):
         # 清空缓存和跳过记录，开始新的账号处理
         self.clear_element_cache()
-        self.skipped_homeworks.clear()  # 清空跳过作业记录
+        self.current_username = account['username']
+        self.homeworks = HomeworkTracker(account['username'], self.journal, self.skip_registry, self.log_signal.emit)
         self.log_signal.emit(f"开始处理账号: {account['username']}，已清空跳过作业记录")
+        self.homeworks.restore_skips()
         
         # 发送登录进度信号
         current_progress = int((self.current_account_index / len(self.accounts)) * 100)
@@ -462,10 +365,11 @@ class BrowserAutomation(QThread):
         
         # 打开登录页面
         self.driver.get(WEBSITE_URL)
+        self.wait_for_page("index")
         
         # 点击登录按钮打开登录框
         login_button = self.get_wait().until(
-            EC.element_to_be_clickable((By.XPATH, XPATHS["login_button"])))
+            self.selectors.clickable("login_button", "index"))
         login_button.click()
         self.wait_with_delay() # 统一延迟控制
         
@@ -500,19 +404,21 @@ class BrowserAutomation(QThread):
             # 如果JavaScript执行失败，尝试直接点击登录按钮
             self.log_signal.emit(f"JavaScript登录失败，尝试直接点击: {str(e)}")
             try:
-                login_submit_btn = self.driver.find_element(By.XPATH, XPATHS["login_submit"])
+                login_submit_btn = self.selectors.find_element(self.driver, "login_submit", "index")
                 login_submit_btn.click()
                 self.log_signal.emit("已点击登录按钮")
             except Exception as e2:
                 self.log_signal.emit(f"直接点击登录按钮也失败: {str(e2)}")
                 raise Exception("无法执行登录操作")
         
-        self.wait_with_delay(1) # 等待登录处理
-        
         # 等待登录成功
         try:
-            # 等待登录处理完成
-            self.wait_with_delay(2)  # 统一延迟控制
+            # 轮询登录状态探针，出现错误提示或登录成功标识即继续
+            try:
+                WebDriverWait(self.driver, 3, poll_frequency=0.2).until(
+                    lambda driver: probe_login_state(driver) != "pending")
+            except TimeoutException:
+                pass
             
             # 检查是否有layer.js错误弹窗
             error_detected = self.check_login_errors()
@@ -521,9 +427,6 @@ class BrowserAutomation(QThread):
                 self.log_signal.emit(f"账号 {account['username']} 登录失败: {error_info}")
                 raise Exception(f"登录失败: {error_info}")
             
-            # 再等待一秒确保页面完全加载
-            self.wait_with_delay(1)  # 统一延迟控制
-            
             # 使用改进的登录状态验证
             if self.verify_login_status():
                 self.log_signal.emit(f"账号 {account['username']} 登录成功")
@@ -536,7 +439,7 @@ class BrowserAutomation(QThread):
                         # 构造myHomework页面URL
                         base_url = current_url.split('/hw/')[0] + '/hw/stu/myHomework.do'
                         self.driver.get(base_url)
-                        self.wait_with_delay(1)
+                        self.wait_for_page("myHomework")
                         self.log_signal.emit(f"已导航到作业列表页面: {self.driver.current_url}")
                     except Exception as nav_e:
                         self.log_signal.emit(f"导航到作业列表页面失败: {str(nav_e)}")
@@ -547,7 +450,7 @@ class BrowserAutomation(QThread):
                 # 尝试登出
                 try:
                     logout_link = WebDriverWait(self.driver, TIMEOUTS["element_wait"]).until(
-                        EC.element_to_be_clickable((By.XPATH, XPATHS["logout_link"])))
+                        self.selectors.clickable("logout_link", "myHomework"))
                     logout_link.click()
                     self.wait_with_delay() # 统一延迟控制
                     
@@ -609,24 +512,16 @@ class BrowserAutomation(QThread):
             
             # 等待课程列表加载
             self.get_wait(TIMEOUTS["page_load"]).until(
-                EC.presence_of_element_located((By.XPATH, XPATHS["course_list"])))
+                self.selectors.present("course_list", "myHomework"))
             
-            # 查找所有补作业按钮
             # 增加显式等待，确保至少一个补作业按钮出现
             try:
                 WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located((By.XPATH, XPATHS["makeup_buttons"]))
+                    self.selectors.present("makeup_buttons", "myHomework")
                 )
-                makeup_buttons = self.driver.find_elements(By.XPATH, XPATHS["makeup_buttons"])
             except TimeoutException:
                 self.log_signal.emit("未找到任何补作业按钮，可能没有待完成的作业或加载超时")
                 return
-            
-            if not makeup_buttons:
-                self.log_signal.emit("未找到任何补作业按钮，可能没有待完成的作业")
-                return
-                
-            self.log_signal.emit(f"找到 {len(makeup_buttons)} 个待完成的作业")
         except TimeoutException:
             self.log_signal.emit("等待课程列表加载超时")
             return
@@ -637,159 +532,171 @@ class BrowserAutomation(QThread):
             self.log_signal.emit(f"加载课程列表时出错: {str(e)}")
             return
         
-        # 使用索引而不是直接遍历元素，避免stale element reference错误
-        # 每次处理完一个作业后，重新从第一个开始检查，因为作业列表会动态更新
+        # 每次访问列表页只读取一次全部补作业条目，之后按队列逐个直接跳转处理，
+        # 队列处理完再回到列表页刷新一次，核对提交结果并确认是否还有遗留作业
         while True:
             if not self.running or self.paused:
                 return
-                
+            
             try:
-                # 每次循环开始时重新获取补作业按钮列表，确保列表是最新的
-                makeup_buttons = self.driver.find_elements(By.XPATH, XPATHS["makeup_buttons"])
-                
-                # 如果没有找到任何补作业按钮，说明所有作业已处理完成
-                if not makeup_buttons:
-                    self.log_signal.emit("所有作业已处理完成")
-                    break
-                    
-                self.log_signal.emit(f"找到 {len(makeup_buttons)} 个待完成的作业")
-                
-                # 查找第一个未被跳过的作业
-                button = None
-                button_index = -1
-                for i, btn in enumerate(makeup_buttons):
-                    onclick_attr = btn.get_attribute("onclick")
-                    # 从onclick属性中提取作业标识
-                    homework_id = self.extract_homework_id_from_onclick(onclick_attr)
-                    
-                    if homework_id not in self.skipped_homeworks:
-                        button = btn
-                        button_index = i
-                        # 发送作业处理进度信号
-                        account_progress = int((self.current_account_index / len(self.accounts)) * 100)
-                        self.progress_signal.emit(account_progress, f"账号 {self.current_account_index + 1}/{len(self.accounts)}: 处理作业 {i+1}/{len(makeup_buttons)}")
-                        self.log_signal.emit(f"选择第 {i+1} 个作业进行处理（作业ID: {homework_id}）")
-                        break
-                    else:
-                        self.log_signal.emit(f"跳过第 {i+1} 个作业，该作业已被标注为无法完成（作业ID: {homework_id}）")
-                
-                # 如果所有作业都已被跳过，结束处理
-                if button is None:
-                    self.log_signal.emit("所有可见的作业都已被标注为跳过，处理完成")
-                    break
+                entries = self.load_homework_queue()
+            except Exception as e:
+                # 如果程序已停止，不输出错误信息
+                if not self.running:
+                    return
+                self.log_signal.emit(f"读取作业列表时出错: {str(e)}")
+                break
+            
+            homework_queue = self.homeworks.next_queue(entries)
+            if not homework_queue:
+                break
+            
+            for position, entry in enumerate(homework_queue, 1):
+                if not self.running or self.paused:
+                    return
                 
-                # 获取按钮的onclick属性以判断跳转类型
-                onclick_attr = button.get_attribute("onclick")
-                self.log_signal.emit(f"补作业按钮onclick属性: {onclick_attr}")
+                # 发送作业处理进度信号
+                account_progress = int((self.current_account_index / len(self.accounts)) * 100)
+                self.progress_signal.emit(account_progress, f"账号 {self.current_account_index + 1}/{len(self.accounts)}: 处理作业 {position}/{len(homework_queue)}")
+                self.homeworks.start(entry, position, len(homework_queue))
                 
-                button.click()
-                self.wait_with_delay() # 统一延迟控制，等待页面跳转
-                self.log_signal.emit("已点击补作业按钮")
+                try:
+                    self.homeworks.record_submission(entry["id"], self.process_homework(entry))
+                except Exception as e:
+                    # 如果程序已停止，不输出错误信息
+                    if not self.running:
+                        return
+                    # 浏览器会话失效需要交给run()重新初始化浏览器
+                    if self.is_session_error(str(e).lower()):
+                        raise
+                    self.log_signal.emit(f"处理作业时发生外部错误: {str(e)}")
+            
+            # 队列处理完后回到列表页刷新
+            self.ensure_on_course_list_page()
+    
+    def skip_homework(self, entry, homework_url, reason):
+        """标注并跳过作业，续跑时以及之后的运行中该账号都不再重复尝试"""
+        skip_info = self.mark_homework_as_skipped(homework_url, reason)
+        self.homeworks.skip(entry["id"], reason, skip_info["title"] if skip_info else None)
+    
+    def load_homework_queue(self):
+        """在作业列表页执行一次脚本，读取全部补作业条目的作业ID和跳转目标"""
+        return parse_homework_entries(collect_homework_entries(self.driver))
+    
+    def open_homework(self, entry):
+        """按导航器给出的路线打开作业：能构造URL时直接跳转，否则回到列表页点击对应的补作业按钮，返回使用的路线"""
+        url, route = self.navigator.resolve(entry)
+        if url:
+            self.log_signal.emit(f"直接打开作业页面（{route}）: {url}")
+            self.driver.get(url)
+            return route
+        
+        self.ensure_on_course_list_page()
+        self.log_signal.emit(f"补作业按钮onclick属性: {entry['onclick']}")
+        if not click_homework_entry(self.driver, entry["onclick"]):
+            raise Exception(f"在作业列表中未找到作业 {entry['id']} 的补作业按钮")
+        self.log_signal.emit("已点击补作业按钮")
+        return route
+    
+    def demote_homework_route(self, entry):
+        """直达答题页失败时降级为详情页路线，并重新处理该作业"""
+        self.log_signal.emit(f"⚠️ 作业 {entry['id']} 的答题页地址无法直接打开，改为经详情页进入")
+        self.navigator.demote(entry["id"])
+        return self.process_homework(entry)
+    
+    def process_homework(self, entry):
+        """处理队列中的一个作业：打开作业、必要时从详情页进入答题页，然后答题提交，返回提交状态"""
+        route = self.open_homework(entry)
+        self.wait_with_delay() # 统一延迟控制，等待页面跳转
+        
+        # 等待页面跳转完成
+        try:
+            # 检查浏览器会话是否仍然有效
+            try:
+                self.driver.current_url
+            except Exception as session_error:
+                # 如果程序已停止，不输出错误信息
+                if not self.running:
+                    return
+                if "invalid session id" in str(session_error).lower():
+                    raise Exception("浏览器会话在页面跳转过程中失效")
+                else:
+                    raise session_error
+            
+            WebDriverWait(self.driver, TIMEOUTS["page_load"]).until(
+                lambda driver: "doHomework.do" in driver.current_url or "viewHomework.do" in driver.current_url)
+            
+            # 检查当前页面类型
+            current_url = self.driver.current_url
+            self.log_signal.emit(f"页面跳转完成，当前URL: {current_url}")
+            
+            if "doHomework.do" in current_url:
+                if route == ROUTE_DIRECT and not self.wait_for_page("doHomework"):
+                    return self.demote_homework_route(entry)
+                self.log_signal.emit("已直接跳转到作业页面")
+                self.navigator.learn(entry["id"], current_url)
+            elif "viewHomework.do" in current_url:
+                self.log_signal.emit("跳转到作业详情页面，需要点击做作业按钮")
+                self.wait_for_page("viewHomework")
                 
-                # 等待页面跳转完成
+                # 尝试点击做作业按钮
                 try:
-                    # 检查浏览器会话是否仍然有效
+                    do_homework_button = WebDriverWait(self.driver, TIMEOUTS["element_wait"]).until(
+                        self.selectors.clickable("do_homework_button", "viewHomework"))
+                    do_homework_button.click()
+                    self.wait_with_delay() # 统一延迟控制，等待页面跳转
+                    self.log_signal.emit("已点击做作业按钮")
+                    
+                    # 等待跳转到作业页面
                     try:
-                        self.driver.current_url
-                    except Exception as session_error:
+                        WebDriverWait(self.driver, TIMEOUTS["page_load"]).until(
+                            lambda driver: "doHomework.do" in driver.current_url)
+                        self.log_signal.emit("成功跳转到作业页面")
+                        # 记下答题页地址，之后的账号可以跳过详情页
+                        self.navigator.learn(entry["id"], self.driver.current_url)
+                    except Exception as jump_error:
                         # 如果程序已停止，不输出错误信息
                         if not self.running:
                             return
-                        if "invalid session id" in str(session_error).lower():
-                            raise Exception("浏览器会话在页面跳转过程中失效")
+                        if "invalid session id" in str(jump_error).lower():
+                            raise Exception("浏览器会话在跳转到作业页面时失效")
                         else:
-                            raise session_error
-                    
-                    WebDriverWait(self.driver, TIMEOUTS["page_load"]).until(
-                        lambda driver: "doHomework.do" in driver.current_url or "viewHomework.do" in driver.current_url)
-                    
-                    # 检查当前页面类型
-                    current_url = self.driver.current_url
-                    self.log_signal.emit(f"页面跳转完成，当前URL: {current_url}")
+                            raise jump_error
                     
-                    if "doHomework.do" in current_url:
-                        self.log_signal.emit("已直接跳转到作业页面")
-                    elif "viewHomework.do" in current_url:
-                        self.log_signal.emit("跳转到作业详情页面，需要点击做作业按钮")
-                        
-                        # 尝试点击做作业按钮
-                        try:
-                            do_homework_button = WebDriverWait(self.driver, TIMEOUTS["element_wait"]).until(
-                                EC.element_to_be_clickable((By.XPATH, XPATHS["do_homework_button"])))
-                            do_homework_button.click()
-                            self.wait_with_delay() # 统一延迟控制，等待页面跳转
-                            self.log_signal.emit("已点击做作业按钮")
-                            
-                            # 等待跳转到作业页面
-                            try:
-                                WebDriverWait(self.driver, TIMEOUTS["page_load"]).until(
-                                    lambda driver: "doHomework.do" in driver.current_url)
-                                self.log_signal.emit("成功跳转到作业页面")
-                            except Exception as jump_error:
-                                # 如果程序已停止，不输出错误信息
-                                if not self.running:
-                                    return
-                                if "invalid session id" in str(jump_error).lower():
-                                    raise Exception("浏览器会话在跳转到作业页面时失效")
-                                else:
-                                    raise jump_error
-                            
-                        except TimeoutException:
-                            # 在viewHomework页面找不到做作业按钮，标注并跳过该作业
-                            self.log_signal.emit("⚠️ 在作业详情页面未找到做作业按钮，该作业可能已完成或无法进行，标注并跳过")
-                            self.mark_homework_as_skipped(current_url)
-                            # 立即返回到作业列表页面
-                            self.ensure_on_course_list_page()
-                            continue
-                        except Exception as e:
-                            # 如果程序已停止，不输出错误信息
-                            if not self.running:
-                                return
-                            self.log_signal.emit(f"点击做作业按钮失败: {str(e)}")
-                            # 如果是找不到元素的错误，也标注并跳过
-                            if "no such element" in str(e).lower() or "element not found" in str(e).lower():
-                                self.log_signal.emit("⚠️ 做作业按钮不存在，该作业可能已完成或无法进行，标注并跳过")
-                                self.mark_homework_as_skipped(current_url)
-                                # 立即返回到作业列表页面
-                                self.ensure_on_course_list_page()
-                            continue
-                    else:
-                        self.log_signal.emit(f"未知的页面类型: {current_url}")
-                        continue
-                        
                 except TimeoutException:
-                    self.log_signal.emit("等待页面跳转超时")
-                    current_url = self.driver.current_url
-                    self.log_signal.emit(f"超时时的当前URL: {current_url}")
-                    continue
-                
-                # 处理题目
-                self.answer_questions()
-                
-                # 注意：提交逻辑已在answer_questions方法中处理
-                # 这里不再重复提交，避免冲突
-                self.log_signal.emit("作业处理完成")
-                
-            except Exception as e:
-                # 如果程序已停止，不输出错误信息
-                if not self.running:
+                    # 在viewHomework页面找不到做作业按钮，标注并跳过该作业
+                    self.log_signal.emit("⚠️ 在作业详情页面未找到做作业按钮，该作业可能已完成或无法进行，标注并跳过")
+                    self.skip_homework(entry, current_url, "在作业详情页面未找到做作业按钮")
                     return
-                self.log_signal.emit(f"处理作业时发生外部错误: {str(e)}")
-            
-            # 无论是否发生错误，都尝试确保返回到课程列表页面
-            self.ensure_on_course_list_page()
-            
-            # 重新获取补作业按钮列表以更新总数，用于日志输出
-            try:
-                updated_makeup_buttons = self.driver.find_elements(By.XPATH, XPATHS["makeup_buttons"])
-                if updated_makeup_buttons:
-                    self.log_signal.emit(f"当前还有 {len(updated_makeup_buttons)} 个待完成的作业")
-                else:
-                    self.log_signal.emit("没有更多待完成的作业")
-            except Exception as e:
-                self.log_signal.emit(f"重新获取作业列表时出错: {str(e)}")
-                # 如果获取失败，不中断循环，继续尝试下一个
-                pass
+                except Exception as e:
+                    # 如果程序已停止，不输出错误信息
+                    if not self.running:
+                        return
+                    self.log_signal.emit(f"点击做作业按钮失败: {str(e)}")
+                    # 如果是找不到元素的错误，也标注并跳过
+                    if "no such element" in str(e).lower() or "element not found" in str(e).lower():
+                        self.log_signal.emit("⚠️ 做作业按钮不存在，该作业可能已完成或无法进行，标注并跳过")
+                        self.skip_homework(entry, current_url, "做作业按钮不存在")
+                    return
+            else:
+                self.log_signal.emit(f"未知的页面类型: {current_url}")
+                return
+                
+        except TimeoutException:
+            if route == ROUTE_DIRECT:
+                return self.demote_homework_route(entry)
+            self.log_signal.emit("等待页面跳转超时")
+            current_url = self.driver.current_url
+            self.log_signal.emit(f"超时时的当前URL: {current_url}")
+            return
+        
+        # 处理题目
+        submit_status = self.answer_questions(entry["id"])
+        
+        # 注意：提交逻辑已在answer_questions方法中处理
+        # 这里不再重复提交，避免冲突
+        self.log_signal.emit("作业处理完成")
+        return submit_status
 
     def ensure_on_course_list_page(self):
         """确保当前页面是作业列表页面，如果不是则尝试导航回去"""
@@ -807,7 +714,7 @@ class BrowserAutomation(QThread):
                     base_url = WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do")
                 
                 self.driver.get(base_url)
-                self.wait_with_delay(2) # 额外等待确保页面加载
+                self.wait_for_page("myHomework")
                 
                 # 验证是否成功返回到作业列表页面
                 final_url = self.driver.current_url
@@ -817,6 +724,8 @@ class BrowserAutomation(QThread):
                     self.log_signal.emit(f"⚠️ 导航后的URL可能不正确: {final_url}")
             else:
                 self.log_signal.emit("已在课程列表页面")
+                # 通过返回按钮或手动导航回来的页面也需要确认已就绪
+                self.wait_for_page("myHomework")
         except Exception as e:
             self.log_signal.emit(f"确保在课程列表页面时出错: {str(e)}")
             # 尝试使用浏览器后退功能作为备用方案
@@ -831,7 +740,8 @@ class BrowserAutomation(QThread):
             except Exception as back_error:
                 self.log_signal.emit(f"浏览器后退功能也失败: {str(back_error)}")
 
-    def answer_questions(self):
+    def answer_questions(self, homework_id=None):
+        """作答当前答题页上的全部题目并提交，返回提交状态，未提交时返回None"""
         try:
             # 清空元素缓存，确保在新页面上重新查找元素
             self.clear_element_cache()
@@ -845,24 +755,78 @@ class BrowserAutomation(QThread):
                 else:
                     raise session_error
             
-            # 获取所有题目
-            questions = self.driver.find_elements(By.XPATH, XPATHS["question"])
+            # 等待题目列表出现后再获取所有题目
+            self.wait_for_page("doHomework")
+            questions = self.selectors.find_elements(self.driver, "question", "doHomework")
             
             if not questions:
                 self.log_signal.emit("未找到任何题目，可能页面加载不完整")
-                return
+                return None
                 
             self.log_signal.emit(f"找到 {len(questions)} 道题目")
+            
+            # 计算题目集合指纹，查找其他账号已经解出的答题方案
+            fingerprint = fingerprint_questions(collect_question_texts(self.driver))
+            plan = self.answer_plans.get(homework_id, fingerprint) if homework_id else None
         except Exception as e:
             self.log_signal.emit(f"获取题目列表时出错: {str(e)}")
-            return
+            return None
         
-        # 使用索引而不是直接遍历元素，避免stale element reference错误
-        for i in range(len(questions)):
+        new_plan = None
+        if plan and len(plan) == len(questions):
+            self.log_signal.emit(f"使用缓存的答题方案，共 {len(plan)} 道题目")
+            self.apply_answer_plan(plan)
+        else:
+            new_plan = self.solve_questions(len(questions))
+        
+        # 暂停或停止时不提交半份答卷
+        if not self.running or self.paused:
+            return None
+        submit_status = self.submit_answers()
+        # 确认提交成功后才缓存方案，提交失败或结果未知的答案不提供给其他账号
+        if new_plan and homework_id and submit_status == SUBMIT_SUCCESS:
+            self.answer_plans.put(homework_id, fingerprint, new_plan)
+        return submit_status
+    
+    def apply_answer_step(self, question, step):
+        """按答题步骤作答一道题，返回写入方案的步骤（随机作答记录实际选中的选项），作答失败时返回None"""
+        kind, answer = step
+        if kind == STEP_CHOICE:
+            return step if self.answer_choice_question(question, answer) else None
+        if kind == STEP_SUBJECTIVE:
+            return step if self.answer_subjective_question(question, answer) else None
+        if kind == STEP_RANDOM:
+            letter = self.random_answer_choice(question)
+            return (STEP_CHOICE, letter) if letter else None
+        return step
+    
+    def apply_answer_plan(self, plan):
+        """按缓存的答题方案逐题作答，题目元素只获取一次，失效时才重新获取"""
+        questions = self.selectors.find_elements(self.driver, "question", "doHomework")
+        for i, step in enumerate(plan):
             if not self.running or self.paused:
                 return
+            try:
+                try:
+                    applied = self.apply_answer_step(questions[i], step)
+                except StaleElementReferenceException:
+                    questions = self.selectors.find_elements(self.driver, "question", "doHomework")
+                    applied = self.apply_answer_step(questions[i], step)
+                if applied is None:
+                    self.log_signal.emit(f"按缓存方案作答第 {i+1} 题失败")
+            except Exception as e:
+                self.log_signal.emit(f"处理题目时出错: {str(e)}")
+    
+    def solve_questions(self, question_count):
+        """逐题读取题目并查询题库作答，返回答题方案；有题目处理出错时返回None，不缓存不完整的方案"""
+        plan = []
+        
+        # 使用索引而不是直接遍历元素，避免stale element reference错误
+        for i in range(question_count):
+            if not self.running or self.paused:
+                return None
                 
-            self.log_signal.emit(f"处理第 {i+1}/{len(questions)} 题")
+            self.log_signal.emit(f"处理第 {i+1}/{question_count} 题")
             
             try:
                 # 检查浏览器会话是否仍然有效
@@ -875,15 +839,15 @@ class BrowserAutomation(QThread):
                         raise session_error
                 
                 # 重新获取题目元素，避免stale element reference
-                current_questions = self.driver.find_elements(By.XPATH, XPATHS["question"])
+                current_questions = self.selectors.find_elements(self.driver, "question", "doHomework")
                 if i >= len(current_questions):
                     self.log_signal.emit("所有题目已处理完成")
-                    break
+                    return None
                     
                 question = current_questions[i]
                 
                 # 获取题目内容
-                question_content = question.find_element(By.XPATH, XPATHS["question_content"])
+                question_content = self.selectors.find_element(question, "question_content", "doHomework")
                 question_text = question_content.text
                 
                 # 清理题目文本，去除序号和分数信息
@@ -899,21 +863,37 @@ class BrowserAutomation(QThread):
                     
                     # 判断题目类型并填写答案
                     if self.is_choice_question(question):
-                        self.answer_choice_question(question, answer)
+                        step = (STEP_CHOICE, answer)
                     else:
-                        self.answer_subjective_question(question, answer)
+                        step = (STEP_SUBJECTIVE, answer)
                 else:
                     # 如果没有找到答案，随机选择一个选项（仅对选择题）
                     if self.is_choice_question(question):
                         self.log_signal.emit(f"未找到题目答案，随机选择: {question_text[:30]}...")
-                        self.random_answer_choice(question)
+                        step = (STEP_RANDOM, None)
                     else:
                         self.log_signal.emit(f"未找到题目答案，跳过: {question_text[:30]}...")
+                        step = (STEP_SKIP, None)
+                
+                applied = self.apply_answer_step(question, step)
+                if applied is None:
+                    # 作答失败的题目不能写入方案
+                    plan = None
+                elif plan is not None:
+                    plan.append(applied)
             except Exception as e:
                 self.log_signal.emit(f"处理题目时出错: {str(e)}")
+                plan = None
                 continue
         
-        # 提交答案
+        return plan
+    
+    def submit_answers(self):
+        """提交答案并处理确认对话框，返回提交状态。
+
+        开启流水线提交时，确认提交成功后不再经过成绩页面返回，由调用方直接打开下一个作业，
+        是否真正完成在下次刷新作业列表时核对。
+        """
         try:
             # 等待一下确保所有答案都已保存
             self.wait_with_delay()
@@ -932,87 +912,66 @@ class BrowserAutomation(QThread):
                 self.log_signal.emit(f"检查答题状态时出错: {str(check_error)}")
             
             # 点击提交按钮
-            submit_button = self.driver.find_element(By.XPATH, XPATHS["submit_button"])
+            submit_button = self.selectors.find_element(self.driver, "submit_button", "doHomework")
             submit_button.click()
             self.wait_with_delay() # 统一延迟控制，等待对话框出现
             
             # 处理确认对话框
             try:
                 WebDriverWait(self.driver, TIMEOUTS["element_wait"]).until(
-                    EC.presence_of_element_located((By.XPATH, XPATHS["confirm_dialog"])))
+                    self.selectors.present("confirm_dialog", "doHomework"))
                 
                 # 点击确认按钮
-                confirm_button = self.driver.find_element(By.XPATH, XPATHS["confirm_button"])
+                confirm_button = self.selectors.find_element(self.driver, "confirm_button", "doHomework")
                 confirm_button.click()
                 self.wait_with_delay() # 统一延迟控制
                 self.log_signal.emit("已确认提交答案")
                 
                 # 等待提交完成，检查是否有成功或失败的提示
                 try:
-                    # 等待提交结果
-                    WebDriverWait(self.driver, TIMEOUTS['element_wait'] * 3).until(
-                        lambda driver: "提交试卷成功" in driver.page_source or "提交试卷失败" in driver.page_source
+                    # 等待提交结果，探针只返回提示文本
+                    submit_result = WebDriverWait(self.driver, TIMEOUTS['element_wait'] * 3).until(
+                        lambda driver: probe_message(driver, SUBMIT_RESULT_MESSAGES)
                     )
                     
-                    if "提交试卷成功" in self.driver.page_source:
+                    if "提交试卷成功" in submit_result:
                         self.log_signal.emit("答案提交成功")
-                        
-                        # 等待自动跳转到成绩页面 (myResult.do)
-                        try:
-                            WebDriverWait(self.driver, 5).until(
-                                lambda driver: "myResult.do" in driver.current_url
-                            )
-                            self.log_signal.emit("已跳转到成绩页面")
-                            
-                            # 点击返回按钮
-                            try:
-                                back_button = WebDriverWait(self.driver, 5).until(
-                                    EC.element_to_be_clickable((By.XPATH, XPATHS["back_button"]))
-                                )
-                                back_button.click()
-                                self.log_signal.emit("已点击返回按钮")
-                                
-                                # 等待返回到课程列表页面
-                                WebDriverWait(self.driver, 5).until(
-                                    lambda driver: "myHomework.do" in driver.current_url
-                                )
-                                self.log_signal.emit("已返回课程列表")
-                                
-                            except TimeoutException:
-                                self.log_signal.emit("未找到返回按钮，手动返回课程列表")
-                                self.driver.get(WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do"))
-                                
-                        except TimeoutException:
-                            self.log_signal.emit("未自动跳转到成绩页面，手动返回课程列表")
-                            self.driver.get(WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do"))
-                            
-                    elif "提交试卷失败" in self.driver.page_source:
+                        if not PERFORMANCE_CONFIG["pipelined_submit"]:
+                            self.return_from_result_page()
+                        return SUBMIT_SUCCESS
+                    elif "提交试卷失败" in submit_result:
                         self.log_signal.emit("答案提交失败")
+                        return SUBMIT_FAILED
                     else:
                         self.log_signal.emit("答案提交状态未知")
+                        return SUBMIT_UNKNOWN
                         
                 except TimeoutException:
-                    self.log_signal.emit("等待提交结果超时，可能已成功提交")
-                    # 等待可能的页面跳转
-                    self.wait_with_delay(3)
-                    current_url = self.driver.current_url
-                    if "myResult.do" in current_url:
-                        # 如果已跳转到成绩页面，点击返回
-                        try:
-                            back_button = self.driver.find_element(By.XPATH, XPATHS["back_button"])
-                            back_button.click()
-                            self.log_signal.emit("已点击返回按钮")
-                        except:
+                    self.log_signal.emit("等待提交结果超时，可能已成功提交，刷新作业列表时再确认")
+                    if not PERFORMANCE_CONFIG["pipelined_submit"]:
+                        # 等待可能的页面跳转
+                        self.wait_with_delay(3)
+                        current_url = self.driver.current_url
+                        if "myResult.do" in current_url:
+                            # 如果已跳转到成绩页面，点击返回
+                            try:
+                                back_button = self.selectors.find_element(self.driver, "back_button", "myResult")
+                                back_button.click()
+                                self.log_signal.emit("已点击返回按钮")
+                            except:
+                                self.driver.get(WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do"))
+                        elif "doHomework.do" in current_url:
+                            # 如果还在答题页面，手动返回
                             self.driver.get(WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do"))
-                    elif "doHomework.do" in current_url:
-                        # 如果还在答题页面，手动返回
-                        self.driver.get(WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do"))
-                        self.log_signal.emit("已返回课程列表")
+                            self.log_signal.emit("已返回课程列表")
+                    return SUBMIT_UNKNOWN
                 
             except TimeoutException:
                 self.log_signal.emit("未出现确认对话框，可能已直接提交")
-                # 等待一下看是否有提交结果
-                self.wait_with_delay(3)
+                if not PERFORMANCE_CONFIG["pipelined_submit"]:
+                    # 等待一下看是否有提交结果
+                    self.wait_with_delay(3)
+                return SUBMIT_UNKNOWN
                 
         except Exception as e:
             self.log_signal.emit(f"提交答案时出错: {str(e)}")
@@ -1021,44 +980,71 @@ class BrowserAutomation(QThread):
                 self.driver.get(WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do"))
             except:
                 pass
-
+            return SUBMIT_UNKNOWN
+    
+    def return_from_result_page(self):
+        """等待跳转到成绩页面后点击返回按钮回到课程列表（关闭流水线提交时使用）"""
+        # 等待自动跳转到成绩页面 (myResult.do)
+        try:
+            wait_for_page(self.driver, "myResult", 5)
+            self.log_signal.emit("已跳转到成绩页面")
+            
+            # 点击返回按钮
+            try:
+                back_button = WebDriverWait(self.driver, 5).until(
+                    self.selectors.clickable("back_button", "myResult")
+                )
+                back_button.click()
+                self.log_signal.emit("已点击返回按钮")
+                
+                # 等待返回到课程列表页面
+                wait_for_page(self.driver, "myHomework", 5)
+                self.log_signal.emit("已返回课程列表")
+                
+            except TimeoutException:
+                self.log_signal.emit("未找到返回按钮，手动返回课程列表")
+                self.driver.get(WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do"))
+                
+        except TimeoutException:
+            self.log_signal.emit("未自动跳转到成绩页面，手动返回课程列表")
+            self.driver.get(WEBSITE_URL.replace("fore/index.do", "stu/myHomework.do"))
     
     def is_choice_question(self, question):
         # 检查是否有选项元素来判断是否为选择题
         try:
-            options = question.find_elements(By.XPATH, XPATHS["option"])
+            options = self.selectors.find_elements(question, "option", "doHomework")
             return len(options) > 0
         except:
             return False
     
     def random_answer_choice(self, question):
-        # 随机选择一个选项
+        """随机选择一个选项，返回选中的选项字母，失败时返回None"""
         try:
-            select_options = question.find_elements(By.XPATH, XPATHS["option"])
+            select_options = self.selectors.find_elements(question, "option", "doHomework")
             choice_options = question.find_elements(By.XPATH, ".//ul[contains(@class, 'choose-list')]//li")
             
             if select_options:
                 import random
                 random_index = random.randint(0, len(select_options) - 1)
                 random_option = select_options[random_index]
-                random_option.find_element(By.XPATH, XPATHS["option_input"]).click()
+                self.selectors.find_element(random_option, "option_input", "doHomework").click()
                 
                 # 获取对应的选项文本和字母
-                option_letter = chr(ord('A') + random_index)
+                random_letter = option_letter(random_index)
                 option_text = choice_options[random_index].text if random_index < len(choice_options) else f"选项{random_index+1}"
-                self.log_signal.emit(f"随机选择了选项: {option_letter}.{option_text[:20]}...")
-                return True
-            return False
+                self.log_signal.emit(f"随机选择了选项: {random_letter}.{option_text[:20]}...")
+                return random_letter
+            return None
         except Exception as e:
             self.log_signal.emit(f"随机选择选项时出错: {str(e)}")
-            return False
+            return None
     
     def answer_choice_question(self, question, answer):
         try:
             # 获取选项文本（从choose-list）
             choice_options = question.find_elements(By.XPATH, ".//ul[contains(@class, 'choose-list')]//li")
             # 获取选项输入框（从select-list）
-            select_options = question.find_elements(By.XPATH, XPATHS["option"])
+            select_options = self.selectors.find_elements(question, "option", "doHomework")
             
             if len(choice_options) != len(select_options):
                 self.log_signal.emit(f"选项数量不匹配: 文本选项{len(choice_options)}个，输入选项{len(select_options)}个")
@@ -1070,21 +1056,19 @@ class BrowserAutomation(QThread):
             answer_letter = answer.strip().upper()
             
             # 将选项字母转换为索引
-            option_index = -1
-            if answer_letter in ['A', 'B', 'C', 'D', 'E', 'F']:
-                option_index = ord(answer_letter) - ord('A')
+            answer_index = option_index(answer_letter)
             
             # 检查索引是否有效
-            if 0 <= option_index < len(select_options):
-                select_options[option_index].find_element(By.XPATH, XPATHS["option_input"]).click()
+            if 0 <= answer_index < len(select_options):
+                self.selectors.find_element(select_options[answer_index], "option_input", "doHomework").click()
                 self.wait_with_delay()
-                selected_option = choice_options[option_index].text if option_index < len(choice_options) else f"选项{option_index+1}"
+                selected_option = choice_options[answer_index].text if answer_index < len(choice_options) else f"选项{answer_index+1}"
                 self.log_signal.emit(f"根据题库答案{answer_letter}，选择了选项: {answer_letter}.{selected_option[:30]}...")
                 return True
             else:
                 self.log_signal.emit(f"题库答案{answer_letter}超出选项范围，选择第一个选项")
                 if select_options:
-                    select_options[0].find_element(By.XPATH, XPATHS["option_input"]).click()
+                    self.selectors.find_element(select_options[0], "option_input", "doHomework").click()
                     self.wait_with_delay()
                     first_option_text = choice_options[0].text if choice_options else "第一个选项"
                     self.log_signal.emit(f"默认选择了第一个选项: A.{first_option_text[:30]}...")
@@ -1109,24 +1093,14 @@ class BrowserAutomation(QThread):
         
         return clean_text
     
-    @lru_cache(maxsize=1000)
     def clean_question_text(self, question_text):
         """优化的题目文本清理方法，使用LRU缓存"""
-        import re
-        
-        # 去除开头的数字编号和分数信息
-        # 例如: "1.(25分)一个好的多媒体作品..." -> "一个好的多媒体作品..."
-        cleaned = re.sub(r'^\d+\.\s*\(\d+分\)\s*', '', question_text)
-        
-        # 去除多余的空白字符
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        
-        return cleaned.strip()
+        return clean_question_text(question_text)
     
     def answer_subjective_question(self, question, answer):
         try:
             # 查找文本输入框
-            textarea = question.find_element(By.XPATH, XPATHS["textarea"])
+            textarea = self.selectors.find_element(question, "textarea", "doHomework")
             
             # 清空并输入答案
             textarea.clear()
@@ -1211,33 +1185,19 @@ class BrowserAutomation(QThread):
     def stop(self):
         self.running = False
         # 确保浏览器完全关闭
-        self.cleanup_browser()
+        self.cleanup_browser(discard=True)
         self.log_signal.emit("自动化已停止")
     
     def extract_homework_id_from_onclick(self, onclick_attr):
         """从onclick属性中提取作业ID"""
         try:
-            if onclick_attr and "view('" in onclick_attr:
-                # 提取view('xxx')中的xxx部分
-                start = onclick_attr.find("view('") + 6
-                end = onclick_attr.find("')", start)
-                if end > start:
-                    return onclick_attr[start:end]
-            elif onclick_attr and "kcid=" in onclick_attr:
-                # 从URL参数中提取kcid
-                start = onclick_attr.find("kcid=") + 5
-                end = onclick_attr.find("&", start)
-                if end == -1:
-                    end = onclick_attr.find("'", start)
-                if end > start:
-                    return onclick_attr[start:end]
-            return onclick_attr or "unknown"
+            return extract_homework_id(onclick_attr)
         except Exception as e:
             self.log_signal.emit(f"提取作业ID时出错: {str(e)}")
             return "unknown"
     
-    def mark_homework_as_skipped(self, homework_url):
-        """标注跳过的作业，记录相关信息"""
+    def mark_homework_as_skipped(self, homework_url, reason='在作业详情页面未找到做作业按钮'):
+        """标注跳过的作业，记录相关信息，返回跳过信息，出错时返回None"""
         try:
             # 从URL中提取作业ID并添加到跳过列表
             homework_id = "unknown"
@@ -1246,9 +1206,6 @@ class BrowserAutomation(QThread):
             elif "homeworkId=" in homework_url:
                 homework_id = homework_url.split("homeworkId=")[1].split("&")[0]
             
-            # 将作业ID添加到跳过集合中
-            self.skipped_homeworks.add(homework_id)
-            
             # 尝试获取作业标题或其他标识信息
             homework_title = "未知作业"
             try:
@@ -1270,7 +1227,7 @@ class BrowserAutomation(QThread):
                 'id': homework_id,
                 'title': homework_title,
                 'url': homework_url,
-                'reason': '在作业详情页面未找到做作业按钮',
+                'reason': reason,
                 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
             }
             
@@ -1281,16 +1238,17 @@ class BrowserAutomation(QThread):
             self.log_signal.emit(f"   原因: {skip_info['reason']}")
             self.log_signal.emit(f"   时间: {skip_info['timestamp']}")
             self.log_signal.emit(f"   URL: {homework_url}")
-            self.log_signal.emit(f"🔒 该作业已被标记为跳过，后续不会再次处理")
+            return skip_info
             
         except Exception as e:
             self.log_signal.emit(f"标注跳过作业时出错: {str(e)}")
+            return None
 
 
-class QuestionBankImporter(QObject):
+class QuestionBankImporter(EngineObject):
     """题库导入器 - 从已完成账号导入题库"""
-    log_signal = pyqtSignal(str)
-    progress_signal = pyqtSignal(int, str)  # 进度信号: (百分比, 描述)
+    log_signal = Signal(str)
+    progress_signal = Signal(int, str)  # 进度信号: (百分比, 描述)
     
     def __init__(self, question_db, show_browser=True):
         super().__init__()
@@ -1345,28 +1303,14 @@ class QuestionBankImporter(QObject):
             self._cleanup()
     
     def _init_browser(self):
-        """初始化浏览器"""
+        """从共享浏览器池获取浏览器，避免每次导入都冷启动Chrome"""
         try:
-            # 跟踪启动前的Chrome进程
-            existing_pids = self.track_chrome_processes()
-            
-            # 使用与主程序相同的浏览器配置
-            options = webdriver.ChromeOptions()
-            for option in BROWSER_OPTIONS:
-                options.add_argument(option)
-            
-            # 根据实例配置决定是否显示浏览器窗口
-            if not self.show_browser:
-                options.add_argument("--headless")  # 无头模式，不显示浏览器界面
-                self.log_signal.emit("🌐 浏览器运行在无头模式")
-            else:
+            if self.show_browser:
                 self.log_signal.emit("🌐 浏览器窗口将显示，便于调试")
+            else:
+                self.log_signal.emit("🌐 浏览器运行在无头模式")
             
-            self.driver = webdriver.Chrome(options=options)
-            
-            # 更新Chrome进程列表，记录新启动的进程
-            self.update_chrome_processes(existing_pids)
-            
+            self.driver = get_browser_pool().acquire(show_browser=self.show_browser)
             self.driver.set_page_load_timeout(30)
             self.log_signal.emit("🌐 浏览器初始化成功")
             return True
@@ -1385,7 +1329,7 @@ class QuestionBankImporter(QObject):
             
             # 点击登录按钮打开登录框
             login_button = WebDriverWait(self.driver, TIMEOUTS['element_wait'] * 3).until(
-                EC.element_to_be_clickable((By.XPATH, XPATHS["login_button"])))
+                get_selector_cache().clickable("login_button", "index"))
             login_button.click()
             self.wait_with_delay()  # 统一延迟控制
             
@@ -1444,44 +1388,11 @@ class QuestionBankImporter(QObject):
     def _check_login_error(self):
         """检查登录错误信息 - 复用主程序的错误检查逻辑"""
         try:
-            # 检查是否有弹窗错误信息
-            layers = self.driver.find_elements(By.CSS_SELECTOR, ".layui-layer-content")
-            for layer in layers:
-                try:
-                    # 检查弹窗是否可见
-                    if layer.is_displayed():
-                        layer_text = layer.text.strip()
-                        self.log_signal.emit(f"检测到弹窗内容: {layer_text}")
-                        
-                        # 检查常见的登录错误信息
-                        if any(error in layer_text for error in [
-                            "用户名或密码错误", "密码错误", "账号不存在", 
-                            "用户被置为无效", "请填写用户名", "请填写密码"
-                        ]):
-                            # 尝试关闭弹窗
-                            try:
-                                close_btn = layer.find_element(By.CSS_SELECTOR, ".layui-layer-close")
-                                if close_btn.is_displayed():
-                                    close_btn.click()
-                                    self.wait_with_delay(0.5)  # 统一延迟控制
-                            except:
-                                pass
-                            return layer_text
-                except:
-                    continue
-            
-            # 也检查页面源码中的错误信息（作为备用方法）
-            page_source = self.driver.page_source
-            if "用户名或密码错误" in page_source:
-                return "用户名或密码错误"
-            elif "密码错误" in page_source:
-                return "密码错误"
-            elif "账号不存在" in page_source:
-                return "账号不存在"
-            elif "用户被置为无效" in page_source:
-                return "用户被置为无效"
-                
-            return None
+            # 探针只返回命中的提示文本，并顺手关闭错误弹窗
+            layer_text = probe_message(self.driver, LOGIN_ERROR_MESSAGES, close_layer=True)
+            if layer_text:
+                self.log_signal.emit(f"检测到弹窗内容: {layer_text}")
+            return layer_text
             
         except Exception as e:
             self.log_signal.emit(f"检查登录错误时出现异常: {str(e)}")
@@ -1516,7 +1427,10 @@ class QuestionBankImporter(QObject):
             homework_url = WEBSITE_URL.replace('fore/index.do', 'stu/myHomework.do')
             self.log_signal.emit(f"🔗 访问URL: {homework_url}")
             self.driver.get(homework_url)
-            self.wait_with_delay(3, min_delay=2.0)  # 统一延迟控制，确保页面完全加载
+            try:
+                wait_for_page(self.driver, "myHomework")
+            except TimeoutException:
+                pass  # 可能被重定向到登录页，下面根据URL判断
             
             # 检查是否成功到达作业页面
             current_url = self.driver.current_url
@@ -1651,7 +1565,10 @@ class QuestionBankImporter(QObject):
             view_url = f"{base_url}?kcid={homework_id}"
             self.log_signal.emit(f"📍 正在访问作业页面: {view_url}")
             self.driver.get(view_url)
-            self.wait_with_delay(2, min_delay=1.0)  # 统一延迟控制，确保页面加载
+            try:
+                wait_for_page(self.driver, "viewHomework")
+            except TimeoutException:
+                self.log_signal.emit("⚠️ 作业页面加载超时")
             
             # 查找"查看作业"按钮并点击
             view_homework_btn = None
@@ -1841,10 +1758,11 @@ class QuestionBankImporter(QObject):
             return False
     
     def _cleanup(self):
-        """清理资源"""
+        """清理资源，浏览器重置会话后归还浏览器池"""
         try:
             if self.driver:
-                self.driver.quit()
+                get_browser_pool().release(self.driver)
+                self.driver = None
                 self.log_signal.emit("🧹 浏览器资源已清理")
         except Exception as e:
             self.log_signal.emit(f"⚠️ 清理资源时发生错误: {str(e)}")
\ No newline at end of file
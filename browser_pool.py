@@ -0,0 +1,555 @@
+import logging
+import socket
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+from selenium import webdriver
+try:
+    import psutil
+except ImportError:
+    psutil = None
+import config
+from config import WEBSITE_URL, BROWSER_OPTIONS, BROWSER_POOL_CONFIG, RESOURCE_BLOCKING
+from progress_db import shared_instance
+
+# 浏览器池在后台线程中出现的问题写入日志，不打印到标准输出（命令行模式的标准输出只输出JSON事件）
+logger = logging.getLogger(__name__)
+
+# 关闭页面动画的脚本，在每个文档创建时注入
+DISABLE_ANIMATIONS_SCRIPT = """
+(function () {
+    var css = '*, *::before, *::after { transition: none !important; animation: none !important; scroll-behavior: auto !important; }';
+    function inject() {
+        var style = document.createElement('style');
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+        if (window.jQuery && window.jQuery.fx) {
+            window.jQuery.fx.off = true;
+        }
+    }
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', inject);
+    } else {
+        inject();
+    }
+})();
+"""
+
+
+def get_browser_profile(name=None):
+    """获取浏览器运行配置档，未知名称回退到debug"""
+    name = name or config.BROWSER_PROFILE
+    return config.BROWSER_PROFILES.get(name, config.BROWSER_PROFILES["debug"])
+
+
+def should_show_browser():
+    """根据配置决定是否显示浏览器窗口，打包环境下强制显示（生产配置档除外）"""
+    if get_browser_profile()["headless"]:
+        return False
+    if hasattr(sys, '_MEIPASS'):
+        return True
+    return config.SHOW_BROWSER_WINDOW
+
+
+def build_chrome_options(show_browser=True, profile=None):
+    """构建Chrome启动选项，主程序和题库导入共用"""
+    profile = profile or get_browser_profile()
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = config.PAGE_LOAD_STRATEGY
+    for option in BROWSER_OPTIONS:
+        options.add_argument(option)
+
+    if not show_browser:
+        options.add_argument("--headless")  # 无头模式，不显示浏览器界面
+
+    if profile["block_resources"]:
+        # 图片在内容设置层面直接禁用，连解码都省掉
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        allowed_hosts = RESOURCE_BLOCKING["allowed_hosts"]
+        if allowed_hosts:
+            excludes = ", ".join(f"EXCLUDE {host}, EXCLUDE *.{host}" for host in allowed_hosts)
+            options.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND, {excludes}")
+
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    return options
+
+
+def apply_browser_profile(driver, profile=None):
+    """通过CDP对当前页面目标应用资源屏蔽和动画设置，切换到新目标后需要重新调用"""
+    profile = profile or get_browser_profile()
+    if profile["block_resources"]:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": RESOURCE_BLOCKING["blocked_url_patterns"]})
+    if profile["disable_animations"]:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS_SCRIPT})
+        driver.execute_cdp_cmd("Emulation.setEmulatedMedia", {
+            "features": [{"name": "prefers-reduced-motion", "value": "reduce"}]
+        })
+
+
+def collect_driver_pids(driver):
+    """记录chromedriver及其派生的Chrome进程ID，避免与其他线程的进程混淆。
+    列表依次为chromedriver、Chrome主进程（chromedriver的直接子进程），之后是Chrome的子进程"""
+    pids = []
+    try:
+        service_process = driver.service.process
+        if service_process:
+            pids.append(service_process.pid)
+            if psutil:
+                browsers = psutil.Process(service_process.pid).children()
+                pids.extend(browser.pid for browser in browsers)
+                for browser in browsers:
+                    pids.extend(child.pid for child in browser.children(recursive=True))
+    except Exception:
+        pass
+    return pids
+
+
+def _pid_running(pid):
+    """进程存在且不是僵尸进程（Chrome崩溃后未被回收时pid仍然存在）"""
+    try:
+        process = psutil.Process(pid)
+        return process.is_running() and process.status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def pids_alive(pids):
+    """通过psutil检查chromedriver和Chrome主进程是否存活，不产生WebDriver请求。
+    渲染等子进程会正常退出和重建，不参与判断"""
+    if not psutil or not pids:
+        return True
+    try:
+        return all(_pid_running(pid) for pid in pids[:2])
+    except Exception:
+        return True
+
+
+def kill_pids(pids):
+    """强制结束指定的进程"""
+    if not psutil:
+        return
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            if proc.is_running():
+                proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            pass
+
+
+class SharedBrowserHost:
+    """共享Chrome进程：多个账号各自在独立的浏览器上下文中运行，共用浏览器主进程"""
+
+    def __init__(self, show_browser):
+        self.show_browser = show_browser
+        self.profile = config.BROWSER_PROFILE
+        self.context_count = 0  # 当前承载的上下文数量
+        port = self._find_free_port()
+        options = build_chrome_options(show_browser)
+        options.add_argument(f"--remote-debugging-port={port}")
+        self.driver = webdriver.Chrome(options=options)
+        self.debugger_address = f"127.0.0.1:{port}"
+        self.pids = collect_driver_pids(self.driver)
+
+    @staticmethod
+    def _find_free_port():
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def attach(self):
+        """创建一个连接到共享Chrome的WebDriver会话，不会启动新的浏览器进程"""
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = config.PAGE_LOAD_STRATEGY
+        options.debugger_address = self.debugger_address
+        return webdriver.Chrome(options=options)
+
+    def is_alive(self):
+        return pids_alive(self.pids)
+
+    def close(self):
+        """关闭共享Chrome进程"""
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        kill_pids(self.pids)
+
+
+class PooledBrowser:
+    """浏览器池中的单个浏览器实例"""
+
+    def __init__(self, driver, show_browser, host=None):
+        self.driver = driver
+        self.show_browser = show_browser
+        self.profile = config.BROWSER_PROFILE  # 创建时使用的运行配置档
+        self.host = host              # 上下文模式下所属的共享Chrome
+        self.context_id = None        # 上下文模式下当前使用的浏览器上下文
+        self.created_at = time.time()
+        self.use_count = 0
+        self.pids = collect_driver_pids(driver)
+
+    def processes_alive(self):
+        """通过psutil检查进程是否存活，不产生WebDriver请求"""
+        if self.host and not self.host.is_alive():
+            return False
+        return pids_alive(self.pids)
+
+
+class BrowserPool:
+    """共享浏览器池：预热实例、廉价健康检查、账号间重置会话而不是退出浏览器"""
+
+    def __init__(self, max_size=None, max_idle=None, execution_mode=None):
+        self.max_size = max_size or BROWSER_POOL_CONFIG["max_size"]
+        self.max_idle = max_idle if max_idle is not None else BROWSER_POOL_CONFIG["max_idle"]
+        # "browser": 每个实例独占一个Chrome；"context": 多个实例共享Chrome，各自使用隔离上下文
+        self.execution_mode = execution_mode or BROWSER_POOL_CONFIG["execution_mode"]
+        self._condition = threading.Condition()
+        self._idle = []          # 空闲实例
+        self._in_use = {}        # id(driver) -> PooledBrowser
+        self._starting = 0       # 正在后台启动的实例数
+        self._closed = False
+        self._retiring = set()   # 正在后台关闭实例的线程
+        self._hosts = []         # 上下文模式下的共享Chrome
+        self._host_lock = threading.Lock()
+        parsed = urlparse(WEBSITE_URL)
+        self._site_origin = f"{parsed.scheme}://{parsed.netloc}"
+
+    def _live_count(self):
+        return len(self._idle) + len(self._in_use) + self._starting
+
+    def set_execution_mode(self, mode):
+        """切换执行模式，已有的空闲实例属于旧模式，直接关闭"""
+        if mode not in ("browser", "context") or mode == self.execution_mode:
+            return
+        with self._condition:
+            self.execution_mode = mode
+            idle = self._idle
+            self._idle = []
+        for entry in idle:
+            self._retire_async(entry)
+
+    def _matches(self, entry, show_browser):
+        """空闲实例是否符合当前的显示模式、运行配置档和执行模式"""
+        return (entry.show_browser == show_browser
+                and entry.profile == config.BROWSER_PROFILE
+                and (entry.host is not None) == (self.execution_mode == "context"))
+
+    def _create_browser(self, show_browser):
+        """启动一个新的浏览器实例（耗时操作，调用时不持有锁）"""
+        if self.execution_mode == "context":
+            host = self._acquire_host(show_browser)
+            try:
+                entry = PooledBrowser(host.attach(), show_browser, host=host)
+                self._open_context(entry)
+            except Exception:
+                self._release_host(host)
+                raise
+        else:
+            entry = PooledBrowser(webdriver.Chrome(options=build_chrome_options(show_browser)), show_browser)
+            apply_browser_profile(entry.driver)
+        entry.driver.set_page_load_timeout(BROWSER_POOL_CONFIG["page_load_timeout"])
+        return entry
+
+    def _acquire_host(self, show_browser):
+        """选择一个仍有空位的共享Chrome，没有则启动新的"""
+        limit = BROWSER_POOL_CONFIG["contexts_per_browser"]
+        with self._host_lock:
+            for host in list(self._hosts):
+                if not host.is_alive():
+                    self._hosts.remove(host)
+                    continue
+                if (host.show_browser == show_browser and host.profile == config.BROWSER_PROFILE
+                        and host.context_count < limit):
+                    host.context_count += 1
+                    return host
+            host = SharedBrowserHost(show_browser)
+            host.context_count = 1
+            self._hosts.append(host)
+            return host
+
+    def _release_host(self, host):
+        """上下文释放后减少计数，池已关闭且无上下文时关闭共享Chrome"""
+        with self._host_lock:
+            host.context_count -= 1
+            if host.context_count > 0:
+                return
+            if not self._closed and host.is_alive():
+                return
+            if host in self._hosts:
+                self._hosts.remove(host)
+        host.close()
+
+    def _open_context(self, entry):
+        """为实例创建新的隔离浏览器上下文并切换过去，同时销毁旧上下文"""
+        driver = entry.driver
+        context_id = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+        target_id = driver.execute_cdp_cmd("Target.createTarget", {
+            "url": "about:blank",
+            "browserContextId": context_id
+        })["targetId"]
+        driver.switch_to.window(target_id)
+        # CDP设置按页面目标生效，新目标需要重新应用
+        apply_browser_profile(driver)
+        old_context_id, entry.context_id = entry.context_id, context_id
+        if old_context_id:
+            self._dispose_context(driver, old_context_id)
+
+    def _dispose_context(self, driver, context_id):
+        try:
+            driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+        except Exception:
+            pass
+
+    def _start_in_background(self, show_browser):
+        """后台启动一个实例放入空闲队列，调用方需已为其占用一个名额"""
+        def worker():
+            entry = None
+            try:
+                entry = self._create_browser(show_browser)
+            except Exception as e:
+                logger.warning("浏览器池后台启动实例失败: %s", e)
+            with self._condition:
+                self._starting -= 1
+                if entry and not self._closed:
+                    self._idle.append(entry)
+                elif entry:
+                    # 在锁内登记关闭线程，shutdown(wait=True)看到启动数归零时一定也能等到它
+                    self._retire_async(entry)
+                self._condition.notify_all()
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def prewarm(self, count, show_browser=None):
+        """后台预热指定数量的浏览器实例，不阻塞调用线程"""
+        if show_browser is None:
+            show_browser = should_show_browser()
+        with self._condition:
+            if self._closed:
+                return
+            ready = sum(1 for entry in self._idle if self._matches(entry, show_browser)) + self._starting
+            to_start = min(count - ready, self.max_size - self._live_count())
+            for _ in range(max(0, to_start)):
+                self._starting += 1
+                self._start_in_background(show_browser)
+
+    def is_healthy(self, entry):
+        """廉价健康检查：先看进程是否存活，再做一次最轻量的WebDriver请求"""
+        if not entry.processes_alive():
+            return False
+        try:
+            entry.driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout=None, show_browser=None):
+        """获取一个可用的浏览器，优先使用预热好的空闲实例。池已关闭时抛出RuntimeError"""
+        if show_browser is None:
+            show_browser = should_show_browser()
+        timeout = timeout or BROWSER_POOL_CONFIG["acquire_timeout"]
+        deadline = time.time() + timeout
+
+        while True:
+            entry = None
+            create_new = False
+            stale = None
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("浏览器池已关闭")
+                while True:
+                    entry = next((e for e in self._idle if self._matches(e, show_browser)), None)
+                    if entry:
+                        self._idle.remove(entry)
+                        break
+                    if self._live_count() < self.max_size:
+                        self._starting += 1
+                        create_new = True
+                        break
+                    if self._idle:
+                        # 池已满但空闲实例的模式不匹配，关闭一个腾出名额
+                        stale = self._idle.pop(0)
+                        self._starting += 1
+                        create_new = True
+                        break
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError("等待浏览器池中的可用实例超时")
+                    self._condition.wait(remaining)
+
+            if stale:
+                self._retire(stale)
+
+            if create_new:
+                try:
+                    entry = self._create_browser(show_browser)
+                finally:
+                    with self._condition:
+                        self._starting -= 1
+                        self._condition.notify_all()
+            elif not self.is_healthy(entry):
+                # 空闲实例已崩溃，后台关闭并补充，然后继续获取
+                self.discard_entry(entry)
+                continue
+
+            with self._condition:
+                entry.use_count += 1
+                self._in_use[id(entry.driver)] = entry
+            return entry.driver
+
+    def get_driver_pids(self, driver):
+        """获取某个浏览器实例对应的进程ID列表"""
+        with self._condition:
+            entry = self._in_use.get(id(driver))
+        return list(entry.pids) if entry else []
+
+    def reset_session(self, driver):
+        """清理Cookie和本地存储，使浏览器可以直接用于下一个账号。
+        返回False时旧账号的登录状态可能还在，调用方应丢弃该实例"""
+        with self._condition:
+            entry = self._in_use.get(id(driver))
+        return self._reset_entry(entry, driver)
+
+    def _reset_entry(self, entry, driver):
+        try:
+            if entry and entry.host:
+                # 上下文模式：换一个全新的隔离上下文，旧上下文的全部数据随之销毁
+                self._open_context(entry)
+            else:
+                handles = driver.window_handles
+                for handle in handles[1:]:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                driver.switch_to.window(handles[0])
+                driver.get("about:blank")
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": self._site_origin,
+                    "storageTypes": "cookies,local_storage,session_storage,indexeddb,cache_storage,service_workers"
+                })
+            driver.set_page_load_timeout(BROWSER_POOL_CONFIG["page_load_timeout"])
+            return True
+        except Exception as e:
+            logger.warning("重置浏览器会话失败: %s", e)
+            return False
+
+    def release(self, driver):
+        """归还浏览器：重置会话后放回空闲队列，异常实例直接关闭"""
+        if driver is None:
+            return
+        with self._condition:
+            entry = self._in_use.pop(id(driver), None)
+            closed = self._closed
+        if entry is None:
+            return
+
+        if closed or not self.is_healthy(entry) or not self._reset_entry(entry, driver):
+            self._retire_async(entry)
+            return
+
+        with self._condition:
+            if len(self._idle) < self.max_idle and not self._closed and self._matches(entry, entry.show_browser):
+                self._idle.append(entry)
+                entry = None
+            self._condition.notify_all()
+        if entry:
+            self._retire_async(entry)
+
+    def discard(self, driver, replace=True):
+        """丢弃已崩溃的浏览器，后台关闭并启动替代实例"""
+        if driver is None:
+            return
+        with self._condition:
+            entry = self._in_use.pop(id(driver), None)
+        if entry:
+            self.discard_entry(entry, replace)
+
+    def discard_entry(self, entry, replace=True):
+        """后台关闭实例，并按需补充一个新的空闲实例"""
+        self._retire_async(entry)
+        with self._condition:
+            if replace and not self._closed and self._live_count() < self.max_size:
+                self._starting += 1
+                self._start_in_background(entry.show_browser)
+            self._condition.notify_all()
+
+    def _retire_async(self, entry):
+        def worker():
+            try:
+                self._retire(entry)
+            finally:
+                with self._condition:
+                    self._retiring.discard(thread)
+                    self._condition.notify_all()
+
+        thread = threading.Thread(target=worker, daemon=True)
+        with self._condition:
+            self._retiring.add(thread)
+        thread.start()
+
+    def _retire(self, entry):
+        """彻底关闭一个浏览器实例"""
+        if entry.host:
+            # 上下文模式只销毁自己的上下文，共享Chrome由计数决定是否关闭
+            if entry.context_id:
+                self._dispose_context(entry.driver, entry.context_id)
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+        kill_pids(entry.pids)
+        if entry.host:
+            self._release_host(entry.host)
+
+    def get_stats(self):
+        """获取浏览器池状态"""
+        with self._condition:
+            return {
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "starting": self._starting,
+                "shared_browsers": len(self._hosts),
+                "execution_mode": self.execution_mode,
+                "closed": self._closed
+            }
+
+    def reopen(self):
+        """重新打开已关闭的浏览器池，开始新一轮运行时调用。
+        关闭后只有显式重新打开才能再获取或预热实例，避免停止后仍在运行的工作线程重新启动Chrome"""
+        with self._condition:
+            self._closed = False
+
+    def shutdown(self, wait=False):
+        """关闭所有空闲实例，使用中的实例在归还时关闭。
+
+        wait为True时在当前线程关闭空闲实例，并等待后台启动和后台关闭的实例全部结束后返回。
+        进程即将退出时（工作进程、命令行）必须等待，否则关闭线程随进程一起被终止，
+        chromedriver和Chrome进程残留。
+        """
+        with self._condition:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._condition.notify_all()
+        for entry in idle:
+            if wait:
+                self._retire(entry)
+            else:
+                self._retire_async(entry)
+        if wait:
+            with self._condition:
+                self._condition.wait_for(lambda: self._starting == 0 and not self._retiring)
+
+        # 已没有上下文的共享Chrome直接关闭，其余在最后一个上下文释放时关闭
+        with self._host_lock:
+            empty_hosts = [host for host in self._hosts if host.context_count <= 0]
+            for host in empty_hosts:
+                self._hosts.remove(host)
+        for host in empty_hosts:
+            host.close()
+
+
+# 全局浏览器池实例
+get_browser_pool = shared_instance(BrowserPool)
@@ -3,6 +3,7 @@ import time
 import subprocess
 import psutil
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QThread
+from progress_db import shared_instance
 
 class CleanupWorker(QThread):
     """异步清理工作线程"""
@@ -176,11 +177,4 @@ class CleanupManager(QObject):
             self.cleanup_finished.emit()
 
 # 全局清理管理器实例
-_cleanup_manager = None
-
-def get_cleanup_manager():
-    """获取全局清理管理器实例"""
-    global _cleanup_manager
-    if _cleanup_manager is None:
-        _cleanup_manager = CleanupManager()
-    return _cleanup_manager
\ No newline at end of file
+get_cleanup_manager = shared_instance(CleanupManager)
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""命令行批量运行入口，不加载Qt，适合在没有图形界面的服务器上无人值守运行。
+
+用法:
+    python cli.py --accounts accounts.txt --threads 4
+    python cli.py --accounts accounts.txt --engine async --sessions 24
+    python cli.py --accounts accounts.txt --only failed
+
+账号文件每行一个账号，格式为 "账号" 或 "账号:密码"，省略密码时使用默认密码；
+.csv 文件第一列为账号、第二列为密码。
+运行过程以JSON Lines输出到标准输出，每行一个事件：
+    {"event": "log", "worker": 1, "level": "important", "category": "account", "message": "..."}
+    {"event": "status", "index": 0, "username": "...", "status": "已完成"}
+    {"event": "progress", "completed": 3, "failed": 0, "total": 10, "percent": 30, "per_minute": 1.5, "eta": 280}
+    {"event": "finished", "completed": 10, "total": 10, "elapsed": 123.4, "stopped": false}
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+
+# 必须在导入自动化引擎之前设置（见engine_events.HEADLESS_ENV），引擎将使用纯Python的信号和线程实现
+os.environ.setdefault("TAOSHIWAN_HEADLESS", "1")
+
+# 首次运行时config会打印创建题库文件的提示，不能混入标准输出的JSON事件
+with contextlib.redirect_stdout(sys.stderr):
+    import config
+from config import RAMP_UP_CONFIG, ASYNC_ENGINE_CONFIG
+from account_loader import load_accounts_file, describe_load_result
+from account_store import FILTER_FAILED, FILTER_NOT_DONE_THIS_WEEK, FILTER_NEVER_RUN, FILTER_NAMES
+
+# --only 参数对应的账号筛选条件
+ONLY_FILTERS = {"failed": FILTER_FAILED, "not-done-this-week": FILTER_NOT_DONE_THIS_WEEK, "never-run": FILTER_NEVER_RUN}
+
+
+class HeadlessRunner:
+    """不依赖Qt的多线程运行器：与多线程管理器一样共享账号队列、按启动节奏启动工作线程，
+    事件以JSON Lines写到输出流"""
+
+    def __init__(self, accounts, thread_count, delay_multiplier=1.0, verbose=False, out=None,
+                 engine="thread", sessions=None):
+        from account_queue import AccountQueue
+        from database import QuestionDatabase
+        from progress_model import ProgressModel
+
+        self.accounts = accounts
+        self.thread_count = max(1, min(thread_count, 32))
+        self.delay_multiplier = delay_multiplier
+        self.verbose = verbose
+        self.out = out or sys.stdout
+        self.question_db = QuestionDatabase()
+        self.account_queue = AccountQueue(len(accounts))
+        self.progress = ProgressModel(len(accounts))
+        if engine == "async":
+            # 异步引擎在一个线程中运行全部会话，与线程模式共用账号队列和事件输出
+            from async_engine import AsyncAutomationEngine
+            self.automations = [AsyncAutomationEngine(accounts, self.question_db, sessions)]
+        else:
+            from automation import BrowserAutomation
+            self.automations = [BrowserAutomation(accounts, self.question_db)
+                                for _ in range(min(self.thread_count, len(accounts)))]
+        self.stopped = False
+        self._out_lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        """输出一个JSON事件"""
+        line = json.dumps({"event": event, "time": round(time.time(), 3), **fields}, ensure_ascii=False)
+        with self._out_lock:
+            self.out.write(line + "\n")
+            self.out.flush()
+
+    def emit_progress(self):
+        snapshot = self.progress.snapshot()
+        self.emit("progress", completed=snapshot.completed, failed=snapshot.failed, total=snapshot.total,
+                  percent=snapshot.percent, per_minute=round(snapshot.throughput, 2),
+                  eta=None if snapshot.eta is None else round(snapshot.eta))
+
+    def connect(self, worker_id, automation):
+        """把自动化引擎的信号转换为JSON事件"""
+        from log_filter import classify_log, LOG_IMPORTANT, LOG_LEVEL_NAMES
+
+        def on_log(message):
+            level, category = classify_log(message)
+            if self.verbose or level >= LOG_IMPORTANT:
+                self.emit("log", worker=worker_id, level=LOG_LEVEL_NAMES[level], category=category, message=message)
+
+        def on_status(index, status):
+            self.progress.update(index, status)
+            self.emit("status", worker=worker_id, index=index,
+                      username=self.accounts[index]["username"], status=status)
+            if status in ("已完成", "出错"):
+                self.emit_progress()
+
+        automation.log_signal.connect(on_log)
+        automation.status_signal.connect(on_status)
+
+    def run(self):
+        """运行全部账号，返回是否被中断"""
+        started = time.time()
+        ready = threading.Semaphore(0)
+        threads = []
+        for worker_id, automation in enumerate(self.automations, 1):
+            automation.account_queue = self.account_queue
+            automation.set_operation_delay(automation.operation_delay * self.delay_multiplier)
+            self.connect(worker_id, automation)
+            if hasattr(automation, "browser_ready_signal"):
+                automation.browser_ready_signal.connect(ready.release)
+            threads.append(threading.Thread(target=automation.run, daemon=True))
+
+        self.emit("start", accounts=len(self.accounts), workers=len(threads),
+                  sessions=getattr(self.automations[0], "max_sessions", len(threads)))
+        try:
+            # 与界面的启动节奏一致：上一个线程浏览器就绪或等待超时后再启动下一个
+            profile = RAMP_UP_CONFIG["profile"]
+            for i, thread in enumerate(threads):
+                thread.start()
+                if i + 1 < len(threads):
+                    if profile == "ready":
+                        ready.acquire(timeout=RAMP_UP_CONFIG["interval"])
+                    elif profile == "fixed":
+                        time.sleep(RAMP_UP_CONFIG["interval"])
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stopped = True
+            self.emit("log", worker=0, level="important", category="worker", message="收到中断信号，正在停止...")
+            for automation in self.automations:
+                automation.running = False
+            for thread in threads:
+                thread.join(10)
+
+        self.emit("finished", completed=self.account_queue.completed, total=self.account_queue.total,
+                  elapsed=round(time.time() - started, 1), stopped=self.stopped)
+        return self.stopped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="淘师湾自动答题命令行运行器（无界面）")
+    parser.add_argument("--accounts", required=True, help="账号文件，每行 \"账号\" 或 \"账号:密码\"，也可以是账号、密码两列的CSV文件")
+    parser.add_argument("--threads", type=int, default=1, help="同时运行的线程数（1-32），默认1")
+    parser.add_argument("--engine", choices=["thread", "async"], default="thread",
+                        help="thread: 每个线程驱动一个浏览器；async: 一个事件循环通过CDP同时驱动多个会话（需要websockets）")
+    parser.add_argument("--sessions", type=int, default=ASYNC_ENGINE_CONFIG["max_sessions"],
+                        help=f"异步引擎同时运行的会话数，默认{ASYNC_ENGINE_CONFIG['max_sessions']}")
+    parser.add_argument("--delay", type=float, default=1.0, help="操作延迟倍数，默认1.0")
+    parser.add_argument("--profile", choices=["production", "debug"], default="production",
+                        help="浏览器运行配置档，默认production（无头运行并屏蔽图片和字体）")
+    parser.add_argument("--only", choices=list(ONLY_FILTERS),
+                        help="只处理账号文件中符合条件的账号：上次运行出错、本周未完成或从未运行（依据账号库中的运行记录）")
+    parser.add_argument("--no-resume", action="store_true", help="不续跑上次中断的运行，重新处理全部账号")
+    parser.add_argument("--verbose", action="store_true", help="输出全部日志，默认只输出账号状态相关的重要日志")
+    args = parser.parse_args(argv)
+
+    try:
+        load_result = load_accounts_file(args.accounts)
+    except OSError as e:
+        parser.error(f"无法读取账号文件: {e}")
+    accounts = load_result.accounts
+    if not accounts:
+        parser.error("账号文件中没有有效的账号")
+    if args.only:
+        from account_store import get_account_store
+        account_filter = ONLY_FILTERS[args.only]
+        selected = set(get_account_store().filter_usernames([account["username"] for account in accounts], account_filter))
+        accounts = [account for account in accounts if account["username"] in selected]
+        if not accounts:
+            print(f"没有{FILTER_NAMES[account_filter]}的账号，无需运行", file=sys.stderr)
+            return 0
+
+    config.BROWSER_PROFILE = args.profile
+    config.SHOW_BROWSER_WINDOW = args.profile != "production"
+
+    from progress_journal import get_progress_journal
+    journal = get_progress_journal()
+    if args.engine == "async":
+        from async_engine import websockets
+        if websockets is None:
+            parser.error("异步引擎需要websockets库，请先运行 pip install websockets")
+    runner = HeadlessRunner(accounts, args.threads, args.delay, args.verbose,
+                            engine=args.engine, sessions=max(1, args.sessions))
+    if load_result.duplicates or load_result.invalid:
+        runner.emit("log", worker=0, level="important", category="worker", message=describe_load_result(load_result))
+    resumed, completed_count = journal.begin_run(resume=not args.no_resume)
+    if resumed:
+        runner.emit("log", worker=0, level="important", category="worker", message=f"检测到上次未完成的运行，将从中断处继续（已完成 {completed_count} 个账号）")
+
+    from browser_pool import get_browser_pool
+    try:
+        stopped = runner.run()
+        if not stopped:
+            journal.finish_run()
+    finally:
+        # 归还的浏览器留在池中空闲，中断时丢弃的浏览器在后台线程中关闭，
+        # 都要在进程退出前关闭完成，否则无人值守运行会残留Chrome进程
+        get_browser_pool().shutdown(wait=True)
+    return 130 if stopped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -60,6 +60,12 @@ DEFAULT_PASSWORD = "123456"
 # 数据库文件路径 - 优先使用外部文件
 DATABASE_PATH = ensure_external_db()
 
+# 运行进度日志路径 - 与题库文件放在同一目录，用于中断后续跑
+PROGRESS_JOURNAL_PATH = os.path.join(os.path.dirname(get_external_db_path()), "progress.db")
+
+# 无法完成作业的登记有效期（小时），有效期内登记的账号在读取作业列表时直接过滤，不再打开该作业
+SKIP_REGISTRY_TTL_HOURS = 24
+
 # 浏览器配置
 # 浏览器显示设置
 SHOW_BROWSER_WINDOW = True  # 强制显示外部浏览器窗口，作为主要显示界面
@@ -112,7 +118,74 @@ CPU_OPTIMIZED_OPTIONS = [
 # 合并所有选项
 BROWSER_OPTIONS = BASE_BROWSER_OPTIONS + CPU_OPTIMIZED_OPTIONS
 
-# XPath选择器
+# 页面加载策略："eager" DOM解析完成即返回，不等待图片/样式等子资源，后续由page_probes中的就绪探针确认关键元素；
+# "normal" 等待全部资源加载完成（Selenium默认行为）
+PAGE_LOAD_STRATEGY = "eager"
+
+# 浏览器运行配置档
+# "debug": 显示浏览器窗口，完整加载页面资源，便于观察自动化过程
+# "production": 无头运行，屏蔽图片/媒体/字体和第三方请求，关闭页面动画，适合批量运行
+BROWSER_PROFILE = "debug"
+BROWSER_PROFILES = {
+    "debug": {
+        "headless": False,
+        "block_resources": False,
+        "disable_animations": False
+    },
+    "production": {
+        "headless": True,
+        "block_resources": True,
+        "disable_animations": True
+    }
+}
+
+# 资源屏蔽设置（仅在配置档启用block_resources时生效）
+RESOURCE_BLOCKING = {
+    # 通过CDP Network.setBlockedURLs屏蔽的请求，支持*通配符
+    "blocked_url_patterns": [
+        # 图片
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.bmp", "*.ico", "*.svg",
+        # 音视频
+        "*.mp3", "*.mp4", "*.webm", "*.ogg", "*.wav", "*.flv", "*.m4a",
+        # 字体
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        # 第三方统计和广告
+        "*hm.baidu.com*", "*cnzz.com*", "*google-analytics.com*",
+        "*googletagmanager.com*", "*doubleclick.net*"
+    ],
+    # 允许解析的主机，非空时其余主机在DNS层面直接屏蔽
+    # 注意：如果页面脚本来自CDN，需要把CDN主机加入此列表，否则登录所需的脚本无法加载
+    "allowed_hosts": []
+}
+
+# 浏览器池配置
+BROWSER_POOL_CONFIG = {
+    "max_size": 32,            # 同时存活的浏览器实例上限（与最大线程数一致）
+    "max_idle": 4,             # 归还后保留的空闲实例上限，多余的直接关闭
+    "acquire_timeout": 60,     # 等待可用浏览器的最长时间（秒）
+    "page_load_timeout": 300,  # 重置会话时恢复的页面加载超时（秒）
+    # 执行模式："browser" 每个线程独占一个Chrome；
+    # "context" 多个账号共享一个Chrome进程，各自运行在隔离的浏览器上下文中，内存占用更低
+    "execution_mode": "browser",
+    "contexts_per_browser": 8  # 上下文模式下每个共享Chrome承载的上下文上限
+}
+
+# 多线程启动节奏，由界面线程上的定时器驱动，不阻塞界面
+RAMP_UP_CONFIG = {
+    # "ready": 上一批线程的浏览器就绪后立即启动下一批，最长等待interval秒
+    # "fixed": 每隔interval秒启动一批
+    # "immediate": 同时启动全部线程
+    "profile": "ready",
+    "interval": 2.0,   # 启动间隔/等待就绪的最长时间（秒）
+    "batch_size": 1    # 每批启动的线程数
+}
+
+# 异步引擎配置（命令行 --engine async），一个线程中通过CDP同时驱动多个账号会话
+ASYNC_ENGINE_CONFIG = {
+    "max_sessions": 16,    # 同时运行的账号会话数，每个共享Chrome承载contexts_per_browser个会话
+    "poll_interval": 0.1   # 等待页面和元素时的轮询间隔（秒）
+}
+
 # XPath选择器
 XPATHS = {
     # 登录页面
@@ -157,13 +230,16 @@ UI_CONFIG = {
     "control_panel_width": 320,  # 减少控制面板宽度
     "start_button_style": "background-color: #4CAF50; color: white; font-weight: bold; padding: 6px; font-family: 'Microsoft YaHei', 'PingFang SC', 'Helvetica Neue', Arial, sans-serif;",
     "label_style": "font-weight: bold; font-size: 13px; font-family: 'Microsoft YaHei', 'PingFang SC', 'Helvetica Neue', Arial, sans-serif;",
-    "global_font_family": "Microsoft YaHei, PingFang SC, Helvetica Neue, Arial, sans-serif"
+    "global_font_family": "Microsoft YaHei, PingFang SC, Helvetica Neue, Arial, sans-serif",
+    "log_max_lines": 1000,      # 运行日志面板保留的最大行数
+    "log_flush_interval": 100   # 运行日志批量刷新到界面的间隔（毫秒）
 }
 
 # 超时设置（秒）
 TIMEOUTS = {
     "page_load": 3,  # 页面加载超时时间
     "element_wait": 3,  # 增加元素等待超时时间
+    "page_ready": 10,  # 页面就绪探针的最长等待时间
     "between_actions": 0.2  # 操作间隔时间
 }
 
@@ -180,8 +256,25 @@ PERFORMANCE_CONFIG = {
     "text_cache_size": 1000,       # 文本处理缓存大小
     "ui_refresh_interval": 0.1,    # UI刷新间隔（秒）
     "batch_process_size": 10,      # 批处理大小
-    "connection_pool_size": 5      # 数据库连接池大小
+    "connection_pool_size": 5,     # 数据库连接池大小
+    # 流水线提交：确认提交成功后直接打开下一个作业，不再等待成绩页面并点击返回，
+    # 提交结果在下次刷新作业列表时核对
+    "pipelined_submit": True,
+    # 多线程模式下浏览器崩溃的账号放回共享队列末尾重试的最大次数
+    "account_max_retries": 2,
+    # 多线程模式的工作方式："thread" 所有账号线程运行在界面进程中；
+    # "process" 每个工作者运行在独立进程中，题目解析和匹配不与界面争用GIL
+    "worker_backend": "thread",
+    # 多线程模式下每个工作线程的日志缓冲上限，界面按ui_refresh_interval批量取出，写满后覆盖最旧的日志
+    "event_buffer_size": 1000
 }
 
 # 相似度阈值 (降低阈值以提高匹配成功率)
-SIMILARITY_THRESHOLD = 0.3
\ No newline at end of file
+SIMILARITY_THRESHOLD = 0.3
+
+# 题库全文检索（SQLite FTS5 + trigram分词），SQLite不支持时自动退回LIKE筛选和逐题比较
+QUESTION_SEARCH_CONFIG = {
+    "fts_enabled": True,
+    "candidate_limit": 50,   # 模糊匹配时按BM25相关度取出的候选题目数，只对这些题目计算相似度
+    "max_query_terms": 64    # 题目文本拆成的三字片段上限，过长的题目均匀抽取
+}
@@ -1,12 +1,16 @@
+import logging
 import sqlite3
 import threading
 from contextlib import contextmanager
-from config import DATABASE_PATH, SIMILARITY_THRESHOLD
+from config import DATABASE_PATH, SIMILARITY_THRESHOLD, QUESTION_SEARCH_CONFIG
+
+logger = logging.getLogger(__name__)
 
 class QuestionDatabase:
     def __init__(self, db_path=DATABASE_PATH):
         self.db_path = db_path
         self._local = threading.local()
+        self.fts_enabled = False  # 全文索引是否可用，由init_db检测
         self.init_db()
     
     @contextmanager
@@ -54,8 +58,59 @@ class QuestionDatabase:
             CREATE INDEX IF NOT EXISTS idx_content ON questions(content)
             ''')
             
+            self.fts_enabled = QUESTION_SEARCH_CONFIG["fts_enabled"] and self._init_fts(cursor)
+            
             conn.commit()
     
+    def _init_fts(self, cursor):
+        """创建题目和答案的全文索引（FTS5 trigram分词，中文无需分词即可按子串检索），
+        由触发器与questions表保持同步。SQLite不支持FTS5或trigram时返回False"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'questions_fts'")
+        exists = cursor.fetchone() is not None
+        try:
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+                content, answer, content='questions', content_rowid='id', tokenize='trigram'
+            )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning("当前SQLite不支持全文索引，题库检索使用逐题比较: %s", e)
+            return False
+        
+        cursor.executescript('''
+        CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+            INSERT INTO questions_fts(rowid, content, answer) VALUES (new.id, new.content, new.answer);
+        END;
+        CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+            INSERT INTO questions_fts(questions_fts, rowid, content, answer) VALUES ('delete', old.id, old.content, old.answer);
+        END;
+        CREATE TRIGGER IF NOT EXISTS questions_fts_update AFTER UPDATE ON questions BEGIN
+            INSERT INTO questions_fts(questions_fts, rowid, content, answer) VALUES ('delete', old.id, old.content, old.answer);
+            INSERT INTO questions_fts(rowid, content, answer) VALUES (new.id, new.content, new.answer);
+        END;
+        ''')
+        
+        if not exists:
+            # 已有题库第一次建立索引
+            cursor.execute("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')")
+        return True
+    
+    def _fts_phrase(self, text):
+        """把文本转为FTS5短语，避免其中的引号、运算符被当作查询语法"""
+        return '"' + text.replace('"', '""') + '"'
+    
+    def _fts_match_query(self, cleaned_text):
+        """把清理后的题目文本拆成三字片段，用OR连接成查询，由BM25按命中片段的多少和稀有程度排序"""
+        terms = []
+        for word in cleaned_text.split():
+            terms.extend(word[i:i + 3] for i in range(len(word) - 2))
+        terms = list(dict.fromkeys(terms))
+        max_terms = QUESTION_SEARCH_CONFIG["max_query_terms"]
+        if len(terms) > max_terms:
+            step = len(terms) / max_terms
+            terms = [terms[int(i * step)] for i in range(max_terms)]
+        return " OR ".join(self._fts_phrase(term) for term in terms)
+    
     def add_question(self, content, answer, type, keywords=None):
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -87,10 +142,20 @@ class QuestionDatabase:
             query_words = set(cleaned_query.split())
             
             # 如果没有精确匹配，使用优化的模糊匹配
-            # 只获取必要的字段，减少内存使用
-            cursor.execute('''
-            SELECT answer, content FROM questions
-            ''')
+            # 有全文索引时只对BM25最相关的候选题目计算相似度
+            match_query = self._fts_match_query(cleaned_query) if self.fts_enabled else ""
+            if match_query:
+                cursor.execute('''
+                SELECT q.answer, q.content FROM questions_fts
+                JOIN questions q ON q.id = questions_fts.rowid
+                WHERE questions_fts MATCH ?
+                ORDER BY bm25(questions_fts) LIMIT ?
+                ''', (match_query, QUESTION_SEARCH_CONFIG["candidate_limit"]))
+            else:
+                # 只获取必要的字段，减少内存使用
+                cursor.execute('''
+                SELECT answer, content FROM questions
+                ''')
             
             best_match = None
             highest_similarity = 0
@@ -209,6 +274,70 @@ class QuestionDatabase:
             
             return cursor.fetchall()
     
+    def _search_clause(self, search):
+        """题库表格的筛选条件，返回 (SQL片段, 参数)。
+        有全文索引时走索引，trigram至少需要3个字，更短的文本用LIKE"""
+        if not search:
+            return "", []
+        if self.fts_enabled and len(search) >= 3:
+            return (" AND id IN (SELECT rowid FROM questions_fts WHERE questions_fts MATCH ?)",
+                    [self._fts_phrase(search)])
+        pattern = f"%{search}%"
+        return " AND (content LIKE ? OR answer LIKE ?)", [pattern, pattern]
+
+    def count_questions(self, search=None):
+        """统计题目数量，可按题目或答案中的文本筛选"""
+        clause, params = self._search_clause(search)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM questions WHERE 1 = 1{clause}", params)
+            return cursor.fetchone()[0]
+
+    def get_questions_page(self, after_id=None, limit=200, search=None):
+        """按ID顺序分页读取题目（键集分页），after_id为上一页最后一个题目的ID"""
+        clause, params = self._search_clause(search)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+            SELECT id, content, answer, type FROM questions
+            WHERE id > ?{clause}
+            ORDER BY id LIMIT ?
+            ''', [after_id or 0] + params + [limit])
+            return cursor.fetchall()
+
+    def search_questions(self, text, limit=50):
+        """在题目和答案中检索文本，返回 (id, 题目, 答案, 类型) 列表，有全文索引时按BM25相关度排序"""
+        text = text.strip()
+        if not text:
+            return []
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if self.fts_enabled and len(text) >= 3:
+                cursor.execute('''
+                SELECT q.id, q.content, q.answer, q.type FROM questions_fts
+                JOIN questions q ON q.id = questions_fts.rowid
+                WHERE questions_fts MATCH ?
+                ORDER BY bm25(questions_fts) LIMIT ?
+                ''', (self._fts_phrase(text), limit))
+            else:
+                clause, params = self._search_clause(text)
+                cursor.execute(f'''
+                SELECT id, content, answer, type FROM questions
+                WHERE 1 = 1{clause}
+                ORDER BY id LIMIT ?
+                ''', params + [limit])
+            return cursor.fetchall()
+
+    def delete_questions(self, question_ids):
+        """批量删除题目，返回删除的数量"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+            DELETE FROM questions WHERE id = ?
+            ''', [(question_id,) for question_id in question_ids])
+            conn.commit()
+            return cursor.rowcount
+
     def delete_question(self, question_id):
         with self.get_connection() as conn:
             cursor = conn.cursor()
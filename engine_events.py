@@ -0,0 +1,109 @@
+import os
+import threading
+
+# 设置该环境变量后，即使安装了PyQt5，自动化引擎也使用纯Python的信号和线程实现，
+# 命令行运行时不加载Qt，启动更快、内存占用更低
+HEADLESS_ENV = "TAOSHIWAN_HEADLESS"
+
+
+class BoundSignal:
+    """绑定到实例上的信号：connect注册回调，emit在当前线程依次同步调用"""
+
+    def __init__(self):
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def connect(self, callback):
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def disconnect(self, callback=None):
+        """断开指定回调，不指定时断开全部回调"""
+        with self._lock:
+            if callback is None:
+                self._callbacks.clear()
+            elif callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def emit(self, *args):
+        with self._lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(*args)
+
+
+class PlainSignal:
+    """与pyqtSignal写法一致的信号声明，在类中声明，按实例生成BoundSignal"""
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        bound = instance.__dict__.get(self.name)
+        if bound is None:
+            bound = instance.__dict__.setdefault(self.name, BoundSignal())
+        return bound
+
+
+class PlainObject:
+    """不依赖Qt的QObject替代"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class PlainThread(PlainObject):
+    """不依赖Qt的QThread替代，start在后台线程中执行run"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._thread = None
+
+    def run(self):
+        pass
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def isRunning(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, msecs=None):
+        """等待线程结束，返回线程是否已结束"""
+        if self._thread is None:
+            return True
+        self._thread.join(None if msecs is None else msecs / 1000)
+        return not self._thread.is_alive()
+
+    def quit(self):
+        pass
+
+    def terminate(self):
+        # Python线程无法被强制终止，依靠running标志退出
+        pass
+
+
+QT_AVAILABLE = False
+if not os.environ.get(HEADLESS_ENV):
+    try:
+        from PyQt5.QtCore import QObject, QThread, pyqtSignal
+        QT_AVAILABLE = True
+    except ImportError:
+        pass
+
+if QT_AVAILABLE:
+    # 图形界面中使用Qt信号，跨线程发出的信号由Qt排队到界面线程
+    EngineObject = QObject
+    EngineThread = QThread
+    Signal = pyqtSignal
+else:
+    EngineObject = PlainObject
+    EngineThread = PlainThread
+    Signal = PlainSignal
@@ -0,0 +1,87 @@
+import itertools
+from collections import deque
+from config import PERFORMANCE_CONFIG
+from log_filter import LOG_IMPORTANT, CATEGORY_WORKER
+
+# 工作者发回界面的事件类型，事件为 (类型, 工作者ID, 参数...) 元组
+EVENT_LOG = "log"            # (EVENT_LOG, 工作者ID, 日志, 级别, 分类)，级别和分类见log_filter
+EVENT_STATUS = "status"      # (EVENT_STATUS, 工作者ID, 账号索引, 状态)
+EVENT_READY = "ready"        # (EVENT_READY, 工作者ID)
+EVENT_FINISHED = "finished"  # (EVENT_FINISHED, 工作者ID)
+
+
+class WorkerEventBuffer:
+    """单个工作者的事件缓冲，只有一个写入线程（工作者）和一个读取线程（界面）。
+
+    deque的append/popleft本身是原子操作，写入和读取都不加锁：
+    日志写入有界环形缓冲，写满后覆盖最旧的日志；状态、就绪、结束事件数量少且不能丢失，单独排队。
+    两个队列中的事件都带写入序号，取出时按序号合并，控制事件不会越过在它之前写入的日志。
+    """
+
+    def __init__(self, worker_id, capacity):
+        self.worker_id = worker_id
+        self.logs = deque(maxlen=capacity)  # (序号, 事件)
+        self.controls = deque()  # (序号, 事件)
+        self._sequence = itertools.count()
+        self.dropped = 0  # 被覆盖的日志数，只由写入线程修改
+        self.reported_dropped = 0  # 已提示过的丢弃数，只由读取线程修改
+
+    def push(self, kind, *args):
+        item = (next(self._sequence), (kind, self.worker_id) + args)
+        if kind == EVENT_LOG:
+            if len(self.logs) == self.logs.maxlen:
+                self.dropped += 1
+            self.logs.append(item)
+        else:
+            self.controls.append(item)
+
+    def drain(self, max_logs=None):
+        """按写入顺序取出缓冲中的事件，最多取max_logs条日志（None为不限）。
+        控制事件只在它之前写入的日志全部取出后才取出，结束事件因此总排在该工作者的日志之后"""
+        events = []
+        dropped = self.dropped - self.reported_dropped
+        if dropped:
+            self.reported_dropped += dropped
+            events.append((EVENT_LOG, self.worker_id, f"[线程{self.worker_id}] 日志过多，已丢弃 {dropped} 条较早的日志",
+                           LOG_IMPORTANT, CATEGORY_WORKER))
+        log_count = 0
+        while True:
+            # 只有写入线程追加，日志队列写满时从左侧覆盖但不会变空，查看队首后再取出是安全的
+            control = self.controls[0] if self.controls else None
+            if self.logs and (control is None or self.logs[0][0] < control[0]):
+                if max_logs is not None and log_count >= max_logs:
+                    break
+                events.append(self.logs.popleft()[1])
+                log_count += 1
+            elif control is not None:
+                events.append(self.controls.popleft()[1])
+            else:
+                break
+        return events
+
+
+class EventBus:
+    """工作线程到界面的事件总线：每个工作者一个有界缓冲，工作线程直接写入，
+    界面线程的定时器按固定间隔批量取出，日志再多也不会逐条挤占Qt事件队列"""
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or PERFORMANCE_CONFIG["event_buffer_size"]
+        self._buffers = []
+
+    def register(self, worker_id):
+        """为工作者创建事件缓冲，需在工作者启动前调用"""
+        buffer = WorkerEventBuffer(worker_id, self.capacity)
+        self._buffers.append(buffer)
+        return buffer
+
+    def drain(self, max_events=500):
+        """取出全部工作者缓冲中的事件，日志总数最多约max_events条，由各工作者平分；
+        max_events为None时取出全部事件"""
+        events = []
+        per_worker = None if max_events is None else max(1, max_events // max(1, len(self._buffers)))
+        for buffer in self._buffers:
+            events.extend(buffer.drain(per_worker))
+        return events
+
+    def clear(self):
+        self._buffers = []
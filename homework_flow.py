@@ -0,0 +1,161 @@
+import re
+import time
+from functools import lru_cache
+from config import SKIP_REGISTRY_TTL_HOURS
+from progress_journal import ACCOUNT_IN_PROGRESS, ACCOUNT_COMPLETED, ACCOUNT_FAILED, HOMEWORK_COMPLETED, HOMEWORK_SKIPPED
+from account_store import classify_account_error, RUN_COMPLETED, RUN_FAILED, RUN_INTERRUPTED
+from progress_model import STATUS_COMPLETED, STATUS_INTERRUPTED
+
+# 账号、作业的处理流程中与浏览器驱动无关的部分，线程引擎（BrowserAutomation）和异步引擎（AccountSession）共用。
+# 读取作业列表、打开作业和答题由各引擎用各自的驱动实现，这里只负责队列、核对、跳过和进度记录
+
+# 提交状态
+SUBMIT_SUCCESS = "success"
+SUBMIT_FAILED = "failed"
+SUBMIT_UNKNOWN = "unknown"
+
+
+@lru_cache(maxsize=1000)
+def clean_question_text(question_text):
+    """清理题目文本，去除开头的序号和分数信息"""
+    # 例如: "1.(25分)一个好的多媒体作品..." -> "一个好的多媒体作品..."
+    cleaned = re.sub(r'^\d+\.\s*\(\d+分\)\s*', '', question_text)
+
+    # 去除多余的空白字符
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+
+    return cleaned.strip()
+
+
+def is_login_failure(error):
+    """账号或密码错误等登录失败，重试也不会成功"""
+    return "登录失败" in str(error)
+
+
+def begin_account(journal, account_store, account):
+    """账号开始处理：进度日志标记为进行中，账号库记录本次运行开始"""
+    journal.mark_account(account["username"], ACCOUNT_IN_PROGRESS)
+    account_store.start_run(account["username"], account["password"])
+
+
+def finish_account(journal, account_store, username, completed):
+    """账号处理结束，返回要发出的账号状态。completed为False表示被停止或暂停，
+    账号可能只处理了一部分，保持进行中状态以便续跑"""
+    homework_counts = journal.count_homeworks(username)
+    if completed:
+        journal.mark_account(username, ACCOUNT_COMPLETED)
+        account_store.finish_run(username, RUN_COMPLETED, homework_counts)
+        return STATUS_COMPLETED
+    account_store.finish_run(username, RUN_INTERRUPTED, homework_counts)
+    return STATUS_INTERRUPTED
+
+
+def fail_account(journal, account_store, username, error, session_error=False):
+    """账号处理出错：账号库记录出错原因；登录失败的账号在进度日志中标记为失败并写入app_error.log，
+    返回是否为登录失败（其余错误由引擎决定是否重试）"""
+    account_store.finish_run(username, RUN_FAILED, journal.count_homeworks(username),
+                             classify_account_error(error, session_error))
+    if not is_login_failure(error):
+        return False
+    journal.mark_account(username, ACCOUNT_FAILED)
+    with open('app_error.log', 'a', encoding='utf-8') as f:
+        f.write(f"\n=== 登录失败时间: {time.strftime('%Y-%m-%d %H:%M:%S')} ===\n")
+        f.write(f"账号: {username}\n")
+        f.write(f"错误信息: {str(error)}\n")
+    return True
+
+
+class HomeworkTracker:
+    """一个账号在作业列表页上的处理进度：跳过、已尝试、已提交待核对的作业。
+
+    每次读取作业列表后调用next_queue：先按刷新后的列表核对上一轮的提交结果，
+    再过滤跳过和已尝试过的作业生成本轮队列。进度日志和跳过登记表的读写都在这里，
+    异步引擎需在线程池中调用这些方法。
+    """
+
+    def __init__(self, username, journal, skip_registry, log):
+        self.username = username
+        self.journal = journal
+        self.skip_registry = skip_registry
+        self.log = log
+        self.skipped = set()  # 已标注为无法完成的作业
+        self.attempted = set()  # 已尝试过的作业，避免失败的作业被反复处理
+        self.submitted = {}  # 已提交、等待刷新列表时核对的作业 -> 提交状态
+        self.retried = set()  # 提交后仍在列表中、已重新放回队列一次的作业
+
+    def restore_skips(self):
+        """续跑时恢复该账号上次已跳过的作业"""
+        resumed_skips = self.journal.get_homeworks(self.username, HOMEWORK_SKIPPED)
+        if resumed_skips:
+            self.skipped.update(resumed_skips)
+            self.log(f"从进度日志恢复 {len(resumed_skips)} 个已跳过的作业")
+
+    def next_queue(self, entries):
+        """根据刷新后的作业列表生成本轮待处理队列，没有需要处理的作业时返回空列表"""
+        if self.submitted:
+            self.verify_submissions(entries)
+
+        if not entries:
+            self.log("所有作业已处理完成")
+            return []
+
+        queue = []
+        for entry in entries:
+            if entry["id"] in self.skipped:
+                self.log(f"跳过第 {entry['index'] + 1} 个作业，该作业已被标注为无法完成（作业ID: {entry['id']}）")
+            elif entry["id"] in self.attempted:
+                continue
+            else:
+                # 该账号之前的运行（或对所有账号）已登记为无法完成的作业，不再打开
+                reason = self.skip_registry.get_reason(entry["id"], self.username)
+                if reason:
+                    self.skipped.add(entry["id"])
+                    self.log(f"跳过第 {entry['index'] + 1} 个作业，该作业已被登记为无法完成: {reason}（作业ID: {entry['id']}）")
+                else:
+                    queue.append(entry)
+
+        if not queue:
+            if self.attempted:
+                self.log(f"当前还有 {len(entries)} 个待完成的作业，均已尝试过，处理完成")
+            else:
+                self.log("所有可见的作业都已被标注为跳过，处理完成")
+            return []
+
+        self.log(f"找到 {len(queue)} 个待完成的作业")
+        return queue
+
+    def start(self, entry, position, total):
+        """开始处理队列中的第position个作业"""
+        self.attempted.add(entry["id"])
+        self.log(f"处理作业 {position}/{total}: 第 {entry['index'] + 1} 个作业（作业ID: {entry['id']}）")
+
+    def record_submission(self, homework_id, submit_status):
+        """记下提交状态，下次刷新列表时核对；未提交（None）时不记录"""
+        if submit_status:
+            self.submitted[homework_id] = submit_status
+
+    def verify_submissions(self, entries):
+        """提交后没有经过成绩页面，借助列表刷新核对：已从补作业列表中消失的作业才记为完成，
+        仍在列表中的作业重新放回队列一次"""
+        remaining = {entry["id"] for entry in entries}
+        confirmed = 0
+        for homework_id, status in self.submitted.items():
+            if homework_id not in remaining:
+                self.journal.record_homework(self.username, homework_id, HOMEWORK_COMPLETED)
+                confirmed += 1
+            elif homework_id in self.retried:
+                self.log(f"⚠️ 作业 {homework_id} 重新提交后仍在待完成列表中（提交状态: {status}），不再重试")
+            else:
+                self.log(f"⚠️ 作业 {homework_id} 提交后仍在待完成列表中（提交状态: {status}），将重新尝试")
+                self.attempted.discard(homework_id)
+                self.retried.add(homework_id)
+        self.submitted.clear()
+        if confirmed:
+            self.log(f"已确认 {confirmed} 个作业提交完成")
+
+    def skip(self, homework_id, reason, title=None):
+        """标注并跳过作业，写入进度日志和跳过登记表，续跑时以及之后的运行中该账号都不再重复尝试"""
+        self.skipped.add(homework_id)
+        self.journal.record_homework(self.username, homework_id, HOMEWORK_SKIPPED)
+        self.skip_registry.register(homework_id, reason, title, self.username)
+        self.log(f"🔒 作业 {homework_id} 已标记为跳过，{SKIP_REGISTRY_TTL_HOURS}小时内该账号不会再次处理")
@@ -0,0 +1,101 @@
+import threading
+from config import WEBSITE_URL
+from progress_db import shared_instance
+
+# 作业详情页地址，补作业按钮的view('id')最终跳转到这里
+VIEW_HOMEWORK_URL = WEBSITE_URL.replace("fore/index.do", "stu/viewHomework.do")
+
+ROUTE_DIRECT = "direct"  # 直接打开答题页
+ROUTE_VIEW = "view"      # 先打开详情页，再点击做作业按钮
+ROUTE_CLICK = "click"    # 无法构造URL，回到列表页点击补作业按钮
+
+
+class HomeworkNavigator:
+    """作业导航器：根据作业ID构造目标URL直接跳转，并学习每个作业的路线。
+
+    某个账号经详情页进入答题页后，记下答题页地址，之后的账号直接打开答题页；
+    直达地址失效（例如答题页参数与账号相关）时降级为详情页路线，不再重复尝试。
+    """
+
+    def __init__(self):
+        self._routes = {}  # 作业ID -> {"route": 路线, "url": 答题页地址}
+        self._stats = {ROUTE_DIRECT: 0, ROUTE_VIEW: 0, ROUTE_CLICK: 0, "demoted": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_valid_id(homework_id):
+        """判断提取出的作业ID是否可以用来构造URL"""
+        return bool(homework_id) and homework_id != "unknown" and all(
+            char.isalnum() or char in "-_" for char in homework_id)
+
+    def view_url(self, homework_id):
+        """构造作业详情页地址"""
+        return f"{VIEW_HOMEWORK_URL}?kcid={homework_id}"
+
+    def resolve(self, entry):
+        """返回打开作业使用的 (URL, 路线)，无法构造URL时返回 (None, ROUTE_CLICK)"""
+        homework_id = entry["id"]
+        with self._lock:
+            learned = self._routes.get(homework_id)
+
+        demoted = bool(learned) and learned["route"] == ROUTE_VIEW
+        if learned and learned["route"] == ROUTE_DIRECT:
+            route, url = ROUTE_DIRECT, learned["url"]
+        elif entry.get("url") and not (demoted and "doHomework.do" in entry["url"]):
+            # 列表页按钮自带的地址；已降级的作业不再使用指向答题页的地址
+            route = ROUTE_DIRECT if "doHomework.do" in entry["url"] else ROUTE_VIEW
+            url = entry["url"]
+        elif self.is_valid_id(homework_id):
+            route, url = ROUTE_VIEW, self.view_url(homework_id)
+        else:
+            route, url = ROUTE_CLICK, None
+
+        with self._lock:
+            self._stats[route] += 1
+        return url, route
+
+    def learn(self, homework_id, do_homework_url):
+        """记录作业的答题页地址，之后的账号直接跳转"""
+        if not self.is_valid_id(homework_id):
+            return
+        with self._lock:
+            learned = self._routes.get(homework_id)
+            if learned and learned["route"] == ROUTE_VIEW:
+                return  # 已降级的作业不再学习直达地址
+            self._routes[homework_id] = {"route": ROUTE_DIRECT, "url": do_homework_url}
+
+    def demote(self, homework_id):
+        """直达地址失效，固定使用详情页路线"""
+        with self._lock:
+            self._routes[homework_id] = {"route": ROUTE_VIEW, "url": None}
+            self._stats["demoted"] += 1
+
+    def get_route(self, homework_id):
+        """返回已学习到的路线，没有记录时返回None"""
+        with self._lock:
+            learned = self._routes.get(homework_id)
+            return learned["route"] if learned else None
+
+    def get_stats(self):
+        """返回各路线的使用次数和已学习的作业数量"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["learned"] = sum(1 for item in self._routes.values() if item["route"] == ROUTE_DIRECT)
+        return stats
+
+    def format_stats(self):
+        """把导航统计格式化为一行日志"""
+        stats = self.get_stats()
+        return (f"直达{stats[ROUTE_DIRECT]}次, 经详情页{stats[ROUTE_VIEW]}次, 点击{stats[ROUTE_CLICK]}次, "
+                f"已学习{stats['learned']}个作业, 降级{stats['demoted']}个")
+
+    def reset(self):
+        """清空学习到的路线和统计"""
+        with self._lock:
+            self._routes.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+
+# 全局作业导航器实例
+get_homework_navigator = shared_instance(HomeworkNavigator)
@@ -0,0 +1,72 @@
+import re
+
+# 日志级别，过滤时按整数比较
+LOG_DEBUG = 10      # 题目处理等细节
+LOG_INFO = 20       # 一般过程信息
+LOG_IMPORTANT = 30  # 账号、作业状态等多线程模式下需要显示的信息
+LOG_ERROR = 40      # 错误和失败
+
+LOG_LEVEL_NAMES = {LOG_DEBUG: "debug", LOG_INFO: "info", LOG_IMPORTANT: "important", LOG_ERROR: "error"}
+
+# 日志分类
+CATEGORY_ACCOUNT = "account"
+CATEGORY_HOMEWORK = "homework"
+CATEGORY_QUESTION = "question"
+CATEGORY_BROWSER = "browser"
+CATEGORY_WORKER = "worker"
+CATEGORY_GENERAL = "general"
+
+# 题目处理细节，命中即视为调试日志（优先于重要关键词）
+DETAIL_KEYWORDS = [
+    "处理第", "道题", "题目文本", "找到题目答案", "未找到题目答案，随机选择",
+    "未找到题目答案，跳过", "原始题目文本", "清理后题目文本", "已成功输入",
+    "答案输入验证", "调用setSubject函数", "点击选项", "选择选项",
+    "等待页面跳转", "页面跳转完成", "当前URL", "onclick属性",
+    "补作业按钮onclick属性", "选择第", "个作业进行处理",
+    "正在处理题目", "题目类型", "选择答案", "提交答案",
+    "查找题目", "滚动页面", "等待加载", "题目内容", "答案选项", "题目编号"
+]
+
+# 重要日志的关键词（正则），按分类分组
+IMPORTANT_PATTERNS = {
+    CATEGORY_ACCOUNT: [
+        "开始处理账号", "登录成功", "登录失败", "已完成", "处理完成", "登出", "账号.*继续处理下一个"
+    ],
+    CATEGORY_HOMEWORK: [
+        "标注并跳过", "所有可见的作业都已被标注为跳过", "所有作业已处理完成",
+        "未找到任何补作业按钮", "个待完成的作业", "作业处理完成",
+        "在作业详情页面未找到做作业按钮", "该作业可能已完成或无法进行",
+        "做作业按钮不存在", "跳过作业记录", "该作业已被标记为跳过",
+        r"找到\s*\d+\s*个.*作业", "跳过第", "个作业，该作业已被标注为无法完成"
+    ],
+    CATEGORY_BROWSER: [
+        "浏览器会话.*失效", "重新初始化", "清理完成", "初始化失败", "导航.*失败"
+    ],
+    CATEGORY_WORKER: [
+        "线程.*开始处理", "线程.*处理完成", "线程.*发生错误"
+    ]
+}
+
+# 全部关键词各编译为一个正则，每条日志只需各扫描一次。
+# 分类的顺序决定同时命中多个分类时的归属，与原来逐个匹配时的优先顺序一致
+DETAIL_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in DETAIL_KEYWORDS))
+IMPORTANT_PATTERN = re.compile("|".join(
+    f"(?P<{category}>{'|'.join(patterns)})" for category, patterns in IMPORTANT_PATTERNS.items()))
+ERROR_PATTERN = re.compile("错误|失败|异常")
+
+
+def classify_log(msg):
+    """根据日志文本判断级别和分类，返回 (级别, 分类)。
+    在产生日志的一端调用一次，之后的过滤只比较级别"""
+    if DETAIL_PATTERN.search(msg):
+        return LOG_DEBUG, CATEGORY_QUESTION
+    match = IMPORTANT_PATTERN.search(msg)
+    if match is None:
+        return LOG_INFO, CATEGORY_GENERAL
+    level = LOG_ERROR if ERROR_PATTERN.search(msg) else LOG_IMPORTANT
+    return level, match.lastgroup
+
+
+def is_important_log(msg):
+    """判断工作线程/进程的日志是否需要显示，只保留账号状态相关的重要信息"""
+    return classify_log(msg)[0] >= LOG_IMPORTANT
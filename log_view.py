@@ -0,0 +1,111 @@
+from collections import deque
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor, QKeySequence
+from PyQt5.QtWidgets import QListView, QAbstractItemView, QApplication
+from config import UI_CONFIG
+
+
+class LogListModel(QAbstractListModel):
+    """运行日志的列表模型：日志先进入待显示列表，定时器每隔固定间隔批量插入一次，
+    行数超过上限时从头部批量移除，插入和裁剪的开销与日志产生速度无关"""
+
+    def __init__(self, max_lines=None, flush_interval=None, parent=None):
+        super().__init__(parent)
+        self.max_lines = max_lines or UI_CONFIG["log_max_lines"]
+        self._rows = deque()  # (文本, 颜色)
+        self._pending = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(flush_interval or UI_CONFIG["log_flush_interval"])
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        text, color = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return text
+        if role == Qt.ForegroundRole and color:
+            return QColor(color)
+        return None
+
+    def append(self, text, color=None):
+        """添加一条日志，下次刷新时显示"""
+        self._pending.append((text, color))
+
+    def flush(self):
+        """把待显示的日志批量插入模型，返回是否有新日志"""
+        if not self._pending:
+            return False
+        pending, self._pending = self._pending[-self.max_lines:], []
+
+        overflow = len(self._rows) + len(pending) - self.max_lines
+        if overflow >= len(self._rows) and self._rows:
+            # 新日志足以替换全部旧日志时直接重置，不逐行移除
+            self.beginResetModel()
+            self._rows = deque(pending)
+            self.endResetModel()
+            return True
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._rows.popleft()
+            self.endRemoveRows()
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(pending) - 1)
+        self._rows.extend(pending)
+        self.endInsertRows()
+        return True
+
+    def clear(self):
+        self._pending = []
+        self.beginResetModel()
+        self._rows.clear()
+        self.endResetModel()
+
+    def text_at(self, row):
+        return self._rows[row][0]
+
+
+class LogView(QListView):
+    """运行日志面板：只绘制可见的行，停留在底部时随新日志自动滚动，Ctrl+C复制选中的日志"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log_model = LogListModel(parent=self)
+        self.setModel(self.log_model)
+        self.setUniformItemSizes(True)  # 所有行等高，滚动和布局不需要逐行测量
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setTextElideMode(Qt.ElideRight)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        # 在插入新行之前记录是否停留在底部，用户向上翻看时不打断
+        self._follow = True
+        self.log_model.rowsAboutToBeInserted.connect(self._remember_position)
+        self.log_model.rowsInserted.connect(self._follow_tail)
+        self.log_model.modelReset.connect(self._follow_tail)
+
+    def append(self, text, color=None):
+        self.log_model.append(text, color)
+
+    def clear(self):
+        self.log_model.clear()
+
+    def _remember_position(self, *args):
+        scrollbar = self.verticalScrollBar()
+        self._follow = scrollbar.value() >= scrollbar.maximum() - 2
+
+    def _follow_tail(self, *args):
+        if self._follow:
+            self.scrollToBottom()
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            if rows:
+                QApplication.clipboard().setText("\n".join(self.log_model.text_at(row) for row in rows))
+            return
+        super().keyPressEvent(event)
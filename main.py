@@ -2,6 +2,7 @@ import sys
 import os
 import sys
 import traceback
+import multiprocessing
 import logging
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from ui import AutoAnswerApp
@@ -41,4 +42,6 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    # 多进程模式下打包后的子进程需要
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
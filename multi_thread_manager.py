@@ -1,107 +1,79 @@
 import threading
 import time
-from PyQt5.QtCore import QObject, pyqtSignal, QThread
+import multiprocessing
+from collections import deque
+from PyQt5.QtCore import QObject, pyqtSignal, QThread, QTimer
+import config
+from config import PERFORMANCE_CONFIG, RAMP_UP_CONFIG
 from automation import BrowserAutomation
+from browser_pool import get_browser_pool
+from selector_cache import get_selector_cache
+from homework_navigator import get_homework_navigator
+from skip_registry import get_skip_registry
 import queue
 from cpu_optimization import get_cpu_optimizer
+from account_queue import AccountQueue
+from log_filter import classify_log, LOG_IMPORTANT, LOG_ERROR, CATEGORY_WORKER
+from process_worker import ProcessWorker, ProcessAccountQueue
+from event_bus import EventBus, EVENT_LOG, EVENT_STATUS, EVENT_READY, EVENT_FINISHED
+from progress_model import ProgressModel
 
 class ThreadWorker(QThread):
-    """单个线程工作器"""
-    log_signal = pyqtSignal(str, int)  # 日志信号，包含线程ID
-    status_signal = pyqtSignal(int, str, int)  # 状态信号，包含线程ID
-    progress_signal = pyqtSignal(int, str, int)  # 进度信号，包含线程ID
-    finished_signal = pyqtSignal(int)  # 完成信号，包含线程ID
+    """单个线程工作器，日志和账号状态直接写入事件总线中本线程的缓冲，由管理器定时批量取出"""
     
-    def __init__(self, thread_id, accounts, question_db, delay_multiplier=1.0):
+    def __init__(self, thread_id, accounts, question_db, delay_multiplier=1.0, account_queue=None, events=None,
+                 log_level=LOG_IMPORTANT):
         super().__init__()
         self.thread_id = thread_id
         self.accounts = accounts
+        self.account_queue = account_queue  # 共享账号队列，为None时处理accounts中的全部账号
         self.question_db = question_db
         self.delay_multiplier = delay_multiplier
+        self.events = events  # 事件总线中本线程的缓冲（event_bus.WorkerEventBuffer）
+        self.log_level = log_level  # 低于该级别的日志不写入缓冲
         self.running = False
         self.paused = False
+        self.finished = False  # 管理器是否已处理该线程的结束事件
         self.automation = None
         self.global_start_index = 0  # 全局起始索引
         
     def filtered_log_emit(self, msg):
-        """过滤日志消息，只输出账号状态相关的重要信息"""
-        # 定义需要保留的重要日志关键词
-        important_keywords = [
-            # 账号状态相关
-            "开始处理账号", "登录成功", "登录失败", "已完成", "处理完成",
-            # 作业状态相关 
-            "标注并跳过", "所有可见的作业都已被标注为跳过", "所有作业已处理完成",
-            "未找到任何补作业按钮", "个待完成的作业", "作业处理完成",
-            "在作业详情页面未找到做作业按钮", "该作业可能已完成或无法进行",
-            "做作业按钮不存在", "跳过作业记录", "该作业已被标记为跳过",
-            # 错误和异常
-            "浏览器会话.*失效", "重新初始化", "清理完成", "初始化失败",
-            "导航.*失败", "登出", "账号.*继续处理下一个",
-            # 重要状态信息
-            "线程.*开始处理", "线程.*处理完成", "线程.*发生错误"
-        ]
-        
-        # 定义需要过滤掉的详细处理日志关键词
-        filter_keywords = [
-            "处理第", "道题", "题目文本", "找到题目答案", "未找到题目答案，随机选择",
-            "未找到题目答案，跳过", "原始题目文本", "清理后题目文本", "已成功输入",
-            "答案输入验证", "调用setSubject函数", "点击选项", "选择选项",
-            "等待页面跳转", "页面跳转完成", "当前URL", "onclick属性",
-            "补作业按钮onclick属性", "选择第", "个作业进行处理"
-        ]
-        
-        # 检查是否包含需要过滤的关键词
-        for keyword in filter_keywords:
-            if keyword in msg:
-                return  # 过滤掉这些详细处理日志
-        
-        # 检查是否包含重要关键词
-        should_keep = False
-        import re
-        
-        for keyword in important_keywords:
-            # 使用正则表达式匹配，支持模糊匹配
-            if re.search(keyword, msg):
-                should_keep = True
-                break
-        
-        # 特殊处理：保留包含数字的作业统计信息
-        if re.search(r'找到\s*\d+\s*个.*作业', msg):
-            should_keep = True
-        
-        # 特殊处理：保留跳过相关的重要信息
-        if any(word in msg for word in ["跳过第", "个作业，该作业已被标注为无法完成"]):
-            should_keep = True
-            
-        # 保留重要的日志消息
-        if should_keep:
-            self.log_signal.emit(f"[线程{self.thread_id}] {msg}", self.thread_id)
+        """在本线程中对日志分类一次，低于日志级别的直接丢弃"""
+        level, category = classify_log(msg)
+        if level >= self.log_level:
+            self.events.push(EVENT_LOG, f"[线程{self.thread_id}] {msg}", level, category)
         
     def run(self):
         """运行线程"""
+        events = self.events
         try:
             self.running = True
-            self.log_signal.emit(f"线程 {self.thread_id} 开始处理 {len(self.accounts)} 个账号", self.thread_id)
+            if self.account_queue is not None:
+                events.push(EVENT_LOG, f"线程 {self.thread_id} 开始处理，从共享队列领取账号", LOG_IMPORTANT, CATEGORY_WORKER)
+            else:
+                events.push(EVENT_LOG, f"线程 {self.thread_id} 开始处理 {len(self.accounts)} 个账号", LOG_IMPORTANT, CATEGORY_WORKER)
             
             # 创建自动化实例
             self.automation = BrowserAutomation(self.accounts, self.question_db)
+            self.automation.account_queue = self.account_queue
             self.automation.set_operation_delay(self.automation.operation_delay * self.delay_multiplier)
             
-            # 连接信号（添加日志过滤）
+            # 回调在本线程中直接执行，只写入缓冲，不经过Qt事件队列。
+            # 必须连接lambda：直接连接本对象（属于界面线程）的方法会被Qt排队到界面线程执行
             self.automation.log_signal.connect(lambda msg: self.filtered_log_emit(msg))
-            self.automation.status_signal.connect(lambda account_index, status: self.status_signal.emit(self.global_start_index + account_index, status, self.thread_id))
-            self.automation.progress_signal.connect(lambda progress, msg: self.progress_signal.emit(progress, msg, self.thread_id))
+            self.automation.status_signal.connect(lambda account_index, status: events.push(EVENT_STATUS, self.global_start_index + account_index, status))
+            self.automation.browser_ready_signal.connect(lambda: events.push(EVENT_READY))
             
             # 启动自动化
             self.automation.run()
             
-            self.log_signal.emit(f"线程 {self.thread_id} 处理完成", self.thread_id)
+            events.push(EVENT_LOG, f"线程 {self.thread_id} 处理完成", LOG_IMPORTANT, CATEGORY_WORKER)
             
         except Exception as e:
-            self.log_signal.emit(f"线程 {self.thread_id} 发生错误: {str(e)}", self.thread_id)
+            events.push(EVENT_LOG, f"线程 {self.thread_id} 发生错误: {str(e)}", LOG_ERROR, CATEGORY_WORKER)
         finally:
             self.running = False
-            self.finished_signal.emit(self.thread_id)
+            events.push(EVENT_FINISHED)
     
     def pause(self):
         """暂停线程"""
@@ -145,6 +117,25 @@ class MultiThreadManager(QObject):
         self.paused = False
         self.delay_multiplier = 1.0
         self.finished_threads = 0
+        self.account_queue = None
+        self.progress = ProgressModel()  # 总体进度，由账号状态事件更新，定时器按固定频率读取
+        self._published_progress = None  # 上次发出进度信号时的 (进度版本, 时间)
+        self.worker_total = 0  # 本次运行计划启动的线程数
+        self.pending_workers = deque()  # 等待按启动节奏启动的线程
+        self.awaiting_ready = set()  # 已启动、尚未报告浏览器就绪的线程ID
+        # 启动节奏定时器运行在界面线程，错开启动时不阻塞界面
+        self.ramp_timer = QTimer(self)
+        self.ramp_timer.setSingleShot(True)
+        self.ramp_timer.timeout.connect(self.start_next_workers)
+        # 工作方式："thread" 在本进程中运行QThread；"process" 每个工作者运行在独立进程中
+        self.backend = PERFORMANCE_CONFIG["worker_backend"]
+        self.log_level = LOG_IMPORTANT  # 多线程模式下显示的最低日志级别
+        self.event_bus = EventBus()  # 多线程模式下工作线程写入的事件总线
+        self.worker_events = None  # 多进程模式下工作进程发回的事件队列
+        # 两种模式的事件都由界面线程上的定时器按固定间隔批量分发
+        self.event_timer = QTimer(self)
+        self.event_timer.setInterval(int(PERFORMANCE_CONFIG["ui_refresh_interval"] * 1000))
+        self.event_timer.timeout.connect(self.drain_worker_events)
         
     def set_thread_count(self, count):
         """设置线程数量"""
@@ -153,31 +144,11 @@ class MultiThreadManager(QObject):
     def set_delay_multiplier(self, multiplier):
         """设置延迟倍数"""
         self.delay_multiplier = multiplier
-        
-    def distribute_accounts(self, accounts):
-        """将账号分配给不同线程"""
-        if not accounts:
-            return []
-            
-        # 计算每个线程应该处理的账号数量
-        accounts_per_thread = len(accounts) // self.thread_count
-        remainder = len(accounts) % self.thread_count
-        
-        distributed_accounts = []
-        start_index = 0
-        
-        for i in range(self.thread_count):
-            # 如果有余数，前几个线程多分配一个账号
-            current_count = accounts_per_thread + (1 if i < remainder else 0)
-            if current_count > 0:
-                end_index = start_index + current_count
-                thread_accounts = accounts[start_index:end_index]
-                distributed_accounts.append(thread_accounts)
-                start_index = end_index
-            else:
-                break
-                
-        return distributed_accounts
+    
+    def set_backend(self, backend):
+        """设置工作方式，下次开始时生效"""
+        if backend in ("thread", "process"):
+            self.backend = backend
         
     def start_automation(self, accounts):
         """开始多线程自动化"""
@@ -187,6 +158,8 @@ class MultiThreadManager(QObject):
         self.running = True
         self.finished_threads = 0
         self.workers = []
+        self.pending_workers.clear()
+        self.awaiting_ready.clear()
         
         # 应用CPU优化
         try:
@@ -196,84 +169,199 @@ class MultiThreadManager(QObject):
         except Exception as e:
             self.log_signal.emit(f"CPU优化失败: {str(e)}")
         
-        # 分配账号
-        distributed_accounts = self.distribute_accounts(accounts)
-        
-        if not distributed_accounts:
+        if not accounts:
             self.log_signal.emit("没有账号需要处理")
+            self.running = False
             return
-            
-        self.log_signal.emit(f"启动多线程模式，使用 {len(distributed_accounts)} 个线程处理 {len(accounts)} 个账号")
         
-        # 创建并启动工作线程
-        global_start_index = 0
-        for i, thread_accounts in enumerate(distributed_accounts):
-            worker = ThreadWorker(i + 1, thread_accounts, self.question_db, self.delay_multiplier)
-            worker.global_start_index = global_start_index  # 设置全局起始索引
-            
-            # 连接信号
-            worker.log_signal.connect(self.on_worker_log)
-            worker.status_signal.connect(self.on_worker_status)
-            worker.progress_signal.connect(self.on_worker_progress)
-            worker.finished_signal.connect(self.on_worker_finished)
-            
-            self.workers.append(worker)
-            worker.start()
-            
-            # 更新全局起始索引
-            global_start_index += len(thread_accounts)
-            
-            # 错开启动时间，避免同时访问网站
-            time.sleep(2)
+        worker_count = min(self.thread_count, len(accounts))
+        self.worker_total = worker_count
+        self.progress.reset(len(accounts))
+        self._published_progress = None
+        if self.backend == "process":
+            self.create_process_workers(accounts, worker_count)
+        else:
+            self.create_thread_workers(accounts, worker_count)
+        
+        # 按启动节奏错开启动，避免同时访问网站，界面不会被阻塞
+        self.start_next_workers()
     
-    def on_worker_log(self, message, thread_id):
-        """处理工作线程的日志信号"""
-        # 在多线程模式下过滤重要消息，排除题目处理细节
-        important_keywords = [
-            "成功登录", "登录失败", "登录超时", "账号被锁定",
-            "开始处理", "处理完成", "账号完成", "所有题目已完成",
-            "错误", "异常", "失败", "超时", "网络问题",
-            "线程", "启动", "完成", "暂停", "恢复", "停止"
-        ]
+    def create_thread_workers(self, accounts, worker_count):
+        """创建工作线程，所有线程共享一个账号队列，处理完一个账号再领取下一个"""
+        self.account_queue = AccountQueue(len(accounts))
+        self.log_signal.emit(f"启动多线程模式，使用 {worker_count} 个线程处理 {len(accounts)} 个账号")
         
-        # 排除题目处理的详细信息
-        exclude_keywords = [
-            "正在处理题目", "题目类型", "选择答案", "提交答案",
-            "查找题目", "点击选项", "滚动页面", "等待加载",
-            "题目内容", "答案选项", "题目编号"
-        ]
+        # 后台预热浏览器，工作线程启动时可直接取用
+        get_browser_pool().prewarm(worker_count)
         
-        # 检查是否包含重要关键词且不包含排除关键词
-        should_show = any(keyword in message for keyword in important_keywords)
-        should_exclude = any(keyword in message for keyword in exclude_keywords)
+        # 状态事件直接使用账号在完整列表中的索引
+        self.event_bus = EventBus()
+        for i in range(worker_count):
+            worker = ThreadWorker(i + 1, accounts, self.question_db, self.delay_multiplier, self.account_queue,
+                                  self.event_bus.register(i + 1), self.log_level)
+            self.pending_workers.append(worker)
+        self.event_timer.start()
+    
+    def create_process_workers(self, accounts, worker_count):
+        """创建工作进程：题目解析和匹配在各自进程中运行，不与界面争用GIL，
+        日志在子进程中过滤后与状态、进度一起经事件队列发回，由定时器在界面线程分发"""
+        self.account_queue = ProcessAccountQueue(len(accounts))
+        self.worker_events = multiprocessing.Queue()
+        self.log_signal.emit(f"启动多进程模式，使用 {worker_count} 个进程处理 {len(accounts)} 个账号")
+        
+        # 界面上切换的运行设置需要显式传给子进程
+        settings = {
+            "browser_profile": config.BROWSER_PROFILE,
+            "execution_mode": get_browser_pool().execution_mode,
+            "log_level": self.log_level,
+        }
+        for i in range(worker_count):
+            worker = ProcessWorker(i + 1, accounts, self.question_db, self.delay_multiplier, self.account_queue,
+                                   self.worker_events, settings)
+            self.pending_workers.append(worker)
+        self.event_timer.start()
+    
+    def drain_worker_events(self):
+        """定时器回调：批量分发工作者事件，然后刷新总体进度"""
+        self.dispatch_pending_events()
+        self.publish_progress()
+    
+    def publish_progress(self, force=False):
+        """进度有变化或距上次刷新超过1秒（剩余时间随时间变化）时发出进度信号"""
+        now = time.monotonic()
+        published = self._published_progress
+        version = self.progress.version
+        if not force and published and published[0] == version and now - published[1] < 1:
+            return
+        self._published_progress = (version, now)
+        snapshot = self.progress.snapshot()
+        self.progress_signal.emit(snapshot.percent, self.progress.describe(snapshot))
+    
+    def dispatch_pending_events(self):
+        """批量分发工作线程/进程的事件，并检查异常退出、未发送结束事件的进程"""
+        if self.backend != "process":
+            for event in self.event_bus.drain():
+                self.dispatch_event(event)
+                if not self.running:
+                    return  # 全部线程结束
+            return
         
-        if should_show and not should_exclude:
+        events = self.worker_events
+        if events is None:
+            return
+        for _ in range(500):  # 每次最多处理的事件数，避免长时间占用界面线程
+            try:
+                event = events.get_nowait()
+            except Exception:
+                break
+            self.dispatch_event(event)
+            if self.worker_events is None:
+                return  # 全部进程结束
+        else:
+            return  # 还有未处理的事件，下次继续
+        
+        for worker in list(self.workers):
+            if not worker.finished and worker.exitcode is not None:
+                self.log_signal.emit(f"进程 {worker.thread_id} 异常退出（退出码: {worker.exitcode}）")
+                self.on_finished_event(worker.thread_id)
+                if self.worker_events is None:
+                    return
+    
+    def dispatch_event(self, event):
+        """按事件类型分发一个工作者事件"""
+        kind, worker_id = event[0], event[1]
+        if kind == EVENT_LOG:
+            self.on_worker_log(event[2], worker_id, event[3])
+        elif kind == EVENT_STATUS:
+            self.on_worker_status(event[2], event[3], worker_id)
+        elif kind == EVENT_READY:
+            self.on_worker_ready(worker_id)
+        elif kind == EVENT_FINISHED:
+            self.on_finished_event(worker_id)
+    
+    def on_finished_event(self, worker_id):
+        """工作者结束，同一个工作者只处理一次"""
+        for worker in self.workers:
+            if worker.thread_id == worker_id:
+                if worker.finished:
+                    return
+                worker.finished = True
+                worker.running = False
+        self.on_worker_finished(worker_id)
+    
+    def start_next_workers(self):
+        """启动下一批工作线程，并按启动节奏安排再下一批"""
+        self.ramp_timer.stop()
+        if not self.running or self.paused:
+            return  # 暂停期间不启动新线程，恢复后继续
+        
+        profile = RAMP_UP_CONFIG["profile"]
+        batch_size = len(self.pending_workers) if profile == "immediate" else max(1, RAMP_UP_CONFIG["batch_size"])
+        for _ in range(min(batch_size, len(self.pending_workers))):
+            worker = self.pending_workers.popleft()
+            self.workers.append(worker)
+            self.awaiting_ready.add(worker.thread_id)
+            worker.start()
+        
+        if self.pending_workers:
+            # ready模式下浏览器就绪会提前触发下一批，定时器只作为等待上限
+            self.ramp_timer.start(int(RAMP_UP_CONFIG["interval"] * 1000))
+    
+    def on_worker_ready(self, thread_id):
+        """工作线程浏览器就绪，ready模式下当前批次全部就绪即启动下一批"""
+        self.awaiting_ready.discard(thread_id)
+        if (RAMP_UP_CONFIG["profile"] == "ready" and not self.awaiting_ready
+                and self.pending_workers and self.ramp_timer.isActive()):
+            self.start_next_workers()
+    
+    def on_worker_log(self, message, thread_id, level=LOG_IMPORTANT):
+        """处理工作者的日志事件，日志在产生时已分类，这里只比较级别"""
+        if level >= self.log_level:
             self.log_signal.emit(message)
     
     def on_worker_status(self, account_index, status, thread_id):
         """处理工作线程的状态信号"""
+        self.progress.update(account_index, status)
         self.status_signal.emit(account_index, f"线程{thread_id}: {status}")
     
-    def on_worker_progress(self, progress, message, thread_id):
-        """处理工作线程的进度信号"""
-        # 计算总体进度
-        total_progress = sum(worker.automation.current_account_index if worker.automation else 0 for worker in self.workers)
-        total_accounts = sum(len(worker.accounts) for worker in self.workers)
-        
-        if total_accounts > 0:
-            overall_progress = int((total_progress / total_accounts) * 100)
-            self.progress_signal.emit(overall_progress, f"总进度: {total_progress}/{total_accounts}")
-    
     def on_worker_finished(self, thread_id):
         """处理工作线程完成信号"""
         self.finished_threads += 1
         self.log_signal.emit(f"线程 {thread_id} 已完成")
         
-        if self.finished_threads >= len(self.workers):
+        self.awaiting_ready.discard(thread_id)
+        # 浏览器获取失败的线程不会报告就绪，直接结束时同样可以启动下一批
+        if RAMP_UP_CONFIG["profile"] == "ready" and not self.awaiting_ready and self.ramp_timer.isActive():
+            self.start_next_workers()
+        
+        if self.finished_threads >= self.worker_total:
             self.log_signal.emit("所有线程已完成")
+            selector_stats = get_selector_cache().format_stats()
+            if selector_stats:
+                self.log_signal.emit(f"选择器命中统计: {selector_stats}")
+            self.log_signal.emit(f"作业导航统计: {get_homework_navigator().format_stats()}")
+            self.log_signal.emit(f"无法完成作业登记: {get_skip_registry().format_stats()}")
             self.running = False
+            self.stop_event_channel()
+            self.publish_progress(force=True)
             self.all_finished_signal.emit()
     
+    def stop_event_channel(self):
+        """停止分发工作者事件，缓冲中尚未发出的日志和状态先全部发出"""
+        self.event_timer.stop()
+        remaining = self.event_bus.drain(max_events=None)
+        self.event_bus.clear()
+        events, self.worker_events = self.worker_events, None
+        while events is not None:
+            try:
+                remaining.append(events.get_nowait())
+            except Exception:
+                break
+        # 就绪和结束事件已无意义，只发出日志和状态
+        for event in remaining:
+            if event[0] in (EVENT_LOG, EVENT_STATUS):
+                self.dispatch_event(event)
+    
     def pause_automation(self):
         """暂停所有线程"""
         self.paused = True
@@ -287,10 +375,15 @@ class MultiThreadManager(QObject):
         for worker in self.workers:
             worker.resume()
         self.log_signal.emit("已恢复所有线程")
+        if self.running and self.pending_workers and not self.ramp_timer.isActive():
+            self.start_next_workers()
     
     def stop_automation(self):
         """停止所有线程"""
         self.running = False
+        self.ramp_timer.stop()
+        self.pending_workers.clear()
+        self.stop_event_channel()
         
         # 快速设置停止标志
         for worker in self.workers:
@@ -299,6 +392,9 @@ class MultiThreadManager(QObject):
             if hasattr(worker, 'automation') and worker.automation:
                 worker.automation.running = False
         
+        # 关闭浏览器池中的空闲实例，使用中的实例归还时关闭
+        get_browser_pool().shutdown()
+        
         # 使用清理管理器进行异步清理
         try:
             from cleanup_manager import get_cleanup_manager
@@ -0,0 +1,243 @@
+import re
+from urllib.parse import urljoin
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import JavascriptException
+from config import TIMEOUTS
+
+# 各页面类型的就绪条件：URL特征 + 继续操作所需的元素
+# 配合pageLoadStrategy=eager使用，DOM可用且关键元素出现即视为就绪，不再等待图片等子资源
+PAGE_READY_PROBES = {
+    # 首页（登录页）：登录框或退出链接存在
+    "index": {
+        "url": "index.do",
+        "selector": "#loginModal, a[onclick='Redirect_logout();']"
+    },
+    # 作业列表页：课程/作业表格存在
+    "myHomework": {
+        "url": "myHomework.do",
+        "selector": "table.mb30, table.table-hover, .course-list, #courseList"
+    },
+    # 作业详情页：DOM解析完成即可，做作业按钮可能本来就不存在
+    "viewHomework": {
+        "url": "viewHomework.do",
+        "selector": None
+    },
+    # 答题页：题目列表存在
+    "doHomework": {
+        "url": "doHomework.do",
+        "selector": "ul.test-list.test-hover"
+    },
+    # 成绩页：DOM解析完成即可
+    "myResult": {
+        "url": "myResult.do",
+        "selector": None
+    }
+}
+
+# 就绪探针脚本：只返回布尔值，不传输页面内容
+PAGE_READY_SCRIPT = """
+var spec = arguments[0];
+if (window.location.href.indexOf(spec.url) === -1) {
+    return false;
+}
+if (document.readyState === 'loading') {
+    return false;
+}
+if (!spec.selector) {
+    return true;
+}
+return document.querySelector(spec.selector) !== null;
+"""
+
+
+# 登录失败时layer弹窗中的提示
+LOGIN_ERROR_MESSAGES = ["用户名或密码错误", "密码错误", "账号不存在", "用户被置为无效", "请填写用户名", "请填写密码"]
+
+# 提交试卷后的结果提示
+SUBMIT_RESULT_MESSAGES = ["提交试卷成功", "提交试卷失败"]
+
+# 提示信息探针：先查layer弹窗，再查页面可见文本，只返回命中的文本而不是整个页面源码
+MESSAGE_PROBE_SCRIPT = """
+var messages = arguments[0];
+var closeLayer = arguments[1];
+var layers = document.querySelectorAll('.layui-layer-content');
+for (var i = 0; i < layers.length; i++) {
+    var text = (layers[i].textContent || '').trim();
+    for (var j = 0; j < messages.length; j++) {
+        if (text.indexOf(messages[j]) !== -1) {
+            if (closeLayer) {
+                var box = layers[i].closest('.layui-layer');
+                var closeButton = box && box.querySelector('.layui-layer-close');
+                if (closeButton) {
+                    closeButton.click();
+                }
+            }
+            return text;
+        }
+    }
+}
+var body = document.body ? document.body.innerText : '';
+for (var k = 0; k < messages.length; k++) {
+    if (body.indexOf(messages[k]) !== -1) {
+        return messages[k];
+    }
+}
+return null;
+"""
+
+# 登录状态探针：返回 "error:<提示>"、"logged_in" 或 "pending"
+LOGIN_STATE_SCRIPT = """
+var errorMessages = arguments[0];
+var layers = document.querySelectorAll('.layui-layer-content');
+for (var i = 0; i < layers.length; i++) {
+    var text = (layers[i].textContent || '').trim();
+    for (var j = 0; j < errorMessages.length; j++) {
+        if (text.indexOf(errorMessages[j]) !== -1) {
+            return 'error:' + text;
+        }
+    }
+}
+var href = window.location.href;
+if (href.indexOf('myHomework.do') !== -1 || href.indexOf('stu/') !== -1) {
+    return 'logged_in';
+}
+if (document.querySelector("a[onclick='Redirect_logout();']")) {
+    return 'logged_in';
+}
+var body = document.body ? document.body.innerText : '';
+if (body.indexOf('退出') !== -1 || body.indexOf('作业列表') !== -1) {
+    return 'logged_in';
+}
+return 'pending';
+"""
+
+
+def is_page_ready(driver, page_type):
+    """执行一次就绪探针"""
+    try:
+        return bool(driver.execute_script(PAGE_READY_SCRIPT, PAGE_READY_PROBES[page_type]))
+    except JavascriptException:
+        # 页面正在跳转时脚本可能执行失败，视为未就绪
+        return False
+
+
+def probe_message(driver, messages, close_layer=False):
+    """查找页面上出现的提示信息，返回命中的文本，没有时返回None"""
+    try:
+        return driver.execute_script(MESSAGE_PROBE_SCRIPT, messages, close_layer)
+    except JavascriptException:
+        return None
+
+
+def probe_login_state(driver):
+    """执行一次登录状态探针，返回状态码"""
+    try:
+        return driver.execute_script(LOGIN_STATE_SCRIPT, LOGIN_ERROR_MESSAGES) or "pending"
+    except JavascriptException:
+        return "pending"
+
+
+def wait_for_page(driver, page_type, timeout=None):
+    """等待指定类型的页面就绪，超时抛出TimeoutException"""
+    timeout = timeout or TIMEOUTS["page_ready"]
+    WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+        lambda d: is_page_ready(d, page_type))
+    return True
+
+
+# 补作业条目中直接指向作业页面的链接
+HOMEWORK_TARGET_PATTERN = re.compile(r"[\w/.\-]*(?:doHomework|viewHomework)\.do\?[^'\"\s)]*")
+
+# 一次读取作业列表页上全部补作业按钮的onclick和href
+HOMEWORK_LIST_SCRIPT = """
+var entries = [];
+var nodes = document.querySelectorAll('button, a');
+for (var i = 0; i < nodes.length; i++) {
+    if ((nodes[i].textContent || '').indexOf('补作业') === -1) {
+        continue;
+    }
+    entries.push({
+        onclick: nodes[i].getAttribute('onclick') || '',
+        href: nodes[i].getAttribute('href') || ''
+    });
+}
+return {page_url: window.location.href, entries: entries};
+"""
+
+# 点击onclick与给定值一致的补作业按钮，找不到时返回false
+CLICK_HOMEWORK_SCRIPT = """
+var onclick = arguments[0];
+var nodes = document.querySelectorAll('button, a');
+for (var i = 0; i < nodes.length; i++) {
+    if ((nodes[i].textContent || '').indexOf('补作业') !== -1 &&
+            (nodes[i].getAttribute('onclick') || '') === onclick) {
+        nodes[i].click();
+        return true;
+    }
+}
+return false;
+"""
+
+
+def collect_homework_entries(driver):
+    """读取作业列表页上的全部补作业条目，返回页面URL和各条目的onclick/href"""
+    return driver.execute_script(HOMEWORK_LIST_SCRIPT)
+
+
+def extract_homework_id(onclick_attr):
+    """从补作业按钮的onclick或href中提取作业ID"""
+    if onclick_attr and "view('" in onclick_attr:
+        # 提取view('xxx')中的xxx部分
+        start = onclick_attr.find("view('") + 6
+        end = onclick_attr.find("')", start)
+        if end > start:
+            return onclick_attr[start:end]
+    elif onclick_attr and "kcid=" in onclick_attr:
+        # 从URL参数中提取kcid
+        start = onclick_attr.find("kcid=") + 5
+        end = onclick_attr.find("&", start)
+        if end == -1:
+            end = onclick_attr.find("'", start)
+        if end == -1:
+            end = len(onclick_attr)
+        if end > start:
+            return onclick_attr[start:end]
+    return onclick_attr or "unknown"
+
+
+def parse_homework_entries(result):
+    """把HOMEWORK_LIST_SCRIPT的结果整理为作业队列条目：序号、作业ID、onclick和可直接打开的地址"""
+    entries = []
+    for index, raw in enumerate(result["entries"]):
+        target = None
+        match = HOMEWORK_TARGET_PATTERN.search(f"{raw['onclick']} {raw['href']}")
+        if match:
+            target = urljoin(result["page_url"], match.group(0))
+        entries.append({
+            "index": index,
+            "id": extract_homework_id(raw["onclick"] or raw["href"]),
+            "onclick": raw["onclick"],
+            "url": target
+        })
+    return entries
+
+
+def click_homework_entry(driver, onclick):
+    """在作业列表页点击指定的补作业按钮"""
+    return bool(driver.execute_script(CLICK_HOMEWORK_SCRIPT, onclick))
+
+
+# 一次读取答题页上全部题目（含选项）的文本，用于计算题目集合指纹
+QUESTION_TEXTS_SCRIPT = """
+var nodes = document.querySelectorAll(arguments[0]);
+var texts = [];
+for (var i = 0; i < nodes.length; i++) {
+    texts.push(nodes[i].innerText || '');
+}
+return texts;
+"""
+
+
+def collect_question_texts(driver):
+    """返回答题页上每道题的完整文本"""
+    return driver.execute_script(QUESTION_TEXTS_SCRIPT, PAGE_READY_PROBES["doHomework"]["selector"]) or []
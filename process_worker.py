@@ -0,0 +1,180 @@
+import multiprocessing
+import queue
+import threading
+import config
+from config import PERFORMANCE_CONFIG
+# 工作进程发回主进程的事件与线程模式的事件总线格式一致
+from event_bus import EVENT_LOG, EVENT_STATUS, EVENT_READY, EVENT_FINISHED
+
+
+class ProcessAccountQueue:
+    """跨进程共享的账号队列，接口与account_queue.AccountQueue一致。
+    队列中的元素为 (账号索引, 已重试次数)，领取账号的进程负责放回或标记完成"""
+
+    def __init__(self, total, max_retries=None):
+        self.total = total
+        self.max_retries = PERFORMANCE_CONFIG["account_max_retries"] if max_retries is None else max_retries
+        self._pending = multiprocessing.Queue()
+        for index in range(total):
+            self._pending.put((index, 0))
+        self._completed = multiprocessing.Value('i', 0)
+        self._retries = {}  # 本进程已领取的账号索引 -> 已重试次数
+
+    def get(self):
+        """领取下一个账号索引，队列为空时返回None"""
+        try:
+            index, retries = self._pending.get(timeout=0.5)
+        except queue.Empty:
+            return None
+        self._retries[index] = retries
+        return index
+
+    def requeue(self, index):
+        """把账号放回队尾重试，超过最大重试次数时返回False"""
+        retries = self._retries.pop(index, 0)
+        if retries >= self.max_retries:
+            return False
+        self._pending.put((index, retries + 1))
+        return True
+
+    def task_done(self, index):
+        """账号处理结束"""
+        self._retries.pop(index, None)
+        with self._completed.get_lock():
+            self._completed.value += 1
+
+    @property
+    def completed(self):
+        return self._completed.value
+
+
+def run_worker_process(worker_id, accounts, account_queue, events, pause_event, stop_event,
+                       delay_multiplier, settings):
+    """工作进程入口：在独立进程中运行BrowserAutomation，日志在本进程过滤后
+    连同账号状态一起通过事件队列发回主进程，总体进度由主进程根据账号状态汇总"""
+    # 界面上切换的运行设置不会随进程启动传递，在这里重新应用
+    config.BROWSER_PROFILE = settings["browser_profile"]
+
+    from automation import BrowserAutomation
+    from browser_pool import get_browser_pool
+    from database import QuestionDatabase
+    from log_filter import classify_log, LOG_IMPORTANT, LOG_ERROR, CATEGORY_WORKER
+
+    pool = get_browser_pool()
+    pool.set_execution_mode(settings["execution_mode"])
+    question_db = QuestionDatabase()
+    automation = BrowserAutomation(accounts, question_db)
+    automation.account_queue = account_queue
+    automation.set_operation_delay(automation.operation_delay * delay_multiplier)
+
+    log_level = settings["log_level"]
+
+    def emit_log(msg):
+        # 在子进程中分类并过滤，只有需要显示的日志才经过进程间队列
+        level, category = classify_log(msg)
+        if level >= log_level:
+            events.put((EVENT_LOG, worker_id, f"[进程{worker_id}] {msg}", level, category))
+
+    automation.log_signal.connect(emit_log)
+    automation.status_signal.connect(lambda index, status: events.put((EVENT_STATUS, worker_id, index, status)))
+    automation.browser_ready_signal.connect(lambda: events.put((EVENT_READY, worker_id)))
+
+    # 主进程通过事件对象控制暂停和停止，这里同步到自动化实例
+    done = threading.Event()
+
+    def sync_control():
+        while not done.is_set():
+            automation.paused = pause_event.is_set()
+            if stop_event.is_set():
+                automation.running = False
+            done.wait(0.2)
+
+    threading.Thread(target=sync_control, daemon=True).start()
+
+    events.put((EVENT_LOG, worker_id, f"进程 {worker_id} 开始处理，从共享队列领取账号", LOG_IMPORTANT, CATEGORY_WORKER))
+    try:
+        automation.run()
+        events.put((EVENT_LOG, worker_id, f"进程 {worker_id} 处理完成", LOG_IMPORTANT, CATEGORY_WORKER))
+    except Exception as e:
+        events.put((EVENT_LOG, worker_id, f"进程 {worker_id} 发生错误: {str(e)}", LOG_ERROR, CATEGORY_WORKER))
+    finally:
+        done.set()
+        # 进程返回后守护线程随之终止，必须等浏览器全部关闭后再通知主进程
+        pool.shutdown(wait=True)
+        question_db.close_connection()
+        events.put((EVENT_FINISHED, worker_id))
+
+
+class ProcessWorker:
+    """主进程中代表一个工作进程的句柄，接口与ThreadWorker一致，
+    管理器和清理管理器可以像对待线程一样启动、暂停、停止和等待它"""
+
+    def __init__(self, thread_id, accounts, question_db, delay_multiplier=1.0, account_queue=None,
+                 events=None, settings=None):
+        self.thread_id = thread_id
+        self.accounts = accounts
+        self.question_db = question_db  # 子进程自行打开题库，这里仅保留引用
+        self.automation = None  # 自动化实例运行在子进程中
+        self.paused = False
+        self.finished = False  # 主进程是否已处理该进程的结束事件
+        self._running = False
+        self._pause_event = multiprocessing.Event()
+        self._stop_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=run_worker_process,
+            args=(thread_id, accounts, account_queue, events, self._pause_event, self._stop_event,
+                  delay_multiplier, settings),
+            daemon=True)
+
+    @property
+    def running(self):
+        return self._running
+
+    @running.setter
+    def running(self, value):
+        # 与ThreadWorker一致，设置为False即通知子进程停止
+        self._running = value
+        if not value:
+            self._stop_event.set()
+
+    def start(self):
+        """启动工作进程"""
+        self._running = True
+        self.process.start()
+
+    def pause(self):
+        """暂停进程"""
+        self.paused = True
+        self._pause_event.set()
+
+    def resume(self):
+        """恢复进程"""
+        self.paused = False
+        self._pause_event.clear()
+
+    def stop(self):
+        """停止进程，短时间内未退出时强制终止"""
+        self.running = False
+        if not self.wait(500):
+            self.terminate()
+
+    def quit(self):
+        self.running = False
+
+    def wait(self, msecs=None):
+        """等待进程结束，返回进程是否已结束"""
+        if self.process.pid is None:
+            return True
+        self.process.join(None if msecs is None else msecs / 1000)
+        return not self.process.is_alive()
+
+    def terminate(self):
+        if self.process.pid is not None and self.process.is_alive():
+            self.process.terminate()
+
+    def is_alive(self):
+        return self.process.pid is not None and self.process.is_alive()
+
+    @property
+    def exitcode(self):
+        return self.process.exitcode
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+浏览器配置档对比脚本 - 在本地模拟站点上比较debug与production配置档的页面加载时间和浏览器内存占用
+
+用法:
+    python profile_benchmark.py              # debug配置档显示窗口，production无头运行
+    python profile_benchmark.py --headless   # 两个配置档都无头运行，只比较资源屏蔽的效果
+"""
+
+import argparse
+import http.server
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+
+import psutil
+from selenium import webdriver
+
+import config
+from browser_pool import build_chrome_options, apply_browser_profile, get_browser_profile
+
+IMAGE_COUNT = 30
+IMAGE_SIZE = 200 * 1024
+FONT_SIZE = 150 * 1024
+LOAD_ROUNDS = 3
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>模拟作业列表</title>
+<style>
+@font-face {{ font-family: 'Bench1'; src: url('font1.woff2'); }}
+@font-face {{ font-family: 'Bench2'; src: url('font2.ttf'); }}
+body {{ font-family: 'Bench1', 'Bench2', sans-serif; }}
+.spin {{ animation: spin 1s linear infinite; width: 40px; height: 40px; background: #4CAF50; }}
+@keyframes spin {{ from {{ transform: rotate(0deg); }} to {{ transform: rotate(360deg); }} }}
+</style>
+<script src="http://127.0.0.1:{port}/tracker.js"></script>
+</head>
+<body>
+<table class="table mb30">
+{rows}
+</table>
+<div class="spin"></div>
+{images}
+<video src="clip.mp4" autoplay muted></video>
+</body>
+</html>
+"""
+
+
+def build_site(root, port):
+    """生成模拟站点：作业列表、大量图片、字体、视频和一个第三方脚本"""
+    rows = "\n".join(
+        f"<tr><td>作业{i}</td><td><button onclick=\"view('{i:04d}')\">补作业</button></td></tr>"
+        for i in range(20)
+    )
+    images = "\n".join(f'<img src="img{i}.png" width="64" height="64">' for i in range(IMAGE_COUNT))
+    with open(os.path.join(root, "index.html"), "w", encoding="utf-8") as f:
+        f.write(PAGE_TEMPLATE.format(port=port, rows=rows, images=images))
+
+    for i in range(IMAGE_COUNT):
+        with open(os.path.join(root, f"img{i}.png"), "wb") as f:
+            f.write(os.urandom(IMAGE_SIZE))
+    for name in ("font1.woff2", "font2.ttf"):
+        with open(os.path.join(root, name), "wb") as f:
+            f.write(os.urandom(FONT_SIZE))
+    with open(os.path.join(root, "clip.mp4"), "wb") as f:
+        f.write(os.urandom(IMAGE_SIZE * 5))
+    with open(os.path.join(root, "tracker.js"), "w", encoding="utf-8") as f:
+        f.write("var start = Date.now(); while (Date.now() - start < 200) {}\n")
+
+
+def start_server(root):
+    """在后台线程启动静态文件服务器，返回端口"""
+    handler = partial(QuietHandler, directory=root)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def browser_rss_mb(driver):
+    """统计chromedriver派生的全部Chrome进程的常驻内存"""
+    total = 0
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        for proc in root.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+    except Exception:
+        pass
+    return total / (1024 * 1024)
+
+
+def measure_profile(name, url, force_headless):
+    """用指定配置档打开模拟站点若干次，返回加载时间中位数和内存占用"""
+    config.BROWSER_PROFILE = name
+    profile = get_browser_profile(name)
+    show_browser = not (profile["headless"] or force_headless)
+
+    options = build_chrome_options(show_browser, profile)
+    # 对比的是完整加载耗时，不使用eager策略
+    options.page_load_strategy = "normal"
+    driver = webdriver.Chrome(options=options)
+    try:
+        apply_browser_profile(driver, profile)
+        load_times = []
+        for _ in range(LOAD_ROUNDS):
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            start = time.perf_counter()
+            driver.get(url)
+            load_times.append((time.perf_counter() - start) * 1000)
+        return statistics.median(load_times), browser_rss_mb(driver)
+    finally:
+        driver.quit()
+
+
+def run_benchmark(force_headless=False, on_progress=None):
+    """搭建模拟站点并依次测试两个配置档，返回 {配置档: (加载时间中位数ms, 浏览器内存MB)}"""
+    root = tempfile.mkdtemp(prefix="profile_bench_")
+    server = start_server(root)
+    port = server.server_address[1]
+    build_site(root, port)
+    # 页面从localhost加载，127.0.0.1上的脚本模拟第三方请求
+    blocked_patterns = config.RESOURCE_BLOCKING["blocked_url_patterns"]
+    blocked_patterns.append("*://127.0.0.1:*")
+    url = f"http://localhost:{port}/index.html"
+    if on_progress:
+        on_progress(f"模拟站点: {url}")
+        on_progress(f"资源: {IMAGE_COUNT}张图片, 2个字体, 1个视频, 1个第三方脚本")
+
+    original_profile = config.BROWSER_PROFILE
+    results = {}
+    try:
+        for name in ("debug", "production"):
+            if on_progress:
+                on_progress(f"\n正在测试配置档: {name} ...")
+            results[name] = measure_profile(name, url, force_headless)
+    finally:
+        config.BROWSER_PROFILE = original_profile
+        blocked_patterns.remove("*://127.0.0.1:*")
+        server.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较浏览器配置档的加载时间和内存占用")
+    parser.add_argument("--headless", action="store_true", help="debug配置档也以无头模式运行")
+    args = parser.parse_args()
+
+    print("浏览器配置档对比")
+    print("=" * 60)
+    try:
+        results = run_benchmark(args.headless, on_progress=print)
+    except Exception as e:
+        print(f"❌ 测试失败: {e}")
+        return 1
+
+    print("\n" + "=" * 60)
+    print(f"{'配置档':<12}{'加载时间(ms)':>16}{'浏览器内存(MB)':>18}")
+    for name, (load_ms, rss_mb) in results.items():
+        print(f"{name:<12}{load_ms:>16.1f}{rss_mb:>18.1f}")
+
+    debug_ms, debug_rss = results["debug"]
+    prod_ms, prod_rss = results["production"]
+    if debug_ms > 0 and debug_rss > 0:
+        print(f"\n加载时间减少: {(1 - prod_ms / debug_ms) * 100:.1f}%")
+        print(f"内存占用减少: {(1 - prod_rss / debug_rss) * 100:.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
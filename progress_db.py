@@ -0,0 +1,51 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from config import PROGRESS_JOURNAL_PATH
+
+
+class ProgressDatabase:
+    """progress.db中各张表的基类：每个线程使用自己的连接（WAL模式），
+    进度日志、跳过登记表和账号库各自继承并在init_db中建表"""
+
+    row_factory = None  # 子类可以改为sqlite3.Row，按列名读取结果
+
+    def __init__(self, db_path=PROGRESS_JOURNAL_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    @contextmanager
+    def get_connection(self):
+        """获取当前线程的数据库连接，出错时回滚未提交的修改"""
+        if getattr(self._local, 'connection', None) is None:
+            self._local.connection = sqlite3.connect(self.db_path, timeout=30)
+            if self.row_factory is not None:
+                self._local.connection.row_factory = self.row_factory
+            self._local.connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection.execute('PRAGMA synchronous=NORMAL')
+
+        try:
+            yield self._local.connection
+        except Exception:
+            self._local.connection.rollback()
+            raise
+
+    def close_connection(self):
+        """关闭当前线程的数据库连接"""
+        if getattr(self._local, 'connection', None) is not None:
+            self._local.connection.close()
+            self._local.connection = None
+
+
+def shared_instance(factory):
+    """返回全局实例的获取函数：首次调用时创建实例，之后各线程共用同一个实例"""
+    instance = None
+    lock = threading.Lock()
+
+    def get_instance():
+        nonlocal instance
+        with lock:
+            if instance is None:
+                instance = factory()
+            return instance
+    return get_instance
@@ -0,0 +1,156 @@
+import threading
+import time
+from config import PROGRESS_JOURNAL_PATH
+from progress_db import ProgressDatabase, shared_instance
+
+# 账号状态
+ACCOUNT_IN_PROGRESS = "in_progress"
+ACCOUNT_COMPLETED = "completed"
+ACCOUNT_FAILED = "failed"
+
+# 作业状态
+HOMEWORK_COMPLETED = "completed"
+HOMEWORK_SKIPPED = "skipped"
+
+
+class ProgressJournal(ProgressDatabase):
+    """运行进度日志：把每个账号及其已完成/已跳过的作业实时写入题库旁的SQLite文件，
+    程序被停止或浏览器崩溃后再次启动时，从上次中断的位置继续"""
+
+    def __init__(self, db_path=PROGRESS_JOURNAL_PATH):
+        super().__init__(db_path)
+        self._run_lock = threading.Lock()
+        self._run_id = None
+        self.init_db()
+
+    def init_db(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            # 运行记录，finished_at为空表示上次运行未正常结束
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at REAL NOT NULL,
+                finished_at REAL
+            )
+            ''')
+
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS account_progress (
+                run_id INTEGER NOT NULL,
+                username TEXT NOT NULL,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, username)
+            )
+            ''')
+
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS homework_progress (
+                run_id INTEGER NOT NULL,
+                username TEXT NOT NULL,
+                homework_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, username, homework_id)
+            )
+            ''')
+
+            conn.commit()
+
+    def _latest_unfinished_run(self, cursor):
+        cursor.execute('SELECT id FROM runs WHERE finished_at IS NULL ORDER BY id DESC LIMIT 1')
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def begin_run(self, resume=True):
+        """开始一次运行。resume为True且存在未结束的运行时继续该运行，
+        返回 (是否为续跑, 上次已完成的账号数)"""
+        with self._run_lock, self.get_connection() as conn:
+            cursor = conn.cursor()
+            run_id = self._latest_unfinished_run(cursor)
+            if run_id is not None and resume:
+                self._run_id = run_id
+                cursor.execute('SELECT COUNT(*) FROM account_progress WHERE run_id = ? AND status = ?',
+                               (run_id, ACCOUNT_COMPLETED))
+                return True, cursor.fetchone()[0]
+
+            now = time.time()
+            cursor.execute('UPDATE runs SET finished_at = ? WHERE finished_at IS NULL', (now,))
+            cursor.execute('INSERT INTO runs (started_at) VALUES (?)', (now,))
+            self._run_id = cursor.lastrowid
+            conn.commit()
+            return False, 0
+
+    def finish_run(self):
+        """所有账号正常处理结束，下次启动时重新开始"""
+        with self._run_lock, self.get_connection() as conn:
+            if self._run_id is None:
+                return
+            conn.execute('UPDATE runs SET finished_at = ? WHERE id = ?', (time.time(), self._run_id))
+            conn.commit()
+            self._run_id = None
+
+    def _current_run(self):
+        """当前运行ID，未调用begin_run时自动续上或新建一次运行"""
+        if self._run_id is None:
+            self.begin_run(resume=True)
+        return self._run_id
+
+    def mark_account(self, username, status):
+        """记录账号状态"""
+        run_id = self._current_run()
+        with self.get_connection() as conn:
+            conn.execute('''
+            INSERT OR REPLACE INTO account_progress (run_id, username, status, updated_at)
+            VALUES (?, ?, ?, ?)
+            ''', (run_id, username, status, time.time()))
+            conn.commit()
+
+    def is_account_completed(self, username):
+        """账号在本次运行（含中断前）是否已经处理完成"""
+        run_id = self._current_run()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT status FROM account_progress WHERE run_id = ? AND username = ?',
+                           (run_id, username))
+            row = cursor.fetchone()
+            return bool(row) and row[0] == ACCOUNT_COMPLETED
+
+    def record_homework(self, username, homework_id, status):
+        """记录账号下某个作业的处理结果"""
+        run_id = self._current_run()
+        with self.get_connection() as conn:
+            conn.execute('''
+            INSERT OR REPLACE INTO homework_progress (run_id, username, homework_id, status, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (run_id, username, homework_id, status, time.time()))
+            conn.commit()
+
+    def get_homeworks(self, username, status):
+        """返回账号下指定状态的作业ID集合"""
+        run_id = self._current_run()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT homework_id FROM homework_progress
+            WHERE run_id = ? AND username = ? AND status = ?
+            ''', (run_id, username, status))
+            return {row[0] for row in cursor.fetchall()}
+
+    def count_homeworks(self, username):
+        """返回账号在本次运行中各状态的作业数 {状态: 数量}"""
+        run_id = self._current_run()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT status, COUNT(*) FROM homework_progress
+            WHERE run_id = ? AND username = ?
+            GROUP BY status
+            ''', (run_id, username))
+            return dict(cursor.fetchall())
+
+
+# 全局进度日志实例
+get_progress_journal = shared_instance(ProgressJournal)
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import namedtuple
+
+# 账号状态（与BrowserAutomation发出的状态一致）
+STATUS_RUNNING = "处理中"
+STATUS_COMPLETED = "已完成"
+STATUS_FAILED = "出错"
+STATUS_INTERRUPTED = "已中断"  # 被停止或暂停时账号只处理了一部分，不计入完成数，续跑时重新处理
+
+ProgressSnapshot = namedtuple("ProgressSnapshot", [
+    "total", "completed", "failed", "active", "done", "percent",
+    "elapsed",      # 已运行时间（秒）
+    "throughput",   # 每分钟处理完的账号数
+    "eta",          # 预计剩余时间（秒），尚无法估计时为None
+    "version"
+])
+
+
+def format_duration(seconds):
+    """格式化剩余时间，例如 1小时5分、3分20秒、45秒"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}小时{seconds % 3600 // 60}分"
+    if seconds >= 60:
+        return f"{seconds // 60}分{seconds % 60}秒"
+    return f"{seconds}秒"
+
+
+class ProgressModel:
+    """多线程运行的总体进度：账号状态每变化一次只做O(1)的计数更新，
+    读取方按固定频率取快照，总数、完成数、速度和剩余时间来自同一时刻，彼此一致"""
+
+    def __init__(self, total=0):
+        self._lock = threading.Lock()
+        self.reset(total)
+
+    def reset(self, total):
+        """开始新的运行"""
+        with self._lock:
+            self._total = total
+            self._statuses = {}  # 账号索引 -> 最近一次状态
+            self._counts = {STATUS_RUNNING: 0, STATUS_COMPLETED: 0, STATUS_FAILED: 0}
+            self._started = time.monotonic()
+            self._version = 0
+
+    def update(self, index, status):
+        """记录账号状态变化；出错后重试的账号再次处理时从失败数中移出"""
+        with self._lock:
+            previous = self._statuses.get(index)
+            if previous == status:
+                return
+            self._statuses[index] = status
+            if previous in self._counts:
+                self._counts[previous] -= 1
+            if status in self._counts:
+                self._counts[status] += 1
+            self._version += 1
+
+    @property
+    def version(self):
+        """每次计数变化加一，读取方据此判断是否需要刷新"""
+        return self._version
+
+    def snapshot(self):
+        with self._lock:
+            total = self._total
+            completed = self._counts[STATUS_COMPLETED]
+            failed = self._counts[STATUS_FAILED]
+            active = self._counts[STATUS_RUNNING]
+            elapsed = time.monotonic() - self._started
+            version = self._version
+        done = completed + failed
+        throughput = done / elapsed * 60 if elapsed > 0 else 0.0
+        eta = (total - done) / throughput * 60 if throughput > 0 else None
+        percent = int(done / total * 100) if total else 100
+        return ProgressSnapshot(total, completed, failed, active, done, percent, elapsed, throughput, eta, version)
+
+    def describe(self, snapshot=None):
+        """进度条上显示的描述"""
+        snapshot = snapshot or self.snapshot()
+        parts = [f"总进度: {snapshot.done}/{snapshot.total}"]
+        if snapshot.failed:
+            parts[0] += f"（出错 {snapshot.failed}）"
+        if snapshot.done:
+            parts.append(f"{snapshot.throughput:.1f} 个/分钟")
+        if snapshot.eta is not None and snapshot.done < snapshot.total:
+            parts.append(f"剩余约 {format_duration(snapshot.eta)}")
+        return " | ".join(parts)
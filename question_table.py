@@ -0,0 +1,76 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+# 表格列标题
+QUESTION_COLUMNS = ["题目内容", "答案", "类型"]
+
+
+def truncate(text, length):
+    """截断过长的内容，完整内容在提示中显示"""
+    return text if len(text) <= length else text[:length - 3] + "..."
+
+
+class QuestionTableModel(QAbstractTableModel):
+    """题库表格模型：按ID键集分页从SQLite读取，表格滚动到底部时才读取下一页，
+    筛选条件交给SQL处理，界面只持有已读取的行"""
+
+    def __init__(self, question_db, page_size=200, parent=None):
+        super().__init__(parent)
+        self.question_db = question_db
+        self.page_size = page_size
+        self.search = None
+        self.total = 0  # 符合筛选条件的题目总数
+        self._rows = []  # (id, 题目, 答案, 类型)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(QUESTION_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return QUESTION_COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        question_id, content, answer, question_type = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return truncate(content, 50)
+            if column == 1:
+                return truncate(answer, 30)
+            return "选择题" if question_type == "choice" else "主观题"
+        if role == Qt.ToolTipRole and column in (0, 1):
+            return content if column == 0 else answer
+        if role == Qt.UserRole:
+            return question_id
+        return None
+
+    def reload(self, search=None):
+        """按新的筛选条件重新加载，只读取第一页"""
+        self.beginResetModel()
+        self.search = search or None
+        self.total = self.question_db.count_questions(self.search)
+        self._rows = self.question_db.get_questions_page(None, self.page_size, self.search)
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._rows:
+            return
+        page = self.question_db.get_questions_page(self._rows[-1][0], self.page_size, self.search)
+        if not page:
+            # 读取期间有题目被删除，以实际读取到的行数为准
+            self.total = len(self._rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def question_id(self, row):
+        return self._rows[row][0]
@@ -0,0 +1,229 @@
+import re
+import threading
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from config import XPATHS
+from progress_db import shared_instance
+
+# 可以转换为CSS的XPath谓词
+_ATTR_EQUALS = re.compile(r"^@([\w-]+)\s*=\s*'([^']*)'$")
+_ATTR_CONTAINS = re.compile(r"^contains\(\s*@([\w-]+)\s*,\s*'([^']*)'\s*\)$")
+_ATTR_STARTS_WITH = re.compile(r"^starts-with\(\s*@([\w-]+)\s*,\s*'([^']*)'\s*\)$")
+_SINGLE_STEP = re.compile(r"^\.?//([\w*]+)(?:\[(.*)\])?$")
+_CSS_IDENTIFIER = re.compile(r"^[A-Za-z_][\w-]*$")
+
+# 没有单个分支能代替完整并集时的标记
+_UNION = ("union", None)
+
+
+def split_xpath_union(xpath):
+    """按顶层的|拆分XPath并集，忽略谓词和引号中的|"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, char in enumerate(xpath):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            parts.append(xpath[start:i].strip())
+            start = i + 1
+    parts.append(xpath[start:].strip())
+    return [part for part in parts if part]
+
+
+def xpath_to_css(xpath):
+    """把单步的简单XPath转换为CSS选择器，无法等价转换时返回None
+
+    支持 //tag[@attr='v']、contains(@attr, 'v')、starts-with(@attr, 'v') 以及用and连接的组合，
+    依赖text()或嵌套路径的写法保持XPath。
+    """
+    match = _SINGLE_STEP.match(xpath)
+    if not match:
+        return None
+    tag, predicate = match.groups()
+    css = "" if tag == "*" else tag
+    if predicate is None:
+        return css or "*"
+    if "[" in predicate or " or " in predicate:
+        return None
+
+    for condition in predicate.split(" and "):
+        condition = condition.strip()
+        equals = _ATTR_EQUALS.match(condition)
+        contains = _ATTR_CONTAINS.match(condition)
+        starts_with = _ATTR_STARTS_WITH.match(condition)
+        if equals:
+            attr, value = equals.groups()
+            if attr == "id" and _CSS_IDENTIFIER.match(value):
+                css += f"#{value}"
+            else:
+                css += f"[{attr}='{value}']"
+        elif contains:
+            css += "[{}*='{}']".format(*contains.groups())
+        elif starts_with:
+            css += "[{}^='{}']".format(*starts_with.groups())
+        else:
+            return None
+    return css or "*"
+
+
+def compile_selector(value):
+    """把XPATHS中的一项编译为候选定位器列表，能转换为CSS/ID的分支优先使用快速写法"""
+    if not value.startswith((".", "/", "(")):
+        # 配置中直接写ID的项
+        return [(By.ID, value)]
+    locators = []
+    for alternative in split_xpath_union(value):
+        css = xpath_to_css(alternative)
+        if css and re.match(r"^#[\w-]+$", css):
+            locators.append((By.ID, css[1:]))
+        elif css:
+            locators.append((By.CSS_SELECTOR, css))
+        else:
+            locators.append((By.XPATH, alternative))
+    return locators
+
+
+class SelectorCache:
+    """选择器缓存：按页面类型记住XPath并集中实际命中的分支，下次直接用该分支的CSS/ID写法查找，
+    未命中时才回退到完整的XPath并集"""
+
+    def __init__(self, xpaths=None):
+        self.xpaths = xpaths or XPATHS
+        self._compiled = {}
+        self._preferred = {}  # (页面类型, 选择器名, 是否只取首个元素) -> 候选定位器
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _locators(self, key):
+        locators = self._compiled.get(key)
+        if locators is None:
+            locators = compile_selector(self.xpaths[key])
+            self._compiled[key] = locators
+        return locators
+
+    def _count(self, key, field):
+        with self._lock:
+            stats = self._stats.setdefault(key, {"fast_hits": 0, "fallback_hits": 0, "misses": 0})
+            stats[field] += 1
+
+    def _learn(self, context, key, page_type, first_only, elements):
+        """找出与并集结果一致的分支记为首选；只需要第一个元素时比较首个元素即可。
+        没有分支能单独代替并集时记为_UNION，之后不再重复尝试"""
+        learned = _UNION
+        for candidate in self._locators(key):
+            try:
+                found = context.find_elements(*candidate)
+            except StaleElementReferenceException:
+                raise
+            except Exception:
+                continue
+            if (first_only and found[:1] == elements[:1]) or found == elements:
+                learned = candidate
+                break
+        with self._lock:
+            self._preferred[(page_type, key, first_only)] = learned
+
+    def _find(self, context, key, page_type, first_only, accept=None):
+        """accept为元素条件时，快速写法找到的元素中至少有一个满足条件才算命中，
+        否则查找完整并集：同一选择器的其他分支可能有满足条件的元素（例如按钮隐藏而链接可见）"""
+        preferred = self._preferred.get((page_type, key, first_only))
+        fast_found = False
+        if preferred and preferred is not _UNION:
+            try:
+                elements = context.find_elements(*preferred)
+            except StaleElementReferenceException:
+                raise
+            except Exception:
+                elements = []
+            fast_found = bool(elements)
+            if elements and (accept is None or any(accept(element) for element in elements)):
+                self._count(key, "fast_hits")
+                return elements
+
+        value = self.xpaths[key]
+        by = By.XPATH if value.startswith((".", "/", "(")) else By.ID
+        elements = context.find_elements(by, value)
+        if not elements:
+            self._count(key, "misses")
+            return elements
+
+        self._count(key, "fallback_hits")
+        # 快速写法找到了元素只是不满足条件时，学习结果仍然有效
+        if preferred is not _UNION and not fast_found:
+            self._learn(context, key, page_type, first_only, elements)
+        return elements
+
+    def find_elements(self, context, key, page_type="default"):
+        """查找元素列表，context可以是driver或WebElement"""
+        return self._find(context, key, page_type, False)
+
+    def find_element(self, context, key, page_type="default"):
+        """查找第一个元素，找不到时抛出NoSuchElementException"""
+        elements = self._find(context, key, page_type, True)
+        if not elements:
+            raise NoSuchElementException(f"未找到元素: {key}")
+        return elements[0]
+
+    def present(self, key, page_type="default"):
+        """供WebDriverWait使用的条件：元素存在时返回第一个元素"""
+        def condition(driver):
+            try:
+                elements = self._find(driver, key, page_type, True)
+            except StaleElementReferenceException:
+                return False
+            return elements[0] if elements else False
+        return condition
+
+    def clickable(self, key, page_type="default"):
+        """供WebDriverWait使用的条件：返回第一个可见且可用的元素"""
+        def usable(element):
+            return element.is_displayed() and element.is_enabled()
+
+        def condition(driver):
+            try:
+                for element in self._find(driver, key, page_type, False, accept=usable):
+                    if usable(element):
+                        return element
+            except StaleElementReferenceException:
+                pass
+            return False
+        return condition
+
+    def get_stats(self):
+        """返回各选择器的命中统计以及学习到的首选写法"""
+        with self._lock:
+            stats = {key: dict(value) for key, value in self._stats.items()}
+            for (page_type, key, first_only), locator in self._preferred.items():
+                if locator is _UNION:
+                    continue
+                learned = stats.setdefault(key, {"fast_hits": 0, "fallback_hits": 0, "misses": 0})
+                learned.setdefault("learned", {})[page_type] = "{}={}".format(*locator)
+        return stats
+
+    def format_stats(self):
+        """把命中统计格式化为一行日志"""
+        parts = []
+        for key, stats in sorted(self.get_stats().items()):
+            total = stats["fast_hits"] + stats["fallback_hits"] + stats["misses"]
+            if total:
+                parts.append(f"{key} 快速{stats['fast_hits']}/回退{stats['fallback_hits']}/未命中{stats['misses']}")
+        return "; ".join(parts)
+
+    def reset(self):
+        """清空学习结果和统计"""
+        with self._lock:
+            self._preferred.clear()
+            self._stats.clear()
+
+
+# 全局选择器缓存实例
+get_selector_cache = shared_instance(SelectorCache)
@@ -0,0 +1,131 @@
+import threading
+import time
+from config import PROGRESS_JOURNAL_PATH, SKIP_REGISTRY_TTL_HOURS
+from progress_db import ProgressDatabase, shared_instance
+
+
+# 登记范围：不属于某个账号的登记对所有账号生效
+SCOPE_ALL = ""
+
+
+class SkipRegistry(ProgressDatabase):
+    """无法完成作业登记表：账号发现作业详情页没有做作业按钮后登记作业ID和原因，
+    有效期内该账号（包括之后的运行）在读取作业列表时直接过滤，不再打开该作业等待超时。
+
+    没有做作业按钮通常只说明这个账号已经做过该作业，因此登记按 (账号, 作业ID) 区分；
+    只有与账号无关的原因（例如作业页面损坏）才不指定账号登记，对所有账号生效。
+
+    登记写入进度日志所在的SQLite文件，内存中保留一份副本供过滤时查询，
+    并定期从文件重新加载，以便看到其他进程登记的作业。
+    """
+
+    RELOAD_INTERVAL = 60  # 从文件重新加载的间隔（秒）
+
+    def __init__(self, db_path=PROGRESS_JOURNAL_PATH, ttl_hours=SKIP_REGISTRY_TTL_HOURS):
+        super().__init__(db_path)
+        self.ttl = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._entries = {}  # (登记范围, 作业ID) -> (原因, 过期时间)，登记范围为账号或SCOPE_ALL
+        self._loaded_at = 0
+        self._stats = {"filtered": 0, "registered": 0}
+        self.init_db()
+
+    def init_db(self):
+        with self.get_connection() as conn:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS skipped_homework (
+                homework_id TEXT NOT NULL,
+                username TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                title TEXT,
+                recorded_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (homework_id, username)
+            )
+            ''')
+            conn.commit()
+
+    def _reload_if_stale(self):
+        """距上次加载超过RELOAD_INTERVAL时清理过期登记并重新加载"""
+        now = time.time()
+        if now - self._loaded_at < self.RELOAD_INTERVAL:
+            return
+        with self.get_connection() as conn:
+            conn.execute('DELETE FROM skipped_homework WHERE expires_at <= ?', (now,))
+            conn.commit()
+            cursor = conn.cursor()
+            cursor.execute('SELECT username, homework_id, reason, expires_at FROM skipped_homework')
+            rows = cursor.fetchall()
+        with self._lock:
+            self._entries = {(row[0], row[1]): (row[2], row[3]) for row in rows}
+            self._loaded_at = now
+
+    def get_reason(self, homework_id, username=None):
+        """作业在有效期内对该账号（或对所有账号）登记为无法完成时返回原因，否则返回None"""
+        self._reload_if_stale()
+        now = time.time()
+        with self._lock:
+            for key in ((SCOPE_ALL, homework_id), (username or SCOPE_ALL, homework_id)):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                reason, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._stats["filtered"] += 1
+                return reason
+            return None
+
+    def register(self, homework_id, reason, title=None, username=None):
+        """登记无法完成的作业，已登记的作业重新计算有效期。
+        指定username时只对该账号生效，不指定时对所有账号生效"""
+        if not homework_id or homework_id == "unknown":
+            return
+        scope = username or SCOPE_ALL
+        now = time.time()
+        expires_at = now + self.ttl
+        with self.get_connection() as conn:
+            conn.execute('''
+            INSERT OR REPLACE INTO skipped_homework (homework_id, username, reason, title, recorded_at, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', (homework_id, scope, reason, title, now, expires_at))
+            conn.commit()
+        with self._lock:
+            self._entries[(scope, homework_id)] = (reason, expires_at)
+            self._stats["registered"] += 1
+
+    def remove(self, homework_id):
+        """取消该作业的全部登记，作业重新可以被处理"""
+        with self.get_connection() as conn:
+            conn.execute('DELETE FROM skipped_homework WHERE homework_id = ?', (homework_id,))
+            conn.commit()
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == homework_id]:
+                del self._entries[key]
+
+    def clear(self):
+        """清空全部登记"""
+        with self.get_connection() as conn:
+            conn.execute('DELETE FROM skipped_homework')
+            conn.commit()
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """返回过滤次数、本次登记次数和当前有效的登记数量"""
+        self._reload_if_stale()
+        now = time.time()
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = sum(1 for _, expires_at in self._entries.values() if expires_at > now)
+        return stats
+
+    def format_stats(self):
+        """把登记统计格式化为一行日志"""
+        stats = self.get_stats()
+        return f"过滤{stats['filtered']}次, 本次登记{stats['registered']}个, 有效登记{stats['size']}个"
+
+
+# 全局跳过登记表实例
+get_skip_registry = shared_instance(SkipRegistry)
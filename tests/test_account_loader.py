@@ -0,0 +1,58 @@
+from account_loader import (parse_accounts_text, load_accounts_file, describe_load_result,
+                            AccountLoadResult, STATUS_PENDING)
+from config import DEFAULT_PASSWORD
+
+
+def usernames(result):
+    return [account["username"] for account in result.accounts]
+
+
+def test_text_lines_with_and_without_password():
+    result = parse_accounts_text("10001\r\n10002: secret \r# 注释\n\n  10003  \n")
+    assert result.accounts == [
+        {"username": "10001", "password": DEFAULT_PASSWORD, "status": STATUS_PENDING},
+        {"username": "10002", "password": "secret", "status": STATUS_PENDING},
+        {"username": "10003", "password": DEFAULT_PASSWORD, "status": STATUS_PENDING},
+    ]
+    assert (result.duplicates, result.invalid, result.total) == (0, 0, 3)
+
+
+def test_duplicates_against_existing_and_within_batch():
+    result = parse_accounts_text("10001\n10002\n10002:other\n10003", existing=["10001"])
+    assert usernames(result) == ["10002", "10003"]
+    assert result.accounts[0]["password"] == DEFAULT_PASSWORD
+    assert result.duplicates == 2
+
+
+def test_non_numeric_usernames_are_invalid():
+    result = parse_accounts_text("abc\n10001\n12a:pw\n:pw")
+    assert usernames(result) == ["10001"]
+    assert (result.invalid, result.total) == (3, 4)
+
+
+def test_csv_file_with_header(tmp_path):
+    path = tmp_path / "accounts.csv"
+    # Excel保存的CSV带BOM
+    path.write_text("账号,密码\n10001,pw1\n10002\n#10003,pw\n10001,pw\n", encoding="utf-8-sig")
+    result = load_accounts_file(str(path), existing=["10009"])
+    assert [(a["username"], a["password"]) for a in result.accounts] == [("10001", "pw1"), ("10002", DEFAULT_PASSWORD)]
+    assert result.duplicates == 1
+
+
+def test_csv_file_without_header(tmp_path):
+    path = tmp_path / "accounts.csv"
+    path.write_text("10001,pw1\n10002,pw2\n", encoding="utf-8")
+    assert usernames(load_accounts_file(str(path))) == ["10001", "10002"]
+
+
+def test_text_file_uses_text_format(tmp_path):
+    path = tmp_path / "accounts.txt"
+    path.write_text("10001:a,b\n10002\n", encoding="utf-8")
+    result = load_accounts_file(str(path))
+    assert [(a["username"], a["password"]) for a in result.accounts] == [("10001", "a,b"), ("10002", DEFAULT_PASSWORD)]
+
+
+def test_describe_load_result():
+    assert describe_load_result(AccountLoadResult([{}] * 3, 0, 0, 3)) == "批量添加完成，共 3 行，成功添加 3 个账号"
+    assert describe_load_result(AccountLoadResult([{}], 2, 1, 4)) == \
+        "批量添加完成，共 4 行，成功添加 1 个账号，跳过重复 2 个、格式无效 1 个"
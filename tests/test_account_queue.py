@@ -0,0 +1,59 @@
+import threading
+
+from account_queue import AccountQueue
+
+
+def drain(queue):
+    indexes = []
+    while True:
+        index = queue.get()
+        if index is None:
+            return indexes
+        indexes.append(index)
+
+
+def test_accounts_are_handed_out_in_order():
+    queue = AccountQueue(3, max_retries=0)
+    assert drain(queue) == [0, 1, 2]
+    assert queue.get() is None
+
+
+def test_requeued_account_goes_to_the_back():
+    queue = AccountQueue(3, max_retries=1)
+    assert queue.get() == 0
+    assert queue.requeue(0)
+    assert drain(queue) == [1, 2, 0]
+
+
+def test_requeue_stops_after_max_retries():
+    queue = AccountQueue(2, max_retries=2)
+    assert queue.get() == 0
+    assert queue.requeue(0)
+    assert queue.requeue(0)
+    assert not queue.requeue(0)
+    # 其他账号的重试次数单独计算
+    assert queue.requeue(1)
+    assert drain(queue) == [1, 0, 0, 1]
+
+
+def test_every_account_is_taken_exactly_once_across_threads():
+    queue = AccountQueue(500, max_retries=0)
+    taken = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            index = queue.get()
+            if index is None:
+                return
+            with lock:
+                taken.append(index)
+            queue.task_done(index)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(taken) == list(range(500))
+    assert queue.completed == 500
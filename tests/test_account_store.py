@@ -0,0 +1,118 @@
+import sqlite3
+import time
+
+import pytest
+
+import account_store
+from account_store import (AccountStore, week_start, describe_last_run, classify_account_error, has_custom_password,
+                           KEYRING_SERVICE, RUN_COMPLETED, RUN_FAILED, ERROR_LOGIN, ERROR_BROWSER, ERROR_OTHER,
+                           FILTER_ALL, FILTER_FAILED, FILTER_NOT_DONE_THIS_WEEK, FILTER_NEVER_RUN)
+from config import DEFAULT_PASSWORD
+from progress_journal import HOMEWORK_COMPLETED, HOMEWORK_SKIPPED
+
+
+class FakeKeyring:
+    def __init__(self):
+        self.passwords = {}
+
+    def set_password(self, service, username, password):
+        self.passwords[(service, username)] = password
+
+    def get_password(self, service, username):
+        return self.passwords.get((service, username))
+
+    def delete_password(self, service, username):
+        del self.passwords[(service, username)]
+
+
+@pytest.fixture
+def fake_keyring(monkeypatch):
+    fake = FakeKeyring()
+    monkeypatch.setattr(account_store, "keyring", fake)
+    return fake
+
+
+def accounts(*pairs):
+    return [{"username": username, "password": password} for username, password in pairs]
+
+
+def database_text(path):
+    with sqlite3.connect(path) as conn:
+        return "\n".join(conn.iterdump())
+
+
+def test_passwords_go_to_the_keyring_not_the_database(tmp_path, fake_keyring):
+    path = str(tmp_path / "progress.db")
+    store = AccountStore(path)
+    store.save_accounts(accounts(("10001", "secret1"), ("10002", DEFAULT_PASSWORD)))
+    store.start_run("10003", "secret3")
+    assert "secret" not in database_text(path)
+    assert fake_keyring.passwords == {(KEYRING_SERVICE, "10001"): "secret1"}
+
+    loaded, missing = store.load_accounts()
+    assert [(a["username"], a["password"]) for a in loaded] == [("10001", "secret1"), ("10002", DEFAULT_PASSWORD)]
+    # 命令行写入的账号没有保存密码，需要重新添加
+    assert missing == ["10003"]
+
+    store.remove_accounts(["10001", "10002"])
+    assert fake_keyring.passwords == {}
+
+
+def test_custom_passwords_are_not_restored_without_keyring(tmp_path, monkeypatch):
+    monkeypatch.setattr(account_store, "keyring", None)
+    store = AccountStore(str(tmp_path / "progress.db"))
+    store.save_accounts(accounts(("10001", "secret1"), ("10002", "")))
+    loaded, missing = store.load_accounts()
+    assert [(a["username"], a["password"]) for a in loaded] == [("10002", DEFAULT_PASSWORD)]
+    assert missing == ["10001"]
+
+
+def test_start_run_does_not_touch_saved_passwords(tmp_path, fake_keyring):
+    store = AccountStore(str(tmp_path / "progress.db"))
+    store.save_accounts(accounts(("10001", "secret1")))
+    store.start_run("10001", DEFAULT_PASSWORD)
+    assert store.get_history("10001")["custom_password"] == 1
+    assert store.load_accounts()[0][0]["password"] == "secret1"
+
+
+def test_run_history_and_filters(tmp_path, fake_keyring):
+    store = AccountStore(str(tmp_path / "progress.db"))
+    store.save_accounts(accounts(("10001", ""), ("10002", ""), ("10003", "")))
+    store.start_run("10001", "")
+    store.finish_run("10001", RUN_COMPLETED, {HOMEWORK_COMPLETED: 5, HOMEWORK_SKIPPED: 1})
+    store.start_run("10002", "")
+    store.finish_run("10002", RUN_FAILED, {}, ERROR_LOGIN)
+
+    history = store.get_history("10001")
+    assert (history["homework_completed"], history["homework_skipped"]) == (5, 1)
+    assert history["last_completed_at"] >= week_start()
+    assert store.get_history("10009") is None
+
+    names = lambda account_filter: [a["username"] for a in store.load_accounts(account_filter)[0]]
+    assert names(FILTER_ALL) == ["10001", "10002", "10003"]
+    assert names(FILTER_FAILED) == ["10002"]
+    assert names(FILTER_NOT_DONE_THIS_WEEK) == ["10002", "10003"]
+    assert names(FILTER_NEVER_RUN) == ["10003"]
+    # 账号库中没有的账号视为从未运行，但不算上次出错
+    assert store.filter_usernames(["10009", "10002", "10001"], FILTER_NEVER_RUN) == ["10009"]
+    assert store.filter_usernames(["10009", "10002", "10001"], FILTER_FAILED) == ["10002"]
+
+    store.remove_accounts(["10002"])
+    assert names(FILTER_ALL) == ["10001", "10003"]
+
+
+def test_describe_and_classify():
+    row = {"last_status": RUN_FAILED, "error_category": ERROR_BROWSER, "homework_completed": 2, "last_duration": 200}
+    assert describe_last_run(row) == "上次出错(浏览器异常, 2个作业, 3分20秒)"
+    assert classify_account_error(Exception("登录失败: 密码错误")) == ERROR_LOGIN
+    assert classify_account_error(Exception("x"), session_error=True) == ERROR_BROWSER
+    assert classify_account_error(Exception("x")) == ERROR_OTHER
+    assert not has_custom_password(DEFAULT_PASSWORD)
+    assert not has_custom_password("")
+    assert has_custom_password("x")
+
+
+def test_week_start_is_monday_midnight():
+    start = time.localtime(week_start())
+    assert (start.tm_wday, start.tm_hour, start.tm_min) == (0, 0, 0)
+    assert week_start() <= time.time() < week_start() + 7 * 86400 + 3600
@@ -0,0 +1,127 @@
+import asyncio
+
+from answer_plan_cache import (AnswerPlanCache, fingerprint_questions, option_letter, option_index,
+                               STEP_CHOICE, STEP_SUBJECTIVE, STEP_RANDOM, STEP_SKIP)
+from async_engine import (AccountSession, QUESTION_DETAILS_SCRIPT, QUESTION_TEXTS_SCRIPT,
+                          SELECT_OPTION_SCRIPT, FILL_SUBJECTIVE_SCRIPT)
+from homework_flow import SUBMIT_SUCCESS, SUBMIT_FAILED, SUBMIT_UNKNOWN
+
+
+class FakeSignal:
+    def __init__(self):
+        self.messages = []
+
+    def emit(self, message):
+        self.messages.append(message)
+
+
+class FakeQuestionDB:
+    def __init__(self, answers):
+        self.answers = answers
+
+    def find_answer(self, text):
+        return self.answers.get(text)
+
+
+class FakeEngine:
+    def __init__(self, answers):
+        self.running = True
+        self.paused = False
+        self.operation_delay = 0
+        self.answer_plans = AnswerPlanCache()
+        self.question_db = FakeQuestionDB(answers)
+        self.log_signal = FakeSignal()
+        # 答题流程不读写进度日志和跳过登记表
+        self.journal = None
+        self.skip_registry = None
+
+
+class FakePage:
+    """按脚本返回题目信息，记录选中的选项"""
+
+    def __init__(self, details, fill_ok=True):
+        self.details = details
+        self.fill_ok = fill_ok
+        self.selected = {}
+
+    async def wait_for_page(self, page_type):
+        return True
+
+    async def call(self, script, *args):
+        if script == QUESTION_DETAILS_SCRIPT:
+            return self.details
+        if script == QUESTION_TEXTS_SCRIPT:
+            return [detail["text"] for detail in self.details]
+        if script == SELECT_OPTION_SCRIPT:
+            self.selected[args[1]] = args[2]
+            return True
+        if script == FILL_SUBJECTIVE_SCRIPT:
+            return self.fill_ok
+        raise AssertionError("unexpected script")
+
+
+DETAILS = [
+    {"text": "题目一", "options": 4},
+    {"text": "题目二", "options": 4},
+    {"text": "题目三", "options": 0},
+]
+
+
+def answer(answers, submit_status, fill_ok=True):
+    engine = FakeEngine(answers)
+    page = FakePage(DETAILS, fill_ok)
+    session = AccountSession(engine, 1, page, 0, {"username": "u1", "password": "p"})
+
+    async def submit_answers():
+        return submit_status
+
+    session.submit_answers = submit_answers
+    status = asyncio.run(session.answer_questions("hw1"))
+    fingerprint = fingerprint_questions([detail["text"] for detail in DETAILS])
+    return status, page, engine.answer_plans.get("hw1", fingerprint)
+
+
+def test_option_letter_round_trip():
+    assert option_letter(0) == "A"
+    assert option_index(" c ") == 2
+    assert option_index(option_letter(7)) == 7
+    assert option_index("AB") == -1
+    assert option_index("") == -1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = AnswerPlanCache(max_size=2)
+    cache.put("hw1", "f", [(STEP_SKIP, None)])
+    cache.put("hw2", "f", [(STEP_SKIP, None)])
+    assert cache.get("hw1", "f") is not None
+    cache.put("hw3", "f", [(STEP_SKIP, None)])
+    assert cache.get("hw2", "f") is None
+    assert cache.get("hw1", "f") is not None
+    assert cache.get_stats()["size"] == 2
+
+
+def test_random_step_is_recorded_as_chosen_option():
+    status, page, plan = answer({"题目一": "B"}, SUBMIT_SUCCESS)
+    assert status == SUBMIT_SUCCESS
+    assert plan[0] == (STEP_CHOICE, "B")
+    assert plan[1] == (STEP_CHOICE, option_letter(page.selected[1]))
+    assert plan[2] == (STEP_SKIP, None)
+    assert STEP_RANDOM not in [kind for kind, _ in plan]
+
+
+def test_plan_is_stored_only_after_successful_submit():
+    for submit_status in (SUBMIT_FAILED, SUBMIT_UNKNOWN):
+        status, _, plan = answer({"题目一": "B"}, submit_status)
+        assert status == submit_status
+        assert plan is None
+
+
+def test_plan_with_failed_step_is_not_stored():
+    status, _, plan = answer({"题目一": "B", "题目三": "答案"}, SUBMIT_SUCCESS, fill_ok=False)
+    assert status == SUBMIT_SUCCESS
+    assert plan is None
+
+
+def test_plan_with_subjective_answer_is_stored():
+    _, _, plan = answer({"题目一": "B", "题目二": "a", "题目三": "答案"}, SUBMIT_SUCCESS)
+    assert plan == [(STEP_CHOICE, "B"), (STEP_CHOICE, "a"), (STEP_SUBJECTIVE, "答案")]
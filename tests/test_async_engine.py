@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+import pytest
+
+import async_engine
+from async_engine import AccountSession, AsyncAutomationEngine, CDPConnection, CDPError
+
+
+class RecordingStore:
+    """记录每次调用所在的线程，代替进度日志、跳过登记表和账号库"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args):
+            self.calls.append((name, threading.get_ident()))
+            return None
+        return method
+
+
+class FakePage:
+    async def try_call(self, script, *args):
+        return "作业标题"
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    stores = {name: RecordingStore() for name in ("journal", "skip_registry", "account_store")}
+    monkeypatch.setattr(async_engine, "get_progress_journal", lambda: stores["journal"])
+    monkeypatch.setattr(async_engine, "get_skip_registry", lambda: stores["skip_registry"])
+    monkeypatch.setattr(async_engine, "get_account_store", lambda: stores["account_store"])
+    return AsyncAutomationEngine([{"username": "10001", "password": "p"}], question_db=None), stores
+
+
+def test_progress_writes_run_off_the_event_loop(engine):
+    engine, stores = engine
+    session = AccountSession(engine, 1, FakePage(), 0, {"username": "10001", "password": "p"})
+
+    async def skip():
+        await session.skip_homework({"id": "hw1"}, "没有做作业按钮")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(skip())
+    calls = stores["journal"].calls + stores["skip_registry"].calls
+    assert [name for name, _ in calls] == ["record_homework", "register"]
+    assert all(thread != loop_thread for _, thread in calls)
+    assert "hw1" in session.homeworks.skipped
+
+
+def test_run_blocking_returns_the_result(engine):
+    engine, _ = engine
+
+    async def call():
+        return await engine.run_blocking(lambda a, b: (a + b, threading.get_ident()), 1, 2)
+
+    result, thread = asyncio.run(call())
+    assert result == 3
+    assert thread != threading.get_ident()
+
+
+
+class FakeWebSocket:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def send(self, message):
+        if self.error:
+            raise self.error
+
+
+def connection_with(ws):
+    connection = CDPConnection("ws://test")
+    connection._ws = ws
+    # 读取协程一直运行，连接视为未关闭
+    connection._reader = asyncio.get_running_loop().create_future()
+    return connection
+
+
+@pytest.mark.parametrize("ws", [FakeWebSocket(ConnectionError("connection closed")), FakeWebSocket()])
+def test_send_failures_mark_the_session_lost(ws):
+    async def send():
+        connection = connection_with(ws)
+        with pytest.raises(CDPError) as error:
+            await connection.send("Runtime.evaluate", timeout=0.05)
+        assert not connection._pending
+        return error.value
+
+    assert asyncio.run(send()).session_lost
+
+
+class MissingLoginButtonPage(FakePage):
+    async def navigate(self, url):
+        pass
+
+    async def wait_for_page(self, page_type, timeout=None):
+        return False
+
+    async def click_xpath(self, xpath, timeout=None):
+        return False
+
+
+def test_missing_login_button_is_a_page_error(engine):
+    engine, _ = engine
+    session = AccountSession(engine, 1, MissingLoginButtonPage(), 0, {"username": "10001", "password": "p"})
+    with pytest.raises(CDPError) as error:
+        asyncio.run(session.process_account())
+    assert error.value.session_lost
+    assert "登录失败" not in str(error.value)
@@ -0,0 +1,125 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from browser_pool import BrowserPool, PooledBrowser, pids_alive, _pid_running
+
+psutil = pytest.importorskip("psutil")
+
+# 模拟chromedriver：启动一个子进程（模拟Chrome主进程）后不回收它
+PARENT_SCRIPT = (
+    "import subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+    "print(child.pid, flush=True)\n"
+    "time.sleep(60)\n"
+)
+
+
+@pytest.fixture
+def driver_and_browser():
+    parent = subprocess.Popen([sys.executable, "-c", PARENT_SCRIPT], stdout=subprocess.PIPE, text=True)
+    child_pid = int(parent.stdout.readline())
+    yield parent, child_pid
+    for pid in (child_pid, parent.pid):
+        try:
+            psutil.Process(pid).kill()
+        except psutil.NoSuchProcess:
+            pass
+    parent.wait()
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_alive_when_driver_and_browser_running(driver_and_browser):
+    parent, child_pid = driver_and_browser
+    assert pids_alive([parent.pid, child_pid])
+
+
+def test_browser_crash_detected_even_if_driver_alive(driver_and_browser):
+    parent, child_pid = driver_and_browser
+    psutil.Process(child_pid).kill()
+    # 父进程不回收子进程，Chrome主进程成为僵尸进程，pid仍然存在
+    assert wait_until(lambda: not pids_alive([parent.pid, child_pid]))
+    assert pids_alive([parent.pid])
+
+
+def test_renderer_processes_not_checked(driver_and_browser):
+    parent, child_pid = driver_and_browser
+    assert pids_alive([parent.pid, child_pid, 2 ** 22 + 12345])
+
+
+def test_unknown_pids_treated_as_alive():
+    assert pids_alive([])
+
+
+class SlowQuitDriver:
+    """driver.quit()较慢的模拟驱动，service.process指向模拟的chromedriver"""
+
+    def __init__(self, process):
+        self.service = type("Service", (), {"process": process})()
+        self.quit_called = False
+
+    def quit(self):
+        time.sleep(0.5)
+        self.quit_called = True
+
+
+def all_dead(pids):
+    return not any(_pid_running(pid) for pid in pids)
+
+
+def test_shutdown_wait_finishes_background_retirement(driver_and_browser):
+    parent, child_pid = driver_and_browser
+    pool = BrowserPool()
+    entry = PooledBrowser(SlowQuitDriver(parent), False)
+    assert entry.pids[:2] == [parent.pid, child_pid]
+
+    pool.discard_entry(entry, replace=False)
+    pool.shutdown(wait=True)
+    # quit()已经返回说明关闭过程已结束，kill信号送达需要极短的时间
+    assert entry.driver.quit_called
+    assert wait_until(lambda: all_dead(entry.pids), timeout=1)
+
+
+def test_shutdown_wait_retires_browsers_still_starting(driver_and_browser):
+    parent, child_pid = driver_and_browser
+    pool = BrowserPool()
+    started = []
+
+    def create_browser(show_browser):
+        time.sleep(0.3)
+        started.append(PooledBrowser(SlowQuitDriver(parent), show_browser))
+        return started[-1]
+
+    pool._create_browser = create_browser
+    pool._starting += 1
+    pool._start_in_background(False)
+    pool.shutdown(wait=True)
+    assert started and started[0].driver.quit_called
+    assert wait_until(lambda: all_dead([parent.pid, child_pid]), timeout=1)
+    assert pool.get_stats()["idle"] == 0
+
+
+def test_closed_pool_stays_closed_until_reopened():
+    pool = BrowserPool()
+    started = []
+    pool._create_browser = lambda show_browser: started.append(show_browser)
+    pool.shutdown(wait=True)
+
+    # 停止后仍在运行的工作线程不能让池重新启动Chrome
+    pool.prewarm(2, show_browser=False)
+    with pytest.raises(RuntimeError):
+        pool.acquire(timeout=1, show_browser=False)
+    assert started == [] and pool.get_stats()["closed"]
+
+    pool.reopen()
+    assert not pool.get_stats()["closed"]
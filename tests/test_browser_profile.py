@@ -0,0 +1,98 @@
+import re
+import shutil
+import urllib.request
+from fnmatch import fnmatchcase
+
+import pytest
+
+import config
+import profile_benchmark
+from browser_pool import build_chrome_options, apply_browser_profile, get_browser_profile
+
+PRODUCTION = get_browser_profile("production")
+DEBUG = get_browser_profile("debug")
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+class RecordingDriver:
+    """只记录CDP命令的假WebDriver"""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+        return {}
+
+
+def is_blocked(url, patterns):
+    """按CDP Network.setBlockedURLs的规则（*通配，整个URL匹配）判断请求是否被屏蔽"""
+    return any(fnmatchcase(url, pattern) for pattern in patterns)
+
+
+def test_production_options_headless_eager_without_images():
+    options = build_chrome_options(show_browser=False, profile=PRODUCTION)
+    assert "--headless" in options.arguments
+    assert options.page_load_strategy == config.PAGE_LOAD_STRATEGY == "eager"
+    assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+
+
+def test_debug_options_load_everything():
+    options = build_chrome_options(show_browser=True, profile=DEBUG)
+    assert "--headless" not in options.arguments
+    assert "prefs" not in options.experimental_options
+
+
+def test_production_profile_blocks_resources_and_animations():
+    driver = RecordingDriver()
+    apply_browser_profile(driver, PRODUCTION)
+    commands = dict(driver.commands)
+    assert commands["Network.setBlockedURLs"]["urls"] == config.RESOURCE_BLOCKING["blocked_url_patterns"]
+    assert "Network.enable" in commands
+    assert "animation: none" in commands["Page.addScriptToEvaluateOnNewDocument"]["source"]
+    assert commands["Emulation.setEmulatedMedia"]["features"][0]["value"] == "reduce"
+
+
+def test_debug_profile_sends_no_cdp_commands():
+    driver = RecordingDriver()
+    apply_browser_profile(driver, DEBUG)
+    assert driver.commands == []
+
+
+@pytest.fixture
+def stand_in_site(tmp_path):
+    server = profile_benchmark.start_server(str(tmp_path))
+    port = server.server_address[1]
+    profile_benchmark.build_site(str(tmp_path), port)
+    yield f"http://localhost:{port}/", tmp_path
+    server.shutdown()
+
+
+def test_stand_in_site_heavy_resources_are_blocked(stand_in_site):
+    base_url, root = stand_in_site
+    html = (root / "index.html").read_text(encoding="utf-8")
+    resources = re.findall(r'src="([^"]+)"', html) + re.findall(r"url\('([^']+)'\)", html)
+    heavy = [base_url + name for name in resources if not name.startswith("http")]
+    assert len(heavy) == profile_benchmark.IMAGE_COUNT + 3  # 图片、视频和两个字体
+
+    patterns = config.RESOURCE_BLOCKING["blocked_url_patterns"]
+    assert all(is_blocked(url, patterns) for url in heavy)
+    assert not is_blocked(base_url + "index.html", patterns)
+
+
+def test_stand_in_site_is_served(stand_in_site):
+    base_url, _ = stand_in_site
+    with urllib.request.urlopen(base_url + "index.html") as response:
+        page = response.read().decode("utf-8")
+    assert page.count("补作业") == 20
+    with urllib.request.urlopen(base_url + "img0.png") as response:
+        assert len(response.read()) == profile_benchmark.IMAGE_SIZE
+
+
+@pytest.mark.skipif(not any(shutil.which(name) for name in CHROME_BINARIES), reason="需要本机安装Chrome")
+def test_production_profile_loads_faster_with_less_memory():
+    results = profile_benchmark.run_benchmark(force_headless=True)
+    debug_ms, debug_rss = results["debug"]
+    production_ms, production_rss = results["production"]
+    assert production_ms < debug_ms
+    assert production_rss < debug_rss
@@ -0,0 +1,75 @@
+import pytest
+
+import browser_pool
+import cli
+import progress_journal
+
+
+class FakeJournal:
+    def __init__(self):
+        self.finished = False
+
+    def begin_run(self, resume=True):
+        return False, 0
+
+    def finish_run(self):
+        self.finished = True
+
+
+class FakePool:
+    def __init__(self):
+        self.shutdown_calls = []
+
+    def shutdown(self, wait=False):
+        self.shutdown_calls.append(wait)
+
+
+@pytest.fixture
+def environment(tmp_path, monkeypatch):
+    accounts = tmp_path / "accounts.txt"
+    accounts.write_text("10001\n10002:secret\n", encoding="utf-8")
+    journal = FakeJournal()
+    pool = FakePool()
+    monkeypatch.setattr(progress_journal, "get_progress_journal", lambda: journal)
+    monkeypatch.setattr(browser_pool, "get_browser_pool", lambda: pool)
+    return str(accounts), journal, pool
+
+
+def fake_runner(result):
+    class FakeRunner:
+        def __init__(self, accounts, *args, **kwargs):
+            self.accounts = accounts
+
+        def emit(self, event, **fields):
+            pass
+
+        def run(self):
+            if isinstance(result, BaseException):
+                raise result
+            return result
+
+    return FakeRunner
+
+
+def test_pool_is_shut_down_and_waited_for_after_a_run(environment, monkeypatch):
+    accounts, journal, pool = environment
+    monkeypatch.setattr(cli, "HeadlessRunner", fake_runner(False))
+    assert cli.main(["--accounts", accounts]) == 0
+    assert journal.finished
+    assert pool.shutdown_calls == [True]
+
+
+def test_pool_is_shut_down_when_stopped(environment, monkeypatch):
+    accounts, journal, pool = environment
+    monkeypatch.setattr(cli, "HeadlessRunner", fake_runner(True))
+    assert cli.main(["--accounts", accounts]) == 130
+    assert not journal.finished
+    assert pool.shutdown_calls == [True]
+
+
+def test_pool_is_shut_down_when_run_raises(environment, monkeypatch):
+    accounts, _, pool = environment
+    monkeypatch.setattr(cli, "HeadlessRunner", fake_runner(KeyboardInterrupt()))
+    with pytest.raises(KeyboardInterrupt):
+        cli.main(["--accounts", accounts])
+    assert pool.shutdown_calls == [True]
@@ -0,0 +1,83 @@
+import pytest
+
+import database
+from database import QuestionDatabase
+
+QUESTIONS = [
+    ("下列关于光合作用的说法，正确的是，植物在白天进行", "A", "choice"),
+    ("水的沸点在标准大气压下是，多少摄氏度", "100摄氏度", "subjective"),
+    ("中国的首都是哪座城市，请写出名称", "北京", "subjective"),
+    ("下列属于哺乳动物的是，鲸鱼还是鲨鱼", "B", "choice"),
+]
+
+
+def open_db(path, fts=True, monkeypatch=None):
+    if monkeypatch is not None:
+        monkeypatch.setitem(database.QUESTION_SEARCH_CONFIG, "fts_enabled", fts)
+    return QuestionDatabase(str(path))
+
+
+@pytest.fixture(params=[True, False], ids=["fts", "scan"])
+def db(request, tmp_path, monkeypatch):
+    db = open_db(tmp_path / "questions.db", request.param, monkeypatch)
+    if request.param and not db.fts_enabled:
+        pytest.skip("当前SQLite不支持FTS5 trigram")
+    for content, answer, kind in QUESTIONS:
+        db.add_question(content, answer, kind)
+    yield db
+    db.close()
+
+
+def test_find_answer_exact_and_fuzzy(db):
+    assert db.find_answer(QUESTIONS[1][0]) == "100摄氏度"
+    # 题号、分数和标点不同的同一道题
+    assert db.find_answer("3.(25分)中国的首都是哪座城市？请写出名称") == "北京"
+    assert db.find_answer("完全无关的内容，没有任何相同片段") is None
+
+
+def test_count_and_keyset_paging(db):
+    assert db.count_questions() == len(QUESTIONS)
+    first = db.get_questions_page(limit=3)
+    second = db.get_questions_page(after_id=first[-1][0], limit=3)
+    assert [row[1] for row in first + second] == [content for content, _, _ in QUESTIONS]
+    assert db.get_questions_page(after_id=second[-1][0]) == []
+
+
+def test_search_filters_content_and_answer(db):
+    assert db.count_questions("摄氏度") == 1
+    assert [row[2] for row in db.get_questions_page(search="下列")] == ["A", "B"]
+    assert [row[1] for row in db.search_questions("首都是")] == [QUESTIONS[2][0]]
+    assert [row[2] for row in db.search_questions("北京")] == ["北京"]
+    assert db.search_questions("   ") == []
+
+
+def test_index_follows_update_and_delete(db):
+    rows = db.get_questions_page()
+    db.update_question(rows[2][0], "上海", "subjective")
+    assert db.count_questions("北京") == 0
+    assert db.count_questions("上海") == 1
+    assert db.delete_questions([rows[0][0], rows[1][0]]) == 2
+    assert db.count_questions() == 2
+    assert db.count_questions("光合作用") == 0
+    assert db.find_answer(QUESTIONS[0][0]) is None
+
+
+def test_existing_database_is_indexed_on_first_open(tmp_path, monkeypatch):
+    path = tmp_path / "questions.db"
+    plain = open_db(path, False, monkeypatch)
+    for content, answer, kind in QUESTIONS:
+        plain.add_question(content, answer, kind)
+    plain.close()
+
+    indexed = open_db(path, True, monkeypatch)
+    if not indexed.fts_enabled:
+        pytest.skip("当前SQLite不支持FTS5 trigram")
+    assert [row[2] for row in indexed.search_questions("哺乳动物")] == ["B"]
+
+
+def test_match_query_is_capped_and_quoted(tmp_path, monkeypatch):
+    db = open_db(tmp_path / "questions.db", True, monkeypatch)
+    monkeypatch.setitem(database.QUESTION_SEARCH_CONFIG, "max_query_terms", 4)
+    query = db._fts_match_query('abcdefghij k"lm')
+    assert query.count(" OR ") == 3
+    assert db._fts_phrase('k"lm') == '"k""lm"'
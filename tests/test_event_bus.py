@@ -0,0 +1,45 @@
+from event_bus import EventBus, WorkerEventBuffer, EVENT_LOG, EVENT_STATUS, EVENT_FINISHED
+
+
+def kinds(events):
+    return [event[0] for event in events]
+
+
+def test_finished_waits_for_logs_beyond_the_drain_limit():
+    buffer = WorkerEventBuffer(1, capacity=100)
+    for i in range(5):
+        buffer.push(EVENT_LOG, f"日志{i}", 0, "worker")
+    buffer.push(EVENT_STATUS, 0, "已完成")
+    buffer.push(EVENT_LOG, "日志5", 0, "worker")
+    buffer.push(EVENT_FINISHED)
+
+    first = buffer.drain(max_logs=3)
+    assert [event[2] for event in first] == ["日志0", "日志1", "日志2"]
+    second = buffer.drain(max_logs=3)
+    assert kinds(second) == [EVENT_LOG, EVENT_LOG, EVENT_STATUS, EVENT_LOG, EVENT_FINISHED]
+    assert buffer.drain(max_logs=3) == []
+
+
+def test_dropped_logs_are_reported_once():
+    buffer = WorkerEventBuffer(1, capacity=2)
+    for i in range(4):
+        buffer.push(EVENT_LOG, f"日志{i}", 0, "worker")
+    buffer.push(EVENT_FINISHED)
+    events = buffer.drain(max_logs=10)
+    assert "已丢弃 2 条" in events[0][2]
+    assert [event[2] for event in events[1:3]] == ["日志2", "日志3"]
+    assert kinds(events)[-1] == EVENT_FINISHED
+    assert buffer.drain(max_logs=10) == []
+
+
+def test_bus_drains_everything_without_limit():
+    bus = EventBus(capacity=100)
+    buffers = [bus.register(1), bus.register(2)]
+    for buffer in buffers:
+        for i in range(10):
+            buffer.push(EVENT_LOG, f"日志{i}", 0, "worker")
+        buffer.push(EVENT_FINISHED)
+    assert kinds(bus.drain(max_events=4)) == [EVENT_LOG] * 4
+    remaining = bus.drain(max_events=None)
+    assert len(remaining) == 18
+    assert kinds(remaining).count(EVENT_FINISHED) == 2
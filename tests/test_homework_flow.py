@@ -0,0 +1,93 @@
+import pytest
+
+from account_store import AccountStore, RUN_COMPLETED, RUN_FAILED, RUN_INTERRUPTED, ERROR_LOGIN
+from homework_flow import HomeworkTracker, begin_account, finish_account, fail_account, clean_question_text
+from progress_journal import ProgressJournal, HOMEWORK_COMPLETED, HOMEWORK_SKIPPED
+from progress_model import STATUS_COMPLETED, STATUS_INTERRUPTED
+from skip_registry import SkipRegistry
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    # 登录失败写入的app_error.log放在临时目录
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "progress.db")
+    journal = ProgressJournal(path)
+    journal.begin_run()
+    return journal, SkipRegistry(path), AccountStore(path)
+
+
+def entries(*ids):
+    return [{"id": homework_id, "index": i} for i, homework_id in enumerate(ids)]
+
+
+def tracker_for(stores, username="10001"):
+    journal, registry, _ = stores
+    logs = []
+    return HomeworkTracker(username, journal, registry, logs.append), logs
+
+
+def test_queue_skips_registered_and_attempted_homeworks(stores):
+    tracker, logs = tracker_for(stores)
+    tracker.skip("hw1", "没有做作业按钮")
+    queue = tracker.next_queue(entries("hw1", "hw2", "hw3"))
+    assert [entry["id"] for entry in queue] == ["hw2", "hw3"]
+
+    for position, entry in enumerate(queue, 1):
+        tracker.start(entry, position, len(queue))
+    assert tracker.next_queue(entries("hw1", "hw2", "hw3")) == []
+    assert logs[-1] == "当前还有 3 个待完成的作业，均已尝试过，处理完成"
+
+    # 之后的运行中该账号直接过滤已登记的作业，其他账号不受影响
+    resumed, _ = tracker_for(stores)
+    resumed.restore_skips()
+    assert [entry["id"] for entry in resumed.next_queue(entries("hw1", "hw2"))] == ["hw2"]
+    other, _ = tracker_for(stores, "10002")
+    assert [entry["id"] for entry in other.next_queue(entries("hw1", "hw2"))] == ["hw1", "hw2"]
+
+
+def test_only_submissions_gone_from_the_list_are_recorded(stores):
+    journal = stores[0]
+    tracker, logs = tracker_for(stores)
+    queue = tracker.next_queue(entries("hw1", "hw2", "hw3"))
+    for position, entry in enumerate(queue, 1):
+        tracker.start(entry, position, len(queue))
+    tracker.record_submission("hw1", "success")
+    tracker.record_submission("hw2", "unknown")
+    tracker.record_submission("hw3", None)
+
+    # hw1已从列表消失记为完成；hw2仍在列表中，放回队列重新尝试一次；hw3未提交，不再处理
+    queue = tracker.next_queue(entries("hw2", "hw3"))
+    assert [entry["id"] for entry in queue] == ["hw2"]
+    assert journal.get_homeworks("10001", HOMEWORK_COMPLETED) == {"hw1"}
+
+    tracker.start(queue[0], 1, 1)
+    tracker.record_submission("hw2", "failed")
+    assert tracker.next_queue(entries("hw2", "hw3")) == []
+    assert "不再重试" in logs[-2]
+    assert journal.get_homeworks("10001", HOMEWORK_COMPLETED) == {"hw1"}
+
+
+def test_account_results(stores):
+    journal, _, account_store = stores
+    account = {"username": "10001", "password": ""}
+    begin_account(journal, account_store, account)
+    journal.record_homework("10001", "hw1", HOMEWORK_SKIPPED)
+    assert finish_account(journal, account_store, "10001", completed=False) == STATUS_INTERRUPTED
+    assert account_store.get_history("10001")["last_status"] == RUN_INTERRUPTED
+    assert not journal.is_account_completed("10001")
+
+    begin_account(journal, account_store, account)
+    assert finish_account(journal, account_store, "10001", completed=True) == STATUS_COMPLETED
+    assert account_store.get_history("10001")["last_status"] == RUN_COMPLETED
+    assert journal.is_account_completed("10001")
+
+    begin_account(journal, account_store, {"username": "10002", "password": ""})
+    assert not fail_account(journal, account_store, "10002", Exception("首页加载异常"), session_error=True)
+    assert fail_account(journal, account_store, "10002", Exception("登录失败: 密码错误"))
+    history = account_store.get_history("10002")
+    assert (history["last_status"], history["error_category"]) == (RUN_FAILED, ERROR_LOGIN)
+
+
+def test_clean_question_text():
+    assert clean_question_text("1.(25分)一个好的  多媒体作品 ") == "一个好的 多媒体作品"
@@ -0,0 +1,58 @@
+from homework_navigator import HomeworkNavigator, ROUTE_DIRECT, ROUTE_VIEW, ROUTE_CLICK, VIEW_HOMEWORK_URL
+
+DO_URL = "https://example.com/hw/stu/doHomework.do?kcid=1001&token=abc"
+
+
+def test_resolve_by_id_goes_through_view_page():
+    navigator = HomeworkNavigator()
+    assert navigator.resolve({"id": "1001"}) == (f"{VIEW_HOMEWORK_URL}?kcid=1001", ROUTE_VIEW)
+
+
+def test_resolve_uses_entry_url():
+    navigator = HomeworkNavigator()
+    assert navigator.resolve({"id": "1001", "url": DO_URL}) == (DO_URL, ROUTE_DIRECT)
+    view = "https://example.com/hw/stu/viewHomework.do?kcid=1001"
+    assert navigator.resolve({"id": "1001", "url": view}) == (view, ROUTE_VIEW)
+
+
+def test_resolve_without_usable_id_falls_back_to_click():
+    navigator = HomeworkNavigator()
+    for homework_id in ("unknown", "", "12'3", "a b"):
+        assert navigator.resolve({"id": homework_id}) == (None, ROUTE_CLICK)
+
+
+def test_learned_direct_route_is_reused():
+    navigator = HomeworkNavigator()
+    navigator.learn("1001", DO_URL)
+    assert navigator.get_route("1001") == ROUTE_DIRECT
+    assert navigator.resolve({"id": "1001"}) == (DO_URL, ROUTE_DIRECT)
+    assert navigator.get_stats()["learned"] == 1
+
+
+def test_learn_ignores_invalid_ids():
+    navigator = HomeworkNavigator()
+    navigator.learn("unknown", DO_URL)
+    assert navigator.get_route("unknown") is None
+
+
+def test_demote_pins_view_route_and_blocks_relearning():
+    navigator = HomeworkNavigator()
+    navigator.learn("1001", DO_URL)
+    navigator.demote("1001")
+    navigator.learn("1001", DO_URL)
+    assert navigator.get_route("1001") == ROUTE_VIEW
+    # 降级后列表页按钮指向答题页的地址也不再使用
+    assert navigator.resolve({"id": "1001", "url": DO_URL}) == (f"{VIEW_HOMEWORK_URL}?kcid=1001", ROUTE_VIEW)
+    assert navigator.get_stats()["demoted"] == 1
+
+
+def test_stats_count_routes_and_reset():
+    navigator = HomeworkNavigator()
+    navigator.resolve({"id": "1001"})
+    navigator.resolve({"id": "unknown"})
+    navigator.learn("1002", DO_URL)
+    navigator.resolve({"id": "1002"})
+    stats = navigator.get_stats()
+    assert (stats[ROUTE_DIRECT], stats[ROUTE_VIEW], stats[ROUTE_CLICK]) == (1, 1, 1)
+    navigator.reset()
+    assert navigator.get_stats() == {ROUTE_DIRECT: 0, ROUTE_VIEW: 0, ROUTE_CLICK: 0, "demoted": 0, "learned": 0}
@@ -0,0 +1,64 @@
+import threading
+
+from progress_db import shared_instance
+from progress_journal import (ProgressJournal, ACCOUNT_COMPLETED, ACCOUNT_FAILED,
+                              HOMEWORK_COMPLETED, HOMEWORK_SKIPPED)
+
+
+def test_unfinished_run_is_resumed(tmp_path):
+    path = str(tmp_path / "progress.db")
+    journal = ProgressJournal(path)
+    assert journal.begin_run() == (False, 0)
+    journal.mark_account("u1", ACCOUNT_COMPLETED)
+    journal.mark_account("u2", ACCOUNT_FAILED)
+    journal.record_homework("u2", "hw1", HOMEWORK_COMPLETED)
+    journal.record_homework("u2", "hw2", HOMEWORK_SKIPPED)
+
+    # 程序中断后重新打开
+    resumed = ProgressJournal(path)
+    assert resumed.begin_run() == (True, 1)
+    assert resumed.is_account_completed("u1")
+    assert not resumed.is_account_completed("u2")
+    assert resumed.get_homeworks("u2", HOMEWORK_SKIPPED) == {"hw2"}
+    assert resumed.count_homeworks("u2") == {HOMEWORK_COMPLETED: 1, HOMEWORK_SKIPPED: 1}
+
+
+def test_finished_or_declined_run_starts_fresh(tmp_path):
+    path = str(tmp_path / "progress.db")
+    journal = ProgressJournal(path)
+    journal.begin_run()
+    journal.mark_account("u1", ACCOUNT_COMPLETED)
+    journal.finish_run()
+    assert ProgressJournal(path).begin_run() == (False, 0)
+
+    journal = ProgressJournal(path)
+    journal.mark_account("u1", ACCOUNT_COMPLETED)
+    assert journal.begin_run(resume=False) == (False, 0)
+    assert not journal.is_account_completed("u1")
+
+
+def test_each_thread_uses_its_own_connection(tmp_path):
+    journal = ProgressJournal(str(tmp_path / "progress.db"))
+    journal.begin_run()
+    connections = []
+
+    def worker(username):
+        with journal.get_connection() as conn:
+            connections.append(conn)
+        journal.mark_account(username, ACCOUNT_COMPLETED)
+        journal.close_connection()
+
+    threads = [threading.Thread(target=worker, args=(f"u{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(conn) for conn in connections}) == 4
+    assert all(journal.is_account_completed(f"u{i}") for i in range(4))
+
+
+def test_shared_instance_creates_once():
+    created = []
+    get_instance = shared_instance(lambda: created.append(object()) or created[-1])
+    assert get_instance() is get_instance()
+    assert len(created) == 1
@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+from progress_model import (ProgressModel, format_duration,
+                            STATUS_RUNNING, STATUS_COMPLETED, STATUS_FAILED, STATUS_INTERRUPTED)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def test_counts_follow_status_changes(clock):
+    model = ProgressModel(4)
+    model.update(0, STATUS_RUNNING)
+    model.update(1, STATUS_RUNNING)
+    model.update(0, STATUS_COMPLETED)
+    snapshot = model.snapshot()
+    assert (snapshot.completed, snapshot.failed, snapshot.active, snapshot.done) == (1, 0, 1, 1)
+    assert snapshot.percent == 25
+
+
+def test_retried_account_leaves_the_failed_count(clock):
+    model = ProgressModel(2)
+    model.update(0, STATUS_FAILED)
+    assert model.snapshot().failed == 1
+    model.update(0, STATUS_RUNNING)
+    model.update(0, STATUS_COMPLETED)
+    snapshot = model.snapshot()
+    assert (snapshot.completed, snapshot.failed, snapshot.active) == (1, 0, 0)
+
+
+def test_interrupted_account_is_not_counted_as_done(clock):
+    model = ProgressModel(2)
+    model.update(0, STATUS_RUNNING)
+    model.update(0, STATUS_INTERRUPTED)
+    snapshot = model.snapshot()
+    assert (snapshot.completed, snapshot.active, snapshot.done) == (0, 0, 0)
+    # 续跑时重新处理
+    model.update(0, STATUS_RUNNING)
+    model.update(0, STATUS_COMPLETED)
+    assert model.snapshot().done == 1
+
+
+def test_version_changes_only_on_real_updates(clock):
+    model = ProgressModel(1)
+    model.update(0, STATUS_RUNNING)
+    version = model.version
+    model.update(0, STATUS_RUNNING)
+    assert model.version == version
+    model.update(0, "待处理")
+    assert model.version == version + 1
+
+
+def test_throughput_and_eta(clock):
+    model = ProgressModel(10)
+    assert model.snapshot().eta is None
+    clock.now += 120
+    model.update(0, STATUS_COMPLETED)
+    model.update(1, STATUS_FAILED)
+    snapshot = model.snapshot()
+    assert snapshot.throughput == pytest.approx(1.0)
+    assert snapshot.eta == pytest.approx(480)
+    assert model.describe(snapshot) == "总进度: 2/10（出错 1） | 1.0 个/分钟 | 剩余约 8分0秒"
+
+
+def test_reset_and_empty_run(clock):
+    model = ProgressModel(3)
+    model.update(0, STATUS_COMPLETED)
+    model.reset(0)
+    snapshot = model.snapshot()
+    assert (snapshot.done, snapshot.percent) == (0, 100)
+    assert model.describe(snapshot) == "总进度: 0/0"
+
+
+def test_format_duration():
+    assert format_duration(45.9) == "45秒"
+    assert format_duration(200) == "3分20秒"
+    assert format_duration(3900) == "1小时5分"
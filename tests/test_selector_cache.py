@@ -0,0 +1,114 @@
+from selenium.webdriver.common.by import By
+
+from selector_cache import SelectorCache, split_xpath_union, xpath_to_css, compile_selector
+
+DO_HOMEWORK = ("//button[contains(@onclick, 'gotoHomeWorkPage')]|//a[contains(text(), '做作业')]"
+               "|//a[contains(@onclick, 'doHomework')]")
+
+
+class FakeElement:
+    def __init__(self, name, displayed=True, enabled=True):
+        self.name = name
+        self.displayed = displayed
+        self.enabled = enabled
+
+    def is_displayed(self):
+        return self.displayed
+
+    def is_enabled(self):
+        return self.enabled
+
+
+class FakePage:
+    """按定位器返回预设元素的假driver，完整XPath并集返回各分支结果的合并（文档顺序）"""
+
+    def __init__(self, cache, key, branches):
+        self.branches = branches  # 分支定位器 -> 元素列表
+        self.union = cache.xpaths[key]
+        self.queries = []
+
+    def find_elements(self, by, value):
+        self.queries.append((by, value))
+        if value == self.union:
+            return [element for elements in self.branches.values() for element in elements]
+        return list(self.branches.get((by, value), []))
+
+
+def test_split_xpath_union_ignores_pipes_in_predicates_and_quotes():
+    xpath = "//a[contains(text(), 'a|b')]|//div[@x='1' or @y='2']| //span"
+    assert split_xpath_union(xpath) == ["//a[contains(text(), 'a|b')]", "//div[@x='1' or @y='2']", "//span"]
+
+
+def test_xpath_to_css_conversions():
+    assert xpath_to_css("//input[@id='loginName']") == "input#loginName"
+    assert xpath_to_css("//button[contains(@onclick, 'go')]") == "button[onclick*='go']"
+    assert xpath_to_css("//a[starts-with(@href, '/hw')]") == "a[href^='/hw']"
+    assert xpath_to_css("//*[@class='table' and @id='x']") == "[class='table']#x"
+    assert xpath_to_css("//div") == "div"
+    assert xpath_to_css(".//textarea") == "textarea"
+
+
+def test_xpath_to_css_rejects_text_and_nested_paths():
+    assert xpath_to_css("//a[contains(text(), '做作业')]") is None
+    assert xpath_to_css("//div[@x='1' or @y='2']") is None
+    assert xpath_to_css("//table//tr") is None
+    assert xpath_to_css("//div[span[@id='a']]") is None
+
+
+def test_compile_selector_prefers_id_and_css():
+    assert compile_selector("loginBtn") == [(By.ID, "loginBtn")]
+    assert compile_selector("//input[@id='pwd']|//a[contains(text(), '登录')]") == [
+        (By.CSS_SELECTOR, "input#pwd"), (By.XPATH, "//a[contains(text(), '登录')]")]
+    assert compile_selector("//*[@id='pwd']") == [(By.ID, "pwd")]
+
+
+def test_learns_matching_branch_and_uses_fast_path():
+    cache = SelectorCache({"do_homework_button": DO_HOMEWORK})
+    button = FakeElement("button")
+    page = FakePage(cache, "do_homework_button", {
+        (By.CSS_SELECTOR, "button[onclick*='gotoHomeWorkPage']"): [button]})
+
+    assert cache.find_elements(page, "do_homework_button", "viewHomework") == [button]
+    page.queries.clear()
+    assert cache.find_elements(page, "do_homework_button", "viewHomework") == [button]
+    assert page.queries == [(By.CSS_SELECTOR, "button[onclick*='gotoHomeWorkPage']")]
+    stats = cache.get_stats()["do_homework_button"]
+    assert stats["fast_hits"] == 1 and stats["fallback_hits"] == 1
+
+
+def test_clickable_falls_back_to_union_when_learned_branch_is_hidden():
+    cache = SelectorCache({"do_homework_button": DO_HOMEWORK})
+    button = FakeElement("button")
+    branches = {(By.CSS_SELECTOR, "button[onclick*='gotoHomeWorkPage']"): [button]}
+    page = FakePage(cache, "do_homework_button", branches)
+    cache.find_elements(page, "do_homework_button", "viewHomework")  # 学习到按钮分支
+
+    # 另一个作业：按钮隐藏，"做作业"链接可见
+    button.displayed = False
+    link = FakeElement("link")
+    branches[(By.XPATH, "//a[contains(text(), '做作业')]")] = [link]
+    assert cache.clickable("do_homework_button", "viewHomework")(page) is link
+
+    # 学习结果保留，按钮可见时仍走快速写法
+    button.displayed = True
+    page.queries.clear()
+    assert cache.clickable("do_homework_button", "viewHomework")(page) is button
+    assert page.queries == [(By.CSS_SELECTOR, "button[onclick*='gotoHomeWorkPage']")]
+
+
+def test_clickable_returns_false_when_nothing_usable():
+    cache = SelectorCache({"do_homework_button": DO_HOMEWORK})
+    page = FakePage(cache, "do_homework_button", {
+        (By.CSS_SELECTOR, "button[onclick*='gotoHomeWorkPage']"): [FakeElement("button", enabled=False)]})
+    assert cache.clickable("do_homework_button", "viewHomework")(page) is False
+
+
+def test_union_marker_when_no_single_branch_matches():
+    cache = SelectorCache({"do_homework_button": DO_HOMEWORK})
+    page = FakePage(cache, "do_homework_button", {
+        (By.CSS_SELECTOR, "button[onclick*='gotoHomeWorkPage']"): [FakeElement("a")],
+        (By.XPATH, "//a[contains(text(), '做作业')]"): [FakeElement("b")]})
+    cache.find_elements(page, "do_homework_button")
+    page.queries.clear()
+    cache.find_elements(page, "do_homework_button")
+    assert page.queries == [(By.XPATH, DO_HOMEWORK)]
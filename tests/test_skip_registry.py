@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from skip_registry import SkipRegistry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+def test_registered_homework_is_filtered_until_expiry(tmp_path, clock):
+    registry = SkipRegistry(str(tmp_path / "progress.db"), ttl_hours=24)
+    registry.register("hw1", "没有做作业按钮", title="作业一", username="u1")
+    assert registry.get_reason("hw1", "u1") == "没有做作业按钮"
+    assert registry.get_reason("hw2", "u1") is None
+
+    clock.now += 24 * 3600 - 1
+    assert registry.get_reason("hw1", "u1") == "没有做作业按钮"
+    clock.now += 1
+    assert registry.get_reason("hw1", "u1") is None
+    assert registry.get_stats()["size"] == 0
+
+
+def test_registration_is_shared_through_the_file(tmp_path, clock):
+    path = str(tmp_path / "progress.db")
+    SkipRegistry(path).register("hw1", "原因")
+    other = SkipRegistry(path)
+    assert other.get_reason("hw1") == "原因"
+
+    # 过期的登记在重新加载时从文件中删除
+    clock.now += other.ttl + SkipRegistry.RELOAD_INTERVAL
+    assert other.get_reason("hw1") is None
+    with other.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM skipped_homework").fetchone()[0] == 0
+
+
+def test_register_again_extends_expiry(tmp_path, clock):
+    registry = SkipRegistry(str(tmp_path / "progress.db"), ttl_hours=1)
+    registry.register("hw1", "原因")
+    clock.now += 1800
+    registry.register("hw1", "原因")
+    clock.now += 1800
+    assert registry.get_reason("hw1") == "原因"
+
+
+def test_unknown_ids_are_ignored_and_remove_clears(tmp_path, clock):
+    registry = SkipRegistry(str(tmp_path / "progress.db"))
+    registry.register("unknown", "原因")
+    registry.register("", "原因")
+    registry.register("hw1", "原因")
+    registry.remove("hw1")
+    stats = registry.get_stats()
+    assert stats["registered"] == 1
+    assert stats["size"] == 0
+    assert registry.get_reason("hw1") is None
+
+
+def test_account_registration_does_not_hide_homework_from_other_accounts(tmp_path, clock):
+    path = str(tmp_path / "progress.db")
+    registry = SkipRegistry(path)
+    # 没有做作业按钮只说明这个账号做过该作业
+    registry.register("hw1", "没有做作业按钮", username="u1")
+    registry.register("hw2", "作业页面损坏")
+    assert registry.get_reason("hw1", "u1") == "没有做作业按钮"
+    assert registry.get_reason("hw1", "u2") is None
+    assert registry.get_reason("hw2", "u2") == "作业页面损坏"
+
+    other = SkipRegistry(path)
+    assert other.get_reason("hw1", "u1") == "没有做作业按钮"
+    assert other.get_reason("hw1", "u2") is None
+
+    registry.register("hw1", "没有做作业按钮", username="u2")
+    registry.remove("hw1")
+    assert registry.get_reason("hw1", "u1") is None
+    assert registry.get_reason("hw1", "u2") is None
@@ -1,15 +1,24 @@
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QLineEdit, QPushButton, QTextEdit, QTableWidget, 
                              QTableWidgetItem, QHeaderView, QTabWidget, QGroupBox, 
-                             QCheckBox, QMessageBox, QSplitter, QFrame, QSlider, QProgressBar, QSpinBox)
+                             QCheckBox, QMessageBox, QSplitter, QFrame, QSlider, QProgressBar, QSpinBox,
+                             QTableView, QAbstractItemView, QFileDialog, QComboBox)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon, QFont
 import time
+import config
 from config import DEFAULT_PASSWORD, UI_CONFIG, OPERATION_DELAY
 from automation import BrowserAutomation
 from question_importer import QuestionImporter
 from multi_thread_manager import MultiThreadManager
+from browser_pool import get_browser_pool, should_show_browser
+from answer_plan_cache import get_answer_plan_cache
+from progress_journal import get_progress_journal
 from system_monitor import ResourceWidget
+from log_view import LogView
+from question_table import QuestionTableModel
+from account_loader import parse_accounts_text, load_accounts_file, describe_load_result, STATUS_PENDING
+from account_store import get_account_store, FILTER_ALL, FILTER_NAMES
 
 class AutoAnswerApp(QMainWindow):
     def __init__(self, question_db):
@@ -23,8 +32,11 @@ class AutoAnswerApp(QMainWindow):
         self.delay_multiplier = 1.0  # 延迟倍数，与延迟滑块同步
         self.multi_thread_manager = MultiThreadManager(question_db)  # 多线程管理器
         self.is_multithread_mode = False  # 是否启用多线程模式
+        self.stop_requested = False  # 用户是否主动停止，停止时保留运行进度
+        self.account_store = get_account_store()  # 账号库，保存账号和上次运行结果
         self.initUI()
         self.setup_multithread_signals()  # 设置多线程信号连接
+        self.reload_accounts()  # 加载上次保存的账号
         
     def initUI(self):
         # 设置全局字体为圆滑字体
@@ -91,16 +103,37 @@ class AutoAnswerApp(QMainWindow):
         password_input_layout.addWidget(self.password_edit)
         accounts_layout.addWidget(password_input)
         
-        # 添加账号按钮
+        # 添加账号和导入账号文件按钮
+        account_buttons = QWidget()
+        account_buttons_layout = QHBoxLayout(account_buttons)
+        account_buttons_layout.setContentsMargins(0, 0, 0, 0)
         add_account_btn = QPushButton("添加账号")
         add_account_btn.clicked.connect(self.add_account)
-        accounts_layout.addWidget(add_account_btn)
+        account_buttons_layout.addWidget(add_account_btn)
+        import_accounts_btn = QPushButton("从文件导入")
+        import_accounts_btn.setToolTip("导入TXT（每行 账号 或 账号:密码）或CSV（账号、密码两列）文件")
+        import_accounts_btn.clicked.connect(self.import_accounts_file)
+        account_buttons_layout.addWidget(import_accounts_btn)
+        accounts_layout.addWidget(account_buttons)
         
         # 使用说明
         help_label = QLabel("支持单个账号或多行账号批量添加\n多行账号请直接粘贴到账号输入框中")
         help_label.setStyleSheet("font-size: 11px; color: #666; margin-top: 5px; font-family: 'Microsoft YaHei', 'PingFang SC', 'Helvetica Neue', Arial, sans-serif;")
         accounts_layout.addWidget(help_label)
         
+        # 账号筛选：按上次运行结果只显示需要重跑的账号，开始答题时只处理显示的账号
+        account_filter_row = QWidget()
+        account_filter_layout = QHBoxLayout(account_filter_row)
+        account_filter_layout.setContentsMargins(0, 0, 0, 0)
+        account_filter_layout.addWidget(QLabel("显示:"))
+        self.account_filter_combo = QComboBox()
+        for account_filter, name in FILTER_NAMES.items():
+            self.account_filter_combo.addItem(name, account_filter)
+        self.current_account_filter = FILTER_ALL
+        self.account_filter_combo.currentIndexChanged.connect(self.on_account_filter_changed)
+        account_filter_layout.addWidget(self.account_filter_combo, 1)
+        accounts_layout.addWidget(account_filter_row)
+        
         # 账号列表
         self.accounts_table = QTableWidget(0, 3)
         self.accounts_table.setHorizontalHeaderLabels(["账号", "密码", "状态"])
@@ -226,12 +259,26 @@ class AutoAnswerApp(QMainWindow):
         view_label.setStyleSheet(UI_CONFIG["label_style"])
         view_layout.addWidget(view_label)
         
-        # 题库列表
-        self.questions_table = QTableWidget(0, 3)
-        self.questions_table.setHorizontalHeaderLabels(["题目内容", "答案", "类型"])
-        self.questions_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        # 题库筛选框，输入停止300毫秒后在数据库中筛选
+        self.question_search_input = QLineEdit()
+        self.question_search_input.setPlaceholderText("搜索题目或答案")
+        self.question_search_input.setClearButtonEnabled(True)
+        self.question_search_timer = QTimer(self)
+        self.question_search_timer.setSingleShot(True)
+        self.question_search_timer.setInterval(300)
+        self.question_search_timer.timeout.connect(self.filter_questions)
+        self.question_search_input.textChanged.connect(lambda: self.question_search_timer.start())
+        view_layout.addWidget(self.question_search_input)
+        
+        # 题库列表：分页读取，滚动到底部时才加载下一页
+        self.questions_model = QuestionTableModel(self.question_db, parent=self)
+        self.questions_table = QTableView()
+        self.questions_table.setModel(self.questions_model)
+        self.questions_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.questions_table.verticalHeader().setVisible(False)
+        self.questions_table.verticalHeader().setDefaultSectionSize(22)
+        self.questions_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         self.questions_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        # 隐藏ID列（不再显示）
         view_layout.addWidget(self.questions_table)
         
         # 刷新和删除按钮
@@ -305,6 +352,22 @@ class AutoAnswerApp(QMainWindow):
         
         multithread_layout.addWidget(thread_count_widget)
         
+        # 共享浏览器模式：一个Chrome进程承载多个隔离上下文
+        self.shared_browser_checkbox = QCheckBox("共享浏览器模式（节省内存）")
+        self.shared_browser_checkbox.setToolTip("多个账号共用一个Chrome进程，每个账号运行在独立的隔离上下文中\n"
+                                                "Cookie和存储互不干扰，内存占用远低于每个线程独立启动浏览器")
+        self.shared_browser_checkbox.setChecked(get_browser_pool().execution_mode == "context")
+        self.shared_browser_checkbox.stateChanged.connect(self.on_shared_browser_changed)
+        multithread_layout.addWidget(self.shared_browser_checkbox)
+        
+        # 多进程模式：每个工作者运行在独立进程中
+        self.process_backend_checkbox = QCheckBox("多进程模式（界面更流畅）")
+        self.process_backend_checkbox.setToolTip("每个工作者运行在独立进程中，题目解析和匹配分散到多个CPU核心，不影响界面响应\n"
+                                                 "共享浏览器模式下各进程分别启动自己的Chrome")
+        self.process_backend_checkbox.setChecked(self.multi_thread_manager.backend == "process")
+        self.process_backend_checkbox.stateChanged.connect(self.on_worker_backend_changed)
+        multithread_layout.addWidget(self.process_backend_checkbox)
+        
         # 多线程说明
         try:
             from cpu_optimization import get_cpu_optimizer
@@ -321,6 +384,31 @@ class AutoAnswerApp(QMainWindow):
         
         settings_layout.addWidget(multithread_group)
         
+        # 浏览器运行配置档
+        profile_group = QWidget()
+        profile_layout = QVBoxLayout(profile_group)
+        profile_layout.setContentsMargins(3, 3, 3, 3)
+        profile_layout.setSpacing(2)
+        
+        profile_label = QLabel("运行设置")
+        profile_label.setStyleSheet(UI_CONFIG["label_style"])
+        profile_layout.addWidget(profile_label)
+        
+        self.production_profile_checkbox = QCheckBox("生产模式（无头运行，屏蔽图片和字体）")
+        self.production_profile_checkbox.setToolTip("浏览器在后台无头运行，屏蔽图片、媒体、字体和第三方请求并关闭页面动画\n"
+                                                    "页面加载更快、内存占用更低，适合批量运行；调试时请关闭")
+        self.production_profile_checkbox.setChecked(config.BROWSER_PROFILE == "production")
+        self.production_profile_checkbox.stateChanged.connect(self.on_browser_profile_changed)
+        profile_layout.addWidget(self.production_profile_checkbox)
+        
+        self.resume_checkbox = QCheckBox("断点续跑（跳过上次中断前已完成的账号）")
+        self.resume_checkbox.setToolTip("程序被停止或崩溃后再次开始时，从上次中断的位置继续\n"
+                                        "取消勾选则重新处理全部账号")
+        self.resume_checkbox.setChecked(True)
+        profile_layout.addWidget(self.resume_checkbox)
+        
+        settings_layout.addWidget(profile_group)
+        
         # 操作延迟控制组
         delay_group = QWidget()
         delay_layout = QVBoxLayout(delay_group)
@@ -426,9 +514,9 @@ class AutoAnswerApp(QMainWindow):
         log_label.setStyleSheet(UI_CONFIG["label_style"])
         log_layout.addWidget(log_label)
         
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        log_layout.addWidget(self.log_text)
+        # 日志先缓存，每100毫秒批量显示一次，只绘制可见的行
+        self.log_view = LogView()
+        log_layout.addWidget(self.log_view)
         
         # 日志控制按钮已移至设置页面
         
@@ -487,6 +575,11 @@ class AutoAnswerApp(QMainWindow):
         
         # 启动时清理日志文件
         self.clean_log_files(silent=True)
+        
+        # 定期检查日志文件大小，不再在每条日志时检查
+        self.log_file_timer = QTimer(self)
+        self.log_file_timer.timeout.connect(self.auto_clean_log_files)
+        self.log_file_timer.start(60 * 1000)
     
     def update_status_bar(self, message, progress=None, is_error=False):
         """更新状态栏信息"""
@@ -586,7 +679,6 @@ class AutoAnswerApp(QMainWindow):
         import re
         if re.search(r'[\r\n]', account):
             # 如果包含换行符，直接进行批量处理
-            self.log("检测到多行账号，开始批量添加...")
             self.process_multiple_accounts(account)
             self.account_edit.clear()
             return
@@ -605,15 +697,7 @@ class AutoAnswerApp(QMainWindow):
                 self.update_status_bar(f"账号已存在: {account}", is_error=True)
                 return
             
-        # 添加到账号列表
-        row_position = self.accounts_table.rowCount()
-        self.accounts_table.insertRow(row_position)
-        self.accounts_table.setItem(row_position, 0, QTableWidgetItem(account))
-        self.accounts_table.setItem(row_position, 1, QTableWidgetItem("*" * len(password)))
-        self.accounts_table.setItem(row_position, 2, QTableWidgetItem("待处理"))
-        
-        # 添加到账号数组
-        self.accounts.append({"username": account, "password": password, "status": "待处理"})
+        self.add_accounts([{"username": account, "password": password, "status": STATUS_PENDING}])
         
         # 清空输入框
         self.account_edit.clear()
@@ -627,62 +711,49 @@ class AutoAnswerApp(QMainWindow):
             self.log("没有检测到有效的账号内容")
             return
         
-        # 处理不同的换行符格式（\n, \r\n, \r）
-        import re
-        lines = re.split(r'[\r\n]+', text)
-        added_count = 0
-        
-        self.log(f"开始处理批量账号，共检测到 {len(lines)} 行")
-        
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line:
-                self.log(f"第{i}行为空，跳过")
-                continue
-                
-            self.log(f"处理第{i}行: {line}")
-                
-            # 检查是否包含密码（格式：账号:密码）
-            if ':' in line:
-                parts = line.split(':', 1)
-                account = parts[0].strip()
-                password = parts[1].strip()
-            else:
-                account = line
-                password = DEFAULT_PASSWORD
-            
-            # 验证账号格式（只包含数字）
-            if not account.isdigit():
-                self.log(f"跳过无效账号格式: {account}")
-                continue
-            
-            # 检查是否已存在
-            account_exists = False
-            for existing_account in self.accounts:
-                if existing_account["username"] == account:
-                    account_exists = True
-                    break
-            
-            if account_exists:
-                self.log(f"账号已存在，跳过: {account}")
-                continue
-            
-            # 添加到账号列表
-            row_position = self.accounts_table.rowCount()
-            self.accounts_table.insertRow(row_position)
-            self.accounts_table.setItem(row_position, 0, QTableWidgetItem(account))
-            self.accounts_table.setItem(row_position, 1, QTableWidgetItem("*" * len(password)))
-            self.accounts_table.setItem(row_position, 2, QTableWidgetItem("待处理"))
-            
-            # 添加到账号数组
-            self.accounts.append({"username": account, "password": password, "status": "待处理"})
-            self.log(f"已添加账号: {account}")
-            added_count += 1
-        
-        if added_count > 0:
-            self.log(f"批量添加完成，成功添加 {added_count} 个账号")
+        result = parse_accounts_text(text, (account["username"] for account in self.accounts))
+        self.add_accounts(result.accounts)
+        if result.accounts:
+            self.log(describe_load_result(result))
         else:
             self.log("没有添加任何账号，请检查输入格式")
+    
+    def import_accounts_file(self):
+        """从TXT或CSV文件批量导入账号"""
+        path, _ = QFileDialog.getOpenFileName(self, "导入账号文件", "", "账号文件 (*.txt *.csv);;所有文件 (*)")
+        if not path:
+            return
+        try:
+            result = load_accounts_file(path, (account["username"] for account in self.accounts))
+        except (OSError, UnicodeDecodeError) as e:
+            self.update_status_bar(f"无法读取账号文件: {str(e)}", is_error=True)
+            return
+        self.add_accounts(result.accounts)
+        self.log(describe_load_result(result))
+        self.update_status_bar(f"已从文件导入{len(result.accounts)}个账号")
+    
+    def add_accounts(self, accounts, save=True):
+        """把已校验、去重的账号追加到账号列表，save为True时同时保存到账号库。
+        一次设置好行数后填充单元格，填充期间关闭表格刷新，完成后只重绘一次"""
+        if not accounts:
+            return
+        if save:
+            try:
+                self.account_store.save_accounts(accounts)
+            except Exception as e:
+                self.log(f"保存账号失败: {str(e)}")
+        table = self.accounts_table
+        first_row = table.rowCount()
+        table.setUpdatesEnabled(False)
+        try:
+            table.setRowCount(first_row + len(accounts))
+            for row, account in enumerate(accounts, first_row):
+                table.setItem(row, 0, QTableWidgetItem(account["username"]))
+                table.setItem(row, 1, QTableWidgetItem("*" * len(account["password"])))
+                table.setItem(row, 2, QTableWidgetItem(account["status"]))
+        finally:
+            table.setUpdatesEnabled(True)
+        self.accounts.extend(accounts)
         
     def delete_account(self):
         selected_rows = self.accounts_table.selectionModel().selectedRows()
@@ -690,12 +761,45 @@ class AutoAnswerApp(QMainWindow):
             self.update_status_bar("请先选择要删除的账号！", is_error=True)
             return
             
+        removed = []
         for row in sorted(selected_rows, reverse=True):
             index = row.row()
             account = self.accounts[index]["username"]
             self.accounts_table.removeRow(index)
             self.accounts.pop(index)
+            removed.append(account)
             self.log(f"已删除账号: {account}")
+        try:
+            self.account_store.remove_accounts(removed)
+        except Exception as e:
+            self.log(f"从账号库删除账号失败: {str(e)}")
+    
+    def reload_accounts(self):
+        """按当前筛选条件从账号库重新加载账号列表，状态列显示上次运行结果"""
+        account_filter = self.account_filter_combo.currentData() or FILTER_ALL
+        try:
+            accounts, missing = self.account_store.load_accounts(account_filter)
+        except Exception as e:
+            self.log(f"读取账号库失败: {str(e)}")
+            return
+        if missing:
+            self.log(f"{len(missing)} 个账号使用自定义密码，但系统密钥环中没有保存密码，需要重新添加: {', '.join(missing)}")
+        self.accounts = []
+        self.accounts_table.setRowCount(0)
+        self.add_accounts(accounts, save=False)
+        if account_filter != FILTER_ALL:
+            self.update_status_bar(f"{self.account_filter_combo.currentText()}: {len(accounts)}个账号")
+    
+    def on_account_filter_changed(self):
+        # 运行中账号索引与表格行对应，不能替换账号列表
+        if self.stop_btn.isEnabled():
+            self.update_status_bar("自动答题运行中，停止后才能切换账号筛选", is_error=True)
+            self.account_filter_combo.blockSignals(True)
+            self.account_filter_combo.setCurrentIndex(self.account_filter_combo.findData(self.current_account_filter))
+            self.account_filter_combo.blockSignals(False)
+            return
+        self.current_account_filter = self.account_filter_combo.currentData()
+        self.reload_accounts()
     
     # start_automation方法已移至文件末尾，支持多线程模式
     
@@ -755,33 +859,9 @@ class AutoAnswerApp(QMainWindow):
 
     
     def log(self, message, color=None):
+        """添加一条运行日志，行数裁剪、滚动和绘制由日志面板定时批量处理"""
         timestamp = time.strftime("%H:%M:%S")
-        if color:
-            formatted_message = f"<span style='color: {color};'>[{timestamp}] {message}</span>"
-            self.log_text.append(formatted_message)
-        else:
-            self.log_text.append(f"[{timestamp}] {message}")
-        
-        # 限制日志行数
-        max_lines = 1000
-        document = self.log_text.document()
-        if document.blockCount() > max_lines:
-            # 删除前面的行，保留最新的日志
-            cursor = self.log_text.textCursor()
-            cursor.movePosition(cursor.Start)
-            cursor.movePosition(cursor.Down, cursor.KeepAnchor, document.blockCount() - max_lines)
-            cursor.removeSelectedText()
-        
-        # 自动滚动到底部
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum())
-        # 减少界面刷新频率，提高性能
-        if not hasattr(self, '_last_refresh') or time.time() - self._last_refresh > 0.1:
-            QApplication.processEvents()
-            self._last_refresh = time.time()
-            
-        # 检查并自动清理日志文件
-        self.auto_clean_log_files()
+        self.log_view.append(f"[{timestamp}] {message}", color)
         
     def import_questions(self):
         # 获取文本内容
@@ -977,40 +1057,23 @@ class AutoAnswerApp(QMainWindow):
                 QMessageBox.warning(self, "导入失败", message)
         
         self.import_thread.finished_signal.connect(on_import_finished)
+        # 停止自动答题后浏览器池已关闭，导入前重新打开
+        get_browser_pool().reopen()
         self.import_thread.start()
     
     def refresh_questions(self):
-        # 获取所有题目
-        questions = self.question_db.get_all_questions()
-        
-        # 清空表格
-        self.questions_table.setRowCount(0)
-        
-        # 填充表格
-        for question in questions:
-            row_position = self.questions_table.rowCount()
-            self.questions_table.insertRow(row_position)
-            
-            # 设置题目内容（截断过长的内容）
-            question_content = question[1]
-            if len(question_content) > 50:
-                question_content = question_content[:47] + "..."
-            self.questions_table.setItem(row_position, 0, QTableWidgetItem(question_content))
-            
-            # 设置答案（截断过长的内容）
-            answer_content = question[2]
-            if len(answer_content) > 30:
-                answer_content = answer_content[:27] + "..."
-            self.questions_table.setItem(row_position, 1, QTableWidgetItem(answer_content))
-            
-            # 设置类型
-            question_type = "选择题" if question[3] == "choice" else "主观题"
-            self.questions_table.setItem(row_position, 2, QTableWidgetItem(question_type))
-            
-            # 存储原始ID用于删除操作
-            self.questions_table.item(row_position, 0).setData(Qt.UserRole, question[0])
+        # 题库有变动，之前缓存的答题方案可能已过时
+        get_answer_plan_cache().clear()
         
-        self.log(f"已刷新题库，共{len(questions)}个题目")
+        # 只重新读取第一页，其余在滚动时加载
+        self.questions_model.reload(self.question_search_input.text().strip())
+        self.log(f"已刷新题库，共{self.questions_model.total}个题目")
+    
+    def filter_questions(self):
+        """按筛选框中的文本筛选题库"""
+        self.questions_model.reload(self.question_search_input.text().strip())
+        if self.questions_model.search:
+            self.update_status_bar(f"找到{self.questions_model.total}个匹配的题目")
     
     def delete_question(self):
         selected_rows = self.questions_table.selectionModel().selectedRows()
@@ -1026,17 +1089,13 @@ class AutoAnswerApp(QMainWindow):
         if reply == QMessageBox.No:
             return
             
-        # 执行删除
-        deleted_count = 0
-        for row in sorted(selected_rows, reverse=True):
-            index = row.row()
-            # 从UserRole数据中获取题目ID
-            question_id = self.questions_table.item(index, 0).data(Qt.UserRole)
-            try:
-                self.question_db.delete_question(question_id)
-                deleted_count += 1
-            except Exception as e:
-                self.log(f"删除题目ID:{question_id}失败: {str(e)}")
+        # 在一个事务中批量删除
+        question_ids = [self.questions_model.question_id(row.row()) for row in selected_rows]
+        try:
+            deleted_count = self.question_db.delete_questions(question_ids)
+        except Exception as e:
+            deleted_count = 0
+            self.log(f"删除题目失败: {str(e)}")
         
         # 刷新题库
         self.refresh_questions()
@@ -1045,7 +1104,7 @@ class AutoAnswerApp(QMainWindow):
     
     def clear_log(self):
         """清空当前显示的日志"""
-        self.log_text.clear()
+        self.log_view.clear()
         self.log("日志已清空")
     
     def check_environment(self):
@@ -1236,28 +1295,70 @@ class AutoAnswerApp(QMainWindow):
         else:
             self.log("已禁用多线程模式")
     
+    def on_browser_profile_changed(self, state):
+        """浏览器运行配置档切换"""
+        if state == Qt.Checked:
+            config.BROWSER_PROFILE = "production"
+            self.log("已启用生产模式：浏览器将无头运行，并屏蔽图片、媒体、字体和第三方请求")
+        else:
+            config.BROWSER_PROFILE = "debug"
+            self.log("已切换到调试模式：浏览器窗口将显示，页面资源完整加载")
+    
+    def on_shared_browser_changed(self, state):
+        """共享浏览器模式切换"""
+        if state == Qt.Checked:
+            get_browser_pool().set_execution_mode("context")
+            self.log("已启用共享浏览器模式，每个账号将运行在独立的浏览器上下文中")
+        else:
+            get_browser_pool().set_execution_mode("browser")
+            self.log("已禁用共享浏览器模式，每个线程将使用独立的浏览器")
+    
+    def on_worker_backend_changed(self, state):
+        """多进程模式切换，下次开始时生效"""
+        if state == Qt.Checked:
+            self.multi_thread_manager.set_backend("process")
+            self.log("已启用多进程模式，每个工作者将运行在独立进程中")
+        else:
+            self.multi_thread_manager.set_backend("thread")
+            self.log("已禁用多进程模式，所有工作者将以线程方式运行")
+    
     def start_automation(self):
         """开始自动化（支持单线程和多线程模式）"""
         if not self.accounts:
             self.log("请先添加账号")
             return
         
+        # 上次停止时浏览器池已关闭，新一轮运行前重新打开
+        get_browser_pool().reopen()
+        
         if self.is_multithread_mode:
             self.start_multithread_automation()
         else:
             self.start_singlethread_automation()
     
+    def begin_progress_journal(self):
+        """开始或续上一次运行的进度记录"""
+        self.stop_requested = False
+        try:
+            resumed, completed_count = get_progress_journal().begin_run(resume=self.resume_checkbox.isChecked())
+            if resumed:
+                self.log(f"检测到上次未完成的运行，将从中断处继续（已完成 {completed_count} 个账号）")
+        except Exception as e:
+            self.log(f"读取运行进度失败: {str(e)}")
+    
     def start_singlethread_automation(self):
         """开始单线程自动化（原有逻辑）"""
         if self.browser_automation and self.browser_automation.isRunning():
             self.log("自动化程序正在运行中...")
             return
         
+        self.begin_progress_journal()
+        
         # 根据用户选择更新浏览器显示配置
-        import config
         config.SHOW_BROWSER_WINDOW = self.show_browser_checkbox.isChecked()
+        show_browser = should_show_browser()
         
-        if config.SHOW_BROWSER_WINDOW:
+        if show_browser:
             self.log("已启用浏览器窗口显示，您可以观察自动化过程")
         else:
             self.log("浏览器将在后台运行（无头模式）")
@@ -1282,7 +1383,7 @@ class AutoAnswerApp(QMainWindow):
         
         self.log("开始单线程自动答题...")
         self.update_status_bar(f"自动答题已启动 - 共{len(self.accounts)}个账号", progress=0)
-        if config.SHOW_BROWSER_WINDOW:
+        if show_browser:
             self.log("请关注外部Chrome浏览器窗口查看自动化进度")
         else:
             self.log("自动化进程已在后台运行，请查看日志了解进度")
@@ -1293,6 +1394,8 @@ class AutoAnswerApp(QMainWindow):
             self.log("多线程自动化程序正在运行中...")
             return
         
+        self.begin_progress_journal()
+        
         # 设置多线程参数
         thread_count = self.thread_count_spinbox.value()
         self.multi_thread_manager.set_thread_count(thread_count)
@@ -1347,6 +1450,9 @@ class AutoAnswerApp(QMainWindow):
         if reply != QMessageBox.Yes:
             return
         
+        # 用户主动停止，保留运行进度供下次续跑
+        self.stop_requested = True
+        
         # 立即禁用按钮，防止重复点击
         self.stop_btn.setEnabled(False)
         self.start_btn.setEnabled(False)
@@ -1355,6 +1461,9 @@ class AutoAnswerApp(QMainWindow):
         self.log("正在停止自动答题...")
         self.update_status_bar("正在停止自动答题...")
         
+        # 关闭浏览器池中的空闲实例，使用中的实例归还时关闭
+        get_browser_pool().shutdown()
+        
         # 使用清理管理器异步停止
         try:
             from cleanup_manager import get_cleanup_manager
@@ -1405,6 +1514,13 @@ class AutoAnswerApp(QMainWindow):
     
     def on_automation_finished(self):
         """自动化完成回调"""
+        # 正常结束时关闭本次运行的进度记录，下次重新开始
+        if not self.stop_requested:
+            try:
+                get_progress_journal().finish_run()
+            except Exception as e:
+                self.log(f"保存运行进度失败: {str(e)}")
+        
         # 更新按钮状态
         self.start_btn.setEnabled(True)
         self.pause_btn.setEnabled(False)
@@ -1446,6 +1562,9 @@ class AutoAnswerApp(QMainWindow):
         if hasattr(self, 'resource_widget'):
             self.resource_widget.stop_monitoring()
         
+        # 关闭浏览器池中预热的浏览器
+        get_browser_pool().shutdown()
+        
         # 使用异步清理管理器
         try:
             from cleanup_manager import get_cleanup_manager